@@ -0,0 +1,222 @@
+# coding: utf-8
+"""
+Hot path benchmarks over the recorded API responses in ``test/xml``. For each API method, measures:
+
+* ``parse``: parsing the XML of the responses
+* ``load``: creating the objects out of the parsed XML, using the loaders (methods which parse their responses
+  themselves don't have this stage)
+* ``construct``: creating the objects out of their data dictionaries
+* ``end_to_end``: calling the client method, with a session serving the recorded responses from memory
+
+Usage::
+
+    python benchmarks/bench_api.py [number of repetitions]
+"""
+from __future__ import unicode_literals, print_function
+
+import io
+import json
+import os
+import sys
+import timeit
+import xml.etree.ElementTree as ET
+
+from boardgamegeek import BGGClient, CacheBackendNone
+from boardgamegeek.loaders import create_collection_from_xml, add_collection_items_from_xml
+from boardgamegeek.loaders import create_game_from_xml
+from boardgamegeek.loaders import create_guild_from_xml, add_guild_members_from_xml
+from boardgamegeek.loaders import create_hot_items_from_xml, add_hot_items_from_xml
+from boardgamegeek.loaders import create_plays_from_xml, add_plays_from_xml
+from boardgamegeek.objects.collection import Collection
+from boardgamegeek.objects.games import BoardGame
+from boardgamegeek.objects.guild import Guild
+from boardgamegeek.objects.hotitems import HotItems
+from boardgamegeek.objects.plays import UserPlays
+from boardgamegeek.objects.search import SearchResult
+from boardgamegeek.objects.user import User
+
+XML_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "test", "xml")
+
+USER = "fagentu007"
+GAME_ID = 31260
+GAME_ID_2 = 283
+GUILD_ID = 1229
+
+STAGES = ["parse", "load", "construct", "end_to_end"]
+
+
+def read_fixture(name):
+    with io.open(os.path.join(XML_PATH, name), "r", encoding="utf-8") as f:
+        return f.read().encode("utf-8")
+
+
+class FixtureResponse(object):
+    def __init__(self, text):
+        self.headers = {"content-type": "text/xml"}
+        self.status_code = 200
+        self.text = text
+
+
+class FixtureSession(object):
+    """
+    Stands in for the client's requests session, serving the recorded responses (read once, kept in memory)
+    """
+    def __init__(self):
+        self._responses = {}
+
+    def get(self, url, params, timeout):
+        query = "&".join("{}={}".format(k, v) for k, v in sorted(params.items()))
+        name = url[url.rindex("/") + 1:] + "?" + query
+        if name not in self._responses:
+            self._responses[name] = read_fixture(name).decode("utf-8")
+        return FixtureResponse(self._responses[name])
+
+
+def _thing(params):
+    return "thing?comments=0&historical=0&id={}&marketplace=0&page=1&pagesize=100&ratingcomments=0&stats=1&{}".format(
+        GAME_ID, params)
+
+
+def _guild_pages():
+    pages = ["guild?id={}&members=1".format(GUILD_ID)]
+    page = 2
+    while os.path.isfile(os.path.join(XML_PATH, "guild?id={}&members=1&page={}".format(GUILD_ID, page))):
+        pages.append("guild?id={}&members=1&page={}".format(GUILD_ID, page))
+        page += 1
+    return pages
+
+
+def load_game(roots):
+    return create_game_from_xml(roots[0].find("item"), game_id=GAME_ID)
+
+
+def load_game_list(roots):
+    return [create_game_from_xml(item, game_id=int(item.attrib["id"])) for item in roots[0].findall("item")]
+
+
+def load_collection(roots):
+    collection = create_collection_from_xml(roots[0], USER)
+    add_collection_items_from_xml(collection, roots[0], "boardgame")
+    return collection
+
+
+def load_plays(roots):
+    plays = create_plays_from_xml(roots[0])
+    for root in roots:
+        add_plays_from_xml(plays, root)
+    return plays
+
+
+def load_guild(roots):
+    guild = create_guild_from_xml(roots[0])
+    for root in roots:
+        add_guild_members_from_xml(guild, root)
+    return guild
+
+
+def load_hot_items(roots):
+    hot_items = create_hot_items_from_xml(roots[0])
+    add_hot_items_from_xml(hot_items, roots[0])
+    return hot_items
+
+
+# name: (recorded responses, loader, class and function returning the data to construct objects out of,
+#        client call)
+CASES = {
+    "game": ([_thing("versions=1&videos=1")],
+             load_game,
+             (BoardGame, lambda game: game.data()),
+             lambda bgg: bgg.game(game_id=GAME_ID, videos=True, versions=True)),
+
+    "game_list": (["thing?historical=0&id={},{}&marketplace=0&stats=1&versions=1&videos=1".format(GAME_ID, GAME_ID_2)],
+                  load_game_list,
+                  (BoardGame, lambda game: game.data()),
+                  lambda bgg: bgg.game_list([GAME_ID, GAME_ID_2], videos=True, versions=True)),
+
+    "collection": (["collection?stats=1&subtype=boardgame&username={}&version=1".format(USER)],
+                   load_collection,
+                   (Collection, lambda collection: collection._serialized_data()),
+                   lambda bgg: bgg.collection(USER, versions=True)),
+
+    "plays": (["plays?subtype=boardgame&username={}".format(USER),
+               "plays?page=2&subtype=boardgame&username={}".format(USER)],
+              load_plays,
+              (UserPlays, lambda plays: plays._serialized_data()),
+              lambda bgg: bgg.plays(name=USER)),
+
+    "guild": (_guild_pages(),
+              load_guild,
+              (Guild, lambda guild: guild._serialized_data()),
+              lambda bgg: bgg.guild(GUILD_ID)),
+
+    "hot_items": (["hot?type=boardgame"],
+                  load_hot_items,
+                  (HotItems, lambda hot_items: hot_items.data()),
+                  lambda bgg: bgg.hot_items("boardgame")),
+
+    "user": (["user?buddies=1&domain=boardgame&guilds=1&hot=1&name={}&top=1".format(USER)],
+             None,
+             (User, lambda user: user._serialized_data()),
+             lambda bgg: bgg.user(USER)),
+
+    "search": (["search?query=Agricola&type=boardgame"],
+               None,
+               (SearchResult, lambda result: result.data()),
+               lambda bgg: bgg.search("Agricola")),
+}
+
+
+def measure(function, repeat, number=1):
+    """
+    :return: statistics of the time (in seconds) a call to ``function`` takes
+    :rtype: dict
+    """
+    timings = sorted(t / number for t in timeit.repeat(function, repeat=repeat, number=number))
+    return {"repeat": repeat,
+            "min": timings[0],
+            "median": timings[len(timings) // 2],
+            "max": timings[-1]}
+
+
+def bench_method(name, repeat=20):
+    """
+    :param str name: name of the case (one of :py:data:`CASES`)
+    :param int repeat: how many times each stage is measured
+    :return: the statistics of each stage
+    :rtype: dict
+    """
+    fixtures, loader, (cls, data_of), call = CASES[name]
+    documents = [read_fixture(fixture) for fixture in fixtures]
+    results = {"responses": len(documents), "bytes": sum(len(d) for d in documents)}
+
+    results["parse"] = measure(lambda: [ET.fromstring(d) for d in documents], repeat)
+
+    bgg = BGGClient(cache=CacheBackendNone(), retries=0, requests_per_minute=10 ** 9)
+    bgg.requests_session = FixtureSession()
+    result = call(bgg)
+
+    if loader is not None:
+        roots = [ET.fromstring(d) for d in documents]
+        results["load"] = measure(lambda: loader(roots), repeat)
+
+    # containers and single objects are constructed the same way, lists of objects item by item
+    data = [data_of(item) for item in result] if isinstance(result, list) else [data_of(result)]
+    results["construct"] = measure(lambda: [cls(d) for d in data], repeat)
+
+    results["end_to_end"] = measure(lambda: call(bgg), repeat)
+
+    return results
+
+
+def bench_api(repeat=20, methods=None):
+    """
+    :param int repeat: how many times each stage is measured
+    :param list methods: names of the cases to run, ``None`` for all of them
+    :return: the statistics of each stage, for each API method
+    :rtype: dict
+    """
+    return {name: bench_method(name, repeat) for name in sorted(methods or CASES)}
+
+
+if __name__ == "__main__":
+    print(json.dumps(bench_api(int(sys.argv[1]) if len(sys.argv) > 1 else 20), indent=2, sort_keys=True))
@@ -0,0 +1,75 @@
+# coding: utf-8
+"""
+Throughput of the Parquet export of games and plays, in rows per second, and the peak memory it allocates (which
+should depend on the batch size, not on the number of exported entities).
+
+Usage::
+
+    python benchmarks/bench_export.py [number of games] [number of plays]
+"""
+from __future__ import unicode_literals, print_function
+
+import io
+import json
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+from boardgamegeek.export import export_games, export_plays
+from boardgamegeek.loaders import create_game_from_xml
+from boardgamegeek.objects.plays import PlaySession
+from boardgamegeek.utils import StringPool
+
+from bench_memory import GAME_XML, play_data
+
+
+def generate_games(count):
+    with io.open(GAME_XML, "r", encoding="utf-8") as f:
+        xml = f.read()
+    pool = StringPool()
+    for i in range(count):
+        yield create_game_from_xml(ET.fromstring(xml).find("item"), game_id=i, pool=pool)
+
+
+def generate_plays(count):
+    for i in range(count):
+        yield PlaySession(play_data(i))
+
+
+def measure(export, generate, count, batch_size):
+    """
+    :return: the export's throughput (entities are created while they're exported, as when streaming them out of
+             API responses) and, in a separate run (tracing allocations slows everything down), its peak memory usage
+    """
+    directory = tempfile.mkdtemp()
+    try:
+        start = time.time()
+        row_counts = export(generate(count), directory, batch_size=batch_size)
+        elapsed = max(time.time() - start, 1e-9)
+
+        tracemalloc.start()
+        export(generate(count), directory, batch_size=batch_size)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    finally:
+        shutil.rmtree(directory)
+
+    rows = sum(row_counts.values())
+    return {"rows": row_counts,
+            "seconds": elapsed,
+            "rows_per_second": rows / elapsed,
+            "peak_bytes": peak}
+
+
+def bench_export(games=200, plays=20000, batch_size=1000):
+    return {"games": measure(export_games, generate_games, games, batch_size),
+            "plays": measure(export_plays, generate_plays, plays, batch_size)}
+
+
+if __name__ == "__main__":
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    plays = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    print(json.dumps(bench_export(games, plays), indent=2, sort_keys=True))
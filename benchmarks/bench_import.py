@@ -0,0 +1,61 @@
+# coding: utf-8
+"""
+Time needed to ``import boardgamegeek`` in a fresh interpreter, and the modules which are (or should not be) imported
+along with it.
+
+Usage::
+
+    python benchmarks/bench_import.py [number of runs]
+"""
+from __future__ import unicode_literals, print_function
+
+import json
+import os
+import subprocess
+import sys
+
+# modules which aren't needed until the library is used
+DEFERRED_MODULES = ["requests_cache", "pkg_resources", "boardgamegeek.loaders", "boardgamegeek.objects.games",
+                    "boardgamegeek.objects.plays", "boardgamegeek.objects.collection", "boardgamegeek.export",
+                    "boardgamegeek.serialization", "boardgamegeek.store", "sqlite3", "numpy", "pyarrow", "msgpack"]
+
+_SCRIPT = """
+import json, sys, time
+start = time.time()
+import boardgamegeek
+elapsed = time.time() - start
+print(json.dumps({"seconds": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def import_once():
+    """
+    :return: the time needed to import the library in a new interpreter, and the modules imported by then
+    :rtype: dict
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([ROOT] + ([env["PYTHONPATH"]] if env.get("PYTHONPATH") else []))
+    output = subprocess.check_output([sys.executable, "-c", _SCRIPT], env=env)
+    return json.loads(output.decode("utf-8"))
+
+
+def bench_import(runs=10):
+    timings = []
+    modules = []
+    for _ in range(runs):
+        result = import_once()
+        timings.append(result["seconds"])
+        modules = result["modules"]
+
+    timings.sort()
+    return {"runs": runs,
+            "median_seconds": timings[len(timings) // 2],
+            "min_seconds": timings[0],
+            "modules": len(modules),
+            "deferred_modules_imported": [m for m in DEFERRED_MODULES if m in modules]}
+
+
+if __name__ == "__main__":
+    print(json.dumps(bench_import(int(sys.argv[1]) if len(sys.argv) > 1 else 10), indent=2, sort_keys=True))
@@ -0,0 +1,147 @@
+# coding: utf-8
+"""
+Memory used by the high-cardinality entity classes (play sessions, players, comments, collection items), compared
+with the previous layout, where every object wrapped a copy of its data dictionary in a ``DictObject`` having a
+per-instance ``__dict__``, and memory used by a catalogue of games loaded with and without a string pool.
+
+Usage::
+
+    python benchmarks/bench_memory.py [number of objects]
+"""
+from __future__ import unicode_literals, print_function
+
+import copy
+import datetime
+import gc
+import io
+import json
+import os
+import sys
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+from boardgamegeek.loaders import create_game_from_xml
+from boardgamegeek.objects.games import BoardGameComment, CollectionBoardGame
+from boardgamegeek.objects.plays import PlaySession
+from boardgamegeek.utils import StringPool
+
+GAME_XML = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "test", "xml",
+                        "thing?comments=0&historical=0&id=31260&marketplace=0&page=1&pagesize=100&ratingcomments=0"
+                        "&stats=1&versions=1&videos=1")
+
+
+class LegacyDictObject(object):
+    # DictObject, as it was before it got __slots__
+    def __init__(self, data):
+        self._data = data
+
+
+class LegacyPlaysessionPlayer(LegacyDictObject):
+    pass
+
+
+class LegacyPlaySession(LegacyDictObject):
+    def __init__(self, data):
+        kw = copy.copy(data)
+        if type(kw["date"]) != datetime.datetime:
+            kw["date"] = datetime.datetime.strptime(kw["date"], "%Y-%m-%d")
+        self._players = [LegacyPlaysessionPlayer(player) for player in kw.get("players", [])]
+        super(LegacyPlaySession, self).__init__(kw)
+
+
+class LegacyBoardGameComment(LegacyDictObject):
+    pass
+
+
+def play_data(i):
+    return {"id": 10000000 + i,
+            "date": "2016-01-{:02d}".format(i % 28 + 1),
+            "quantity": 1,
+            "duration": 60,
+            "incomplete": 0,
+            "nowinstats": 0,
+            "user_id": 818216,
+            "game_id": 31260,
+            "game_name": "Agricola",
+            "comment": None,
+            "players": [{"username": "player{}".format(p),
+                         "user_id": p,
+                         "name": "Player {}".format(p),
+                         "startposition": str(p),
+                         "new": "0",
+                         "win": "1" if p == 0 else "0",
+                         "rating": "0",
+                         "score": "42",
+                         "color": "red",
+                         "location": None} for p in range(3)]}
+
+
+def comment_data(i):
+    return {"username": "user{}".format(i), "rating": "8", "comment": "Great game!"}
+
+
+def collection_item_data(i):
+    return {"id": i, "name": "Game {}".format(i), "numplays": 3, "own": "1", "stats": {"ranks": []}}
+
+
+def measure(factory, data):
+    """
+    :return: number of bytes allocated by creating an object out of each item in ``data``
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory(d) for d in data]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return after - before
+
+
+def bench_entity_memory(count=20000):
+    plays = [play_data(i) for i in range(count)]
+    comments = [comment_data(i) for i in range(count)]
+    items = [collection_item_data(i) for i in range(count)]
+
+    results = {}
+    for name, data, legacy, current in [("play_session", plays, LegacyPlaySession, PlaySession),
+                                        ("comment", comments, LegacyBoardGameComment, BoardGameComment),
+                                        ("collection_item", items, None, CollectionBoardGame)]:
+        current_bytes = measure(current, data)
+        results[name] = {"count": count,
+                         "bytes_per_object": current_bytes / float(count)}
+        if legacy is not None:
+            legacy_bytes = measure(legacy, data)
+            results[name].update({"legacy_bytes_per_object": legacy_bytes / float(count),
+                                  "ratio": current_bytes / float(legacy_bytes)})
+    return results
+
+
+def bench_catalogue_memory(count=1000):
+    with io.open(GAME_XML, "r", encoding="utf-8") as f:
+        xml = f.read()
+
+    def load(pool):
+        # each game is parsed from its own response, like when fetching a catalogue game by game
+        return [create_game_from_xml(ET.fromstring(xml).find("item"), game_id=i, pool=pool) for i in range(count)]
+
+    def touch(games):
+        # create the objects holding the categorical values too
+        for game in games:
+            game.ranks
+            game.versions
+            game.videos
+        return games
+
+    results = {}
+    for name, pool in [("without_pool", None), ("with_pool", StringPool())]:
+        results[name] = {"count": count,
+                         "bytes_per_game": measure(lambda _: touch(load(pool)), [None]) / float(count)}
+    results["ratio"] = results["with_pool"]["bytes_per_game"] / results["without_pool"]["bytes_per_game"]
+    return results
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    print(json.dumps({"entities": bench_entity_memory(count),
+                      "catalogue": bench_catalogue_memory(max(1, count // 20))}, indent=2, sort_keys=True))
@@ -0,0 +1,121 @@
+# coding: utf-8
+"""
+Scale benchmarks over synthetic API responses (see ``test/_synthetic.py``), much larger than the recorded ones:
+
+* ``collection``: parsing and loading a collection of many items, and the peak memory needed to do so
+* ``plays``: retrieving a long plays history page by page, loading all of it at once (``plays()``) and streaming it
+  (``iter_plays()``); the peak memory of the latter shouldn't depend on the length of the history
+
+Usage::
+
+    python benchmarks/bench_scale.py [collection items] [plays]
+"""
+from __future__ import unicode_literals, print_function
+
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "test"))
+
+import _synthetic
+from boardgamegeek import BGGClient, CacheBackendNone
+from boardgamegeek.loaders import create_collection_from_xml, add_collection_items_from_xml
+
+USER = "fagentu007"
+
+
+class SyntheticResponse(object):
+    def __init__(self, text):
+        self.headers = {"content-type": "text/xml"}
+        self.status_code = 200
+        self.text = text
+
+
+class SyntheticPlaysSession(object):
+    """
+    Stands in for the client's requests session, generating the pages of a plays history of ``count`` plays
+    """
+    def __init__(self, count):
+        self.count = count
+
+    def get(self, url, params, timeout):
+        return SyntheticResponse(_synthetic.text(_synthetic.plays(params["username"], self.count,
+                                                                  page=params.get("page", 1))))
+
+
+def measure(function):
+    """
+    :return: the time (in seconds) a call to ``function`` takes, and the peak memory (in bytes) it allocates,
+             measured in separate runs (tracing allocations slows the code down)
+    :rtype: dict
+    """
+    start = time.time()
+    function()
+    seconds = time.time() - start
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {"seconds": seconds, "peak_bytes": peak}
+
+
+def bench_collection(items):
+    """
+    :param int items: number of items in the collection
+    :return: the statistics of parsing and loading the collection
+    :rtype: dict
+    """
+    document = _synthetic.text(_synthetic.collection(USER, items)).encode("utf-8")
+
+    def load():
+        root = ET.fromstring(document)
+        collection = create_collection_from_xml(root, USER)
+        add_collection_items_from_xml(collection, root, "boardgame")
+        return collection
+
+    return {"items": items,
+            "bytes": len(document),
+            "parse": measure(lambda: ET.fromstring(document)),
+            "load": measure(load)}
+
+
+def bench_plays(plays):
+    """
+    :param int plays: number of plays in the history
+    :return: the statistics of retrieving the whole history and of streaming it
+    :rtype: dict
+    """
+    def client():
+        bgg = BGGClient(cache=CacheBackendNone(), retries=0, requests_per_minute=10 ** 9)
+        bgg.requests_session = SyntheticPlaysSession(plays)
+        return bgg
+
+    return {"plays": plays,
+            "plays()": measure(lambda: len(client().plays(name=USER))),
+            "iter_plays()": measure(lambda: sum(1 for _ in client().iter_plays(name=USER)))}
+
+
+def bench_scale(collection_items=10000, plays=100000):
+    """
+    :param int collection_items: number of items of the synthetic collection
+    :param int plays: number of plays of the synthetic plays history
+    :return: the statistics of each benchmark
+    :rtype: dict
+    """
+    return {"collection": bench_collection(collection_items),
+            "plays": bench_plays(plays)}
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:3]]
+    print(json.dumps(bench_scale(*sizes), indent=2, sort_keys=True))
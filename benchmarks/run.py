@@ -0,0 +1,155 @@
+# coding: utf-8
+"""
+Runs the benchmark suites and writes their results as JSON, along with the environment they were measured in.
+Optionally, compares the results with those of a previous run and reports the timings which regressed.
+
+Usage::
+
+    python benchmarks/run.py [--suite api] [--repeat 20] [--output results.json]
+                             [--compare baseline.json] [--threshold 1.25]
+
+The exit status is 1 if a regression was found.
+"""
+from __future__ import unicode_literals, print_function
+
+import argparse
+import datetime
+import io
+import json
+import os
+import platform
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import boardgamegeek
+
+# the measures compared with the baseline (lower is better)
+TIMING_KEYS = ("median", "median_seconds")
+
+
+def _suite_api(repeat):
+    from bench_api import bench_api
+    return bench_api(repeat)
+
+
+def _suite_import(repeat):
+    from bench_import import bench_import
+    return bench_import(max(1, repeat // 4))
+
+
+def _suite_memory(repeat):
+    from bench_memory import bench_entity_memory, bench_catalogue_memory
+    return {"entities": bench_entity_memory(200 * repeat),
+            "catalogue": bench_catalogue_memory(5 * repeat)}
+
+
+def _suite_export(repeat):
+    from bench_export import bench_export
+    return bench_export(games=5 * repeat, plays=500 * repeat)
+
+
+def _suite_scale(repeat):
+    from bench_scale import bench_scale
+    return bench_scale(collection_items=500 * repeat, plays=500 * repeat)
+
+
+SUITES = {"api": _suite_api,
+          "import": _suite_import,
+          "memory": _suite_memory,
+          "export": _suite_export,
+          "scale": _suite_scale}
+
+
+def environment():
+    """
+    :return: description of the environment the benchmarks run in
+    :rtype: dict
+    """
+    return {"python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "boardgamegeek": boardgamegeek.__version__,
+            "date": datetime.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")}
+
+
+def run(suites=None, repeat=20):
+    """
+    :param list suites: names of the suites to run (``None`` for all of them)
+    :param int repeat: how many times each timing is measured (scales the size of the other benchmarks too)
+    :return: the environment and the results of each suite
+    :rtype: dict
+    """
+    results = {}
+    for name in suites or sorted(SUITES):
+        try:
+            results[name] = SUITES[name](repeat)
+        except ImportError as e:
+            # e.g. the export benchmark needs pyarrow
+            results[name] = {"skipped": str(e)}
+    return {"environment": environment(), "results": results}
+
+
+def _timings(results, path=()):
+    # flattens the results to {path: timing}
+    if isinstance(results, dict):
+        for key, value in results.items():
+            if key in TIMING_KEYS and isinstance(value, (int, float)):
+                yield "/".join(path + (key,)), value
+            else:
+                for item in _timings(value, path + (key,)):
+                    yield item
+
+
+def compare(results, baseline, threshold=1.25):
+    """
+    Compares the timings of two runs
+
+    :param dict results: results of :py:func:`run`
+    :param dict baseline: results of a previous :py:func:`run`
+    :param float threshold: a timing regressed if it's more than ``threshold`` times the baseline's
+    :return: the timings which regressed: path, baseline value, current value and their ratio
+    :rtype: list of tuples
+    """
+    previous = dict(_timings(baseline["results"]))
+    regressions = []
+    for path, value in sorted(_timings(results["results"])):
+        before = previous.get(path)
+        if before and value > before * threshold:
+            regressions.append((path, before, value, value / before))
+    return regressions
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="run the benchmarks")
+    p.add_argument("--suite", action="append", choices=sorted(SUITES),
+                   help="suite to run (can be repeated, default: all of them)")
+    p.add_argument("--repeat", type=int, default=20, help="how many times each timing is measured")
+    p.add_argument("--output", help="file to write the results to (default: the standard output)")
+    p.add_argument("--compare", metavar="BASELINE", help="results of a previous run to compare with")
+    p.add_argument("--threshold", type=float, default=1.25,
+                   help="ratio to the baseline above which a timing is reported as a regression")
+    args = p.parse_args(argv)
+
+    results = run(args.suite, args.repeat)
+    encoded = json.dumps(results, indent=2, sort_keys=True)
+
+    if args.output:
+        with io.open(args.output, "w", encoding="utf-8") as f:
+            f.write(encoded)
+    else:
+        print(encoded)
+
+    if args.compare:
+        with io.open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for path, before, value, ratio in regressions:
+            print("regression: {}: {:.6f}s -> {:.6f}s ({:.2f}x)".format(path, before, value, ratio), file=sys.stderr)
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
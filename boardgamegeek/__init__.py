@@ -9,13 +9,18 @@
 
 from .api import BGGClient, BGGChoose, BGGRestrictDomainTo, BGGRestrictPlaysTo, BGGRestrictSearchResultsTo, BGGRestrictCollectionTo
 from .exceptions import BGGError, BGGApiRetryError, BGGApiError, BGGApiTimeoutError, BGGValueError, BGGItemNotFoundError
+from .exceptions import BGGDeadlineError
 from .cache import CacheBackendNone, CacheBackendMemory, CacheBackendSqlite
+from .retry import RetryPolicy, RetryBudget
+from .sync import PlaysSync, PlaysSyncState
 from .version import __version__
 
 __all__ = ["BGGClient", "BGGChoose", "BGGRestrictSearchResultsTo", "BGGRestrictPlaysTo", "BGGRestrictDomainTo",
            "BGGRestrictCollectionTo", "BGGError", "BGGValueError", "BGGApiRetryError", "BGGApiError",
-           "BGGApiTimeoutError", "BGGItemNotFoundError", "CacheBackendNone", "CacheBackendSqlite", "CacheBackendMemory"]
+           "BGGApiTimeoutError", "BGGItemNotFoundError", "CacheBackendNone", "CacheBackendSqlite", "CacheBackendMemory",
+           "PlaysSync", "PlaysSyncState", "RetryPolicy", "RetryBudget", "BGGDeadlineError"]
 
-__import__('pkg_resources').declare_namespace(__name__)
+# pkgutil style namespace package (pkg_resources is slow to import)
+__path__ = __import__('pkgutil').extend_path(__path__, __name__)
 
 
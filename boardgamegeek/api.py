@@ -15,30 +15,30 @@ objects.
 from __future__ import unicode_literals
 
 import datetime
+import functools
 import logging
 import sys
+import time
 import warnings
 
 from .objects.user import User
 from .objects.search import SearchResult
 
-from .exceptions import BGGApiError, BGGError, BGGItemNotFoundError, BGGValueError
+from .exceptions import BGGApiError, BGGError, BGGItemNotFoundError, BGGValueError, BGGDeadlineError
+from .instrumentation import RequestEvent, emit
+from .retry import RetryPolicy
 from .utils import xml_subelement_attr, request_and_parse_xml
-from .utils import RateLimitingAdapter, DEFAULT_REQUESTS_PER_MINUTE
+from .utils import RateLimitingAdapter, DEFAULT_REQUESTS_PER_MINUTE, StringPool, Deadline
 from .cache import CacheBackendMemory, CacheBackendNone
 
-from .loaders import create_guild_from_xml, add_guild_members_from_xml
-from .loaders import create_plays_from_xml, add_plays_from_xml
-from .loaders import create_hot_items_from_xml, add_hot_items_from_xml
-from .loaders import create_collection_from_xml, add_collection_items_from_xml
-from .loaders import create_game_from_xml, add_game_comments_from_xml
-
 
 log = logging.getLogger("boardgamegeek.api")
 
 HOT_ITEM_CHOICES = ["boardgame", "rpg", "videogame", "boardgameperson", "rpgperson", "boardgamecompany",
                     "rpgcompany", "videogamecompany"]
 
+API_ENDPOINT = "https://www.boardgamegeek.com/xmlapi2"
+
 COLLECTION_SUBTYPES = ["boardgame", "boardgameexpansion", "boardgameaccessory", "rpgitem", "rpgissue", "videogame"]
 
 
@@ -92,6 +92,28 @@ def call_progress_cb(progress_cb, current, total):
         progress_cb(current, total)
 
 
+def _traced(name, arguments):
+    """
+    Runs an API method in a span, when its client is traced (see :py:mod:`boardgamegeek.tracing`)
+
+    :param str name: the name of the method
+    :param dict arguments: names of the span's attributes, mapped to the names of the method's arguments holding their
+                           values
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self._tracing is None:
+                return method(self, *args, **kwargs)
+
+            import inspect      # only needed when tracing, and slow to import
+            values = inspect.getcallargs(method, self, *args, **kwargs)
+            with self._tracing.call(name, {attribute: values[argument] for attribute, argument in arguments.items()}):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
 class BGGCommon(object):
     """
     Base class for the BoardGameGeek websites APIs. All site-specific clients are derived from this.
@@ -101,8 +123,10 @@ class BGGCommon(object):
     :param float timeout: timeout for a request, in seconds
     :param int retries: how many retries to perform in special cases
     :param float retry_delay: delay between retries, in seconds
+    :param :py:class:`boardgamegeek.retry.RetryPolicy` retry_policy: if not ``None``, decides when the requests are
+                                                                     retried, instead of ``retries`` and ``retry_delay``
     """
-    def __init__(self, api_endpoint, cache, timeout, retries, retry_delay, requests_per_minute):
+    def __init__(self, api_endpoint, cache, timeout, retries, retry_delay, requests_per_minute, retry_policy=None):
         self._search_api_url = api_endpoint + "/search"
         self._thing_api_url = api_endpoint + "/thing"
         self._guild_api_url = api_endpoint + "/guild"
@@ -117,6 +141,8 @@ class BGGCommon(object):
         except:
             raise BGGValueError
 
+        self._retry_policy = retry_policy or RetryPolicy.legacy(self._retries, self._retry_delay)
+
         if cache is None:
             cache = CacheBackendNone()
         self.requests_session = cache.cache
@@ -124,7 +150,89 @@ class BGGCommon(object):
         # add the rate limiting adapter
         self.requests_session.mount(api_endpoint, RateLimitingAdapter(rpm=requests_per_minute))
 
-    def _get_game_id(self, name, game_type, choose):
+        # categorical values (categories, mechanics, designers, ...) are shared by all the objects this client creates
+        self._string_pool = StringPool()
+
+        self._request_hooks = []
+        self._tracing = None
+
+    @property
+    def string_pool(self):
+        """
+        :return: the pool of strings used for interning the categorical values repeating across the objects created
+                 by this client
+        :rtype: :py:class:`boardgamegeek.utils.StringPool`
+        """
+        return self._string_pool
+
+    @property
+    def retry_policy(self):
+        """
+        :return: the policy deciding when the requests are retried
+        :rtype: :py:class:`boardgamegeek.retry.RetryPolicy`
+        """
+        return self._retry_policy
+
+    def add_request_hook(self, hook):
+        """
+        Adds a function to be called after each request made to the API (successful or not), with a
+        :py:class:`boardgamegeek.instrumentation.RequestEvent` describing it: endpoint, parameters, HTTP status,
+        retries, time spent waiting for the rate limiter, on the network, parsing the response and loading the objects
+        out of it, size of the response and if it came from the cache.
+
+        :param callable hook: function receiving the event. It's called from the thread which made the request;
+                              exceptions it raises are logged and ignored.
+        """
+        self._request_hooks.append(hook)
+
+    def remove_request_hook(self, hook):
+        """
+        Removes a function added with :py:meth:`add_request_hook`
+
+        :param callable hook: the function
+        :raises: `ValueError` if it wasn't added
+        """
+        self._request_hooks.remove(hook)
+
+    def _request(self, url, params, load=None, deadline=None):
+        """
+        Calls an API endpoint and loads the objects out of the response, reporting the request to the hooks
+
+        :param str url: the endpoint's URL
+        :param dict params: the request's parameters
+        :param callable load: if not ``None``, function receiving the root element of the response and loading the
+                              objects out of it
+        :param deadline: if not ``None``, the :py:class:`boardgamegeek.utils.Deadline` of the call
+        :return: the result of ``load``, or the root element of the response if there's no ``load`` function
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGApiRetryError` if this request should be retried after a short delay
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGApiError` if the response couldn't be parsed
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGApiTimeoutError` if there was a timeout
+        """
+        if not self._request_hooks:
+            root = request_and_parse_xml(self.requests_session, url, params=params, timeout=self._timeout,
+                                         retry_policy=self._retry_policy, deadline=deadline)
+            return root if load is None else load(root)
+
+        event = RequestEvent(url, params)
+        try:
+            root = request_and_parse_xml(self.requests_session, url, params=params, timeout=self._timeout,
+                                         retry_policy=self._retry_policy, event=event, deadline=deadline)
+            if load is None:
+                return root
+
+            start = time.time()
+            result = load(root)
+            event.load_time = time.time() - start
+            event.add_phase("load", start, start + event.load_time)
+            return result
+        except Exception as e:
+            event.error = e
+            raise
+        finally:
+            event.end = time.time()
+            emit(self._request_hooks, event)
+
+    def _get_game_id(self, name, game_type, choose, deadline=None):
         """
         Returns the BGG ID of a game, searching by name
 
@@ -133,6 +241,7 @@ class BGGCommon(object):
                                                   BGGItemType.BOARD_GAME_EXPANSION)
         :param str choose: method of selecting the game by name, when having multiple results. Valid values are:
                            `BGGChoose.FIRST`, `BGGChoose.RECENT`, `BGGChoose.BEST_RANK`
+        :param deadline: if not ``None``, the :py:class:`boardgamegeek.utils.Deadline` of the call
         :return: game's id
         :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` in case of invalid parameter(s)
         :raises: :py:exc:`boardgamegeek.exceptions.BGGItemNotFoundError` if the game hasn't been found
@@ -145,7 +254,7 @@ class BGGCommon(object):
             raise BGGValueError("invalid value for parameter 'choose': {}".format(choose))
 
         log.debug("getting game id for '{}'".format(name))
-        res = self.search(name, search_type=[game_type], exact=True)
+        res = self.search(name, search_type=[game_type], exact=True, deadline=deadline)
 
         if not res:
             raise BGGItemNotFoundError("can't find '{}'".format(name))
@@ -157,17 +266,21 @@ class BGGCommon(object):
             return max(res, key=lambda x: x.year if x.year is not None else -300000).id
         else:
             # getting the best rank requires fetching the data of all games returned
-            game_data = [self.game(game_id=r.id) for r in res]
+            game_data = [self.game(game_id=r.id, deadline=deadline) for r in res]
             # ...and selecting the one with the best ranking
             return min(game_data, key=lambda x: x.boardgame_rank if x.boardgame_rank is not None else 10000000000).id
 
-    def guild(self, guild_id, progress=None, members=True):
+    @_traced("guild", {"bgg.guild_id": "guild_id"})
+    def guild(self, guild_id, progress=None, members=True, deadline=None):
         """
         Retrieves details about a guild
 
         :param integer guild_id: the id number of the guild
         :param callable progress: an optional callable for reporting progress, taking two integers (``current``, ``total``) as arguments
         :param bool members: if ``True``, names of the guild members will be fetched
+        :param deadline: if not ``None``, the longest time the call may take, in seconds (or a
+                         :py:class:`boardgamegeek.utils.Deadline` shared by several calls), including all the pages,
+                         retries and waits for the rate limiter
         :return: ``Guild`` object containing the data
         :return: ``None`` if the information couldn't be retrieved
         :rtype: :py:class:`boardgamegeek.guild.Guild`
@@ -175,29 +288,33 @@ class BGGCommon(object):
         :raises: :py:exc:`boardgamegeek.exceptions.BGGApiRetryError` if this request should be retried after a short delay
         :raises: :py:exc:`boardgamegeek.exceptions.BGGApiError` if the response couldn't be parsed
         :raises: :py:exc:`boardgamegeek.exceptions.BGGApiTimeoutError` if there was a timeout
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGDeadlineError` if the deadline expired (with the guild and the
+                 members retrieved until then as ``partial``)
         """
+        # the loaders are only imported when needed, to keep "import boardgamegeek" fast
+        from .loaders import create_guild_from_xml, add_guild_members_from_xml
 
         try:
             guild_id = int(guild_id)
         except:
             raise BGGValueError("invalid guild id")
 
-        xml_root = request_and_parse_xml(self.requests_session,
-                                         self._guild_api_url,
-                                         params={"id": guild_id,
-                                                 "members": int(members)},
-                                         timeout=self._timeout,
-                                         retries=self._retries,
-                                         retry_delay=self._retry_delay)
+        deadline = Deadline.of(deadline)
+
+        def load(xml_root):
+            guild = create_guild_from_xml(xml_root)
+            # Add the first page of members
+            return guild, add_guild_members_from_xml(guild, xml_root) if members else None
 
-        guild = create_guild_from_xml(xml_root)
+        guild, added_member = self._request(self._guild_api_url,
+                                            params={"id": guild_id,
+                                                    "members": int(members)},
+                                            load=load,
+                                            deadline=deadline)
 
         if not members:
             return guild
 
-        # Add the first page of members
-        added_member = add_guild_members_from_xml(guild, xml_root)
-
         try:
             call_progress_cb(progress, len(guild), guild.members_count)
         except:
@@ -205,28 +322,30 @@ class BGGCommon(object):
 
         # Fetch the other pages of members
         page = 1
-        while len(guild) < guild.members_count and added_member:
-            page += 1
-            log.debug("fetching guild members page {}".format(page))
+        try:
+            while len(guild) < guild.members_count and added_member:
+                page += 1
+                log.debug("fetching guild members page {}".format(page))
 
-            xml_root = request_and_parse_xml(self.requests_session,
-                                             self._guild_api_url,
+                added_member = self._request(self._guild_api_url,
                                              params={"id": guild_id, "members": 1, "page": page},
-                                             timeout=self._timeout,
-                                             retries=self._retries,
-                                             retry_delay=self._retry_delay)
+                                             load=lambda xml_root: add_guild_members_from_xml(guild, xml_root),
+                                             deadline=deadline)
 
-            added_member = add_guild_members_from_xml(guild, xml_root)
-
-            try:
-                call_progress_cb(progress, len(guild), guild.members_count)
-            except:
-                break
+                try:
+                    call_progress_cb(progress, len(guild), guild.members_count)
+                except:
+                    break
+        except BGGDeadlineError as e:
+            e.partial = guild
+            raise
 
         return guild
 
     # TODO: refactor
-    def user(self, name, progress=None, buddies=True, guilds=True, hot=True, top=True, domain=BGGRestrictDomainTo.BOARD_GAME):
+    @_traced("user", {"bgg.username": "name"})
+    def user(self, name, progress=None, buddies=True, guilds=True, hot=True, top=True, domain=BGGRestrictDomainTo.BOARD_GAME,
+             deadline=None):
         """
         Retrieves details about an user
 
@@ -238,6 +357,9 @@ class BGGCommon(object):
         :param bool hot: if ``True``, get the user's "hot" list
         :param bool top: if ``True``, get the user's "top" list
         :param str domain: restrict items on the "hot" and "top" lists to ``domain``. One of the constants in :py:class:`boardgamegeek.BGGSelectDomain`
+        :param deadline: if not ``None``, the longest time the call may take, in seconds (or a
+                         :py:class:`boardgamegeek.utils.Deadline` shared by several calls), including all the pages,
+                         retries and waits for the rate limiter
         :return: ``User`` object
         :rtype: :py:class:`boardgamegeek.user.User`
         :return: ``None`` if the user couldn't be found
@@ -248,6 +370,8 @@ class BGGCommon(object):
         :raises: :py:exc:`boardgamegeek.exceptions.BGGApiRetryError` if this request should be retried after a short delay
         :raises: :py:exc:`boardgamegeek.exceptions.BGGApiError` if the response couldn't be parsed
         :raises: :py:exc:`boardgamegeek.exceptions.BGGApiTimeoutError` if there was a timeout
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGDeadlineError` if the deadline expired (with the user, buddies
+                 and guilds retrieved until then as ``partial``)
         """
 
         if not name:
@@ -263,135 +387,123 @@ class BGGCommon(object):
                   "top": int(top),
                   "domain": domain}
 
-        root = request_and_parse_xml(self.requests_session,
-                                     self._user_api_url,
-                                     params=params,
-                                     timeout=self._timeout,
-                                     retries=self._retries,
-                                     retry_delay=self._retry_delay)
+        deadline = Deadline.of(deadline)
 
-        # when the user is not found, the API returns an response, but with most fields empty. id is empty too
-        try:
-            data = {"name": root.attrib["name"],
-                    "id": int(root.attrib["id"])}
-        except (KeyError, ValueError):
-            raise BGGItemNotFoundError
-
-        for i in ["firstname", "lastname", "avatarlink",
-                  "stateorprovince", "country", "webaddress", "xboxaccount",
-                  "wiiaccount", "steamaccount", "psnaccount", "traderating"]:
-            data[i] = xml_subelement_attr(root, i)
-
-        data["yearregistered"] = xml_subelement_attr(root, "yearregistered", convert=int, quiet=True)
-        data["lastlogin"] = xml_subelement_attr(root,
-                                                "lastlogin",
-                                                convert=lambda x: datetime.datetime.strptime(x, "%Y-%m-%d"),
-                                                quiet=True)
-
-        # TODO: move add_top_item add_hot_item to sepparated files
-        user = User(data)
-
-        # add top items
-        if top:
-            for top_item in root.findall(".//top/item"):
-                user.add_top_item({"id": int(top_item.attrib["id"]),
-                                   "name": top_item.attrib["name"]})
-
-        # add hot items
-        if hot:
-            for hot_item in root.findall(".//hot/item"):
-                user.add_hot_item({"id": int(hot_item.attrib["id"]),
-                                   "name": hot_item.attrib["name"]})
+        def load(root):
+            # when the user is not found, the API returns an response, but with most fields empty. id is empty too
+            try:
+                data = {"name": root.attrib["name"],
+                        "id": int(root.attrib["id"])}
+            except (KeyError, ValueError):
+                raise BGGItemNotFoundError
+
+            for i in ["firstname", "lastname", "avatarlink",
+                      "stateorprovince", "country", "webaddress", "xboxaccount",
+                      "wiiaccount", "steamaccount", "psnaccount", "traderating"]:
+                data[i] = xml_subelement_attr(root, i)
+
+            data["yearregistered"] = xml_subelement_attr(root, "yearregistered", convert=int, quiet=True)
+            data["lastlogin"] = xml_subelement_attr(root,
+                                                    "lastlogin",
+                                                    convert=lambda x: datetime.datetime.strptime(x, "%Y-%m-%d"),
+                                                    quiet=True)
+
+            # TODO: move add_top_item add_hot_item to sepparated files
+            user = User(data)
+
+            # add top items
+            if top:
+                for top_item in root.findall(".//top/item"):
+                    user.add_top_item({"id": int(top_item.attrib["id"]),
+                                       "name": top_item.attrib["name"]})
+
+            # add hot items
+            if hot:
+                for hot_item in root.findall(".//hot/item"):
+                    user.add_hot_item({"id": int(hot_item.attrib["id"]),
+                                       "name": hot_item.attrib["name"]})
+
+            if not buddies and not guilds:
+                return user, 0
+
+            total_buddies = 0
+            total_guilds = 0
+
+            buddies_root = root.find("buddies")
+            if buddies_root is not None:
+                total_buddies = int(buddies_root.attrib["total"])
+                if total_buddies > 0:
+                    # add the buddies from the first page
+                    for buddy in buddies_root.findall(".//buddy"):
+                        user.add_buddy({"name": buddy.attrib["name"],
+                                        "id": buddy.attrib["id"]})
+
+            guilds_root = root.find("guilds")
+            if guilds_root is not None:
+                total_guilds = int(guilds_root.attrib["total"])
+                if total_guilds > 0:
+                    # add the guilds from the first page
+                    for guild in guilds_root.findall(".//guild"):
+                        user.add_guild({"name": guild.attrib["name"],
+                                        "id": guild.attrib["id"]})
+
+            return user, max(total_buddies, total_guilds)
+
+        def load_page(root):
+            added_buddy = False
+            added_guild = False
+
+            for buddy in root.findall(".//buddy"):
+                user.add_buddy({"name": buddy.attrib["name"],
+                                "id": buddy.attrib["id"]})
+                added_buddy = True
+
+            for guild in root.findall(".//guild"):
+                user.add_guild({"name": guild.attrib["name"],
+                                "id": guild.attrib["id"]})
+                added_guild = True
+
+            return added_buddy, added_guild
+
+        user, max_items_to_fetch = self._request(self._user_api_url, params=params, load=load, deadline=deadline)
 
         if not buddies and not guilds:
             return user
 
-        total_buddies = 0
-        total_guilds = 0
-
-        buddies = root.find("buddies")
-        if buddies is not None:
-            total_buddies = int(buddies.attrib["total"])
-            if total_buddies > 0:
-                # add the buddies from the first page
-                for buddy in buddies.findall(".//buddy"):
-                    user.add_buddy({"name": buddy.attrib["name"],
-                                    "id": buddy.attrib["id"]})
-
-        guilds = root.find("guilds")
-        if guilds is not None:
-            total_guilds = int(guilds.attrib["total"])
-            if total_guilds > 0:
-                # add the guilds from the first page
-                for guild in guilds.findall(".//guild"):
-                    user.add_guild({"name": guild.attrib["name"],
-                                    "id": guild.attrib["id"]})
-
         # It seems that the BGG API can return more results than what's specified in the documentation (they say
         # page size is 100, but for an user with 114 friends, all buddies are there on the first page).
         # Therefore, we'll keep fetching pages until we reach the number of items we're expecting or we don't get
         # any more data
 
-        max_items_to_fetch = max(total_buddies, total_guilds)
-
         try:
             call_progress_cb(progress, max(user.total_buddies, user.total_guilds), max_items_to_fetch)
         except:
             return user
 
         page = 2
-        while max(user.total_buddies, user.total_guilds) < max_items_to_fetch:
-            added_buddy = False
-            added_guild = False
-            params["page"] = page
-            root = request_and_parse_xml(self.requests_session,
-                                         self._user_api_url,
-                                         params=params,
-                                         timeout=self._timeout)
-
-            for buddy in root.findall(".//buddy"):
-                user.add_buddy({"name": buddy.attrib["name"],
-                                "id": buddy.attrib["id"]})
-                added_buddy = True
+        try:
+            while max(user.total_buddies, user.total_guilds) < max_items_to_fetch:
+                params["page"] = page
+                added_buddy, added_guild = self._request(self._user_api_url, params=params, load=load_page,
+                                                         deadline=deadline)
 
-            for guild in root.findall(".//guild"):
-                user.add_guild({"name": guild.attrib["name"],
-                                "id": guild.attrib["id"]})
-                added_guild = True
+                try:
+                    call_progress_cb(progress, max(user.total_buddies, user.total_guilds), max_items_to_fetch)
+                except:
+                    break
 
-            try:
-                call_progress_cb(progress, max(user.total_buddies, user.total_guilds), max_items_to_fetch)
-            except:
-                break
+                page += 1
 
-            page += 1
-
-            if not added_buddy and not added_guild:
-                log.debug("didn't add any buddy/guild after fetching page {}, stopping here".format(page))
-                break
+                if not added_buddy and not added_guild:
+                    log.debug("didn't add any buddy/guild after fetching page {}, stopping here".format(page))
+                    break
+        except BGGDeadlineError as e:
+            e.partial = user
+            raise
 
         return user
 
-    def plays(self, name=None, game_id=None, progress=None, min_date=None, max_date=None, subtype=BGGRestrictPlaysTo.BOARD_GAME):
-        """
-        Retrieves the plays for an user (if using ``name``) or for a game (if using ``game_id``)
-
-        :param str name: user name to retrieve the plays for
-        :param integer game_id: game id to retrieve the plays for
-        :param callable progress: an optional callable for reporting progress, taking two integers (``current``,
-                                  ``total``) as arguments
-        :param datetime.date min_date: return only plays of the specified date or later
-        :param datetime.date max_date: return only plays of the specified date or earlier
-        :param str subtype: limit plays results to the specified subtype.
-        :return: object containing all the plays
-        :rtype: :py:class:`boardgamegeek.plays.Plays`
-        :return: ``None`` if the user/game couldn't be found
-        :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` in case of invalid parameter(s)
-        :raises: :py:exc:`boardgamegeek.exceptions.BGGApiRetryError` if this request should be retried after a short delay
-        :raises: :py:exc:`boardgamegeek.exceptions.BGGApiError` if the response couldn't be parsed
-        :raises: :py:exc:`boardgamegeek.exceptions.BGGApiTimeoutError` if there was a timeout
-
-        """
+    def _plays_params(self, name, game_id, min_date, max_date, subtype):
         if not name and not game_id:
             raise BGGValueError("no user name specified")
 
@@ -424,54 +536,147 @@ class BGGCommon(object):
             except AttributeError:
                 raise BGGValueError("maxdate must be a datetime.date object")
 
-        xml_root = request_and_parse_xml(self.requests_session,
-                                         self._plays_api_url,
-                                         params=params,
-                                         timeout=self._timeout,
-                                         retries=self._retries,
-                                         retry_delay=self._retry_delay)
+        return params, game_id
+
+    def _plays_pages(self, params, game_id, progress, accumulate, deadline=None):
+        """
+        Retrieves the pages of plays
+
+        :param dict params: the request parameters (updated with the page number)
+        :param game_id: id of the game, or ``None`` if retrieving an user's plays
+        :param callable progress: progress callback
+        :param bool accumulate: if ``True``, the plays of all pages are added to the same object, else each page's
+                                plays are added to a new one
+        :param deadline: if not ``None``, the :py:class:`boardgamegeek.utils.Deadline` of the call
+        :return: generator yielding the object holding the plays, after each page is added to it
+        :rtype: generator of :py:class:`boardgamegeek.plays.Plays`
+        """
+        from .loaders import create_plays_from_xml, add_plays_from_xml
 
-        plays = create_plays_from_xml(xml_root, game_id)
-        added_plays = add_plays_from_xml(plays, xml_root)
+        def load(xml_root, plays):
+            if plays is None:
+                plays = create_plays_from_xml(xml_root, game_id)
+            elif not accumulate:
+                plays = plays.__class__(plays.data())
 
-        try:
-            call_progress_cb(progress, len(plays), plays.plays_count)
-        except:
-            return plays
+            before = len(plays)
+            added_plays = add_plays_from_xml(plays, xml_root, pool=self._string_pool)
+            return plays, added_plays, len(plays) - before
 
+        plays = None
+        count = 0
         page = 1
 
-        # Since the BGG API doesn't seem to report the total number of plays for games correctly (it's 0), just
-        # continue until we can't add anymore
-        while added_plays:
-            page += 1
-            log.debug("fetching page {} of plays".format(page))
-
-            params["page"] = page
+        while True:
+            if page > 1:
+                log.debug("fetching page {} of plays".format(page))
+                params["page"] = page
 
-            # fetch the next pages of plays
-            xml_root = request_and_parse_xml(self.requests_session,
-                                             self._plays_api_url,
-                                             params=params,
-                                             timeout=self._timeout,
-                                             retries=self._retries,
-                                             retry_delay=self._retry_delay)
+            plays, added_plays, added = self._request(self._plays_api_url,
+                                                      params=params,
+                                                      load=lambda xml_root: load(xml_root, plays),
+                                                      deadline=deadline)
+            count += added
 
-            added_plays = add_plays_from_xml(plays, xml_root)
+            yield plays
 
             try:
-                call_progress_cb(progress, len(plays), plays.plays_count)
+                call_progress_cb(progress, count, plays.plays_count)
             except:
                 break
 
+            # Since the BGG API doesn't seem to report the total number of plays for games correctly (it's 0), just
+            # continue until we can't add anymore
+            if not added_plays:
+                break
+
+            page += 1
+
+    @_traced("plays", {"bgg.username": "name", "bgg.game_id": "game_id"})
+    def plays(self, name=None, game_id=None, progress=None, min_date=None, max_date=None, subtype=BGGRestrictPlaysTo.BOARD_GAME,
+              deadline=None):
+        """
+        Retrieves the plays for an user (if using ``name``) or for a game (if using ``game_id``)
+
+        :param str name: user name to retrieve the plays for
+        :param integer game_id: game id to retrieve the plays for
+        :param callable progress: an optional callable for reporting progress, taking two integers (``current``,
+                                  ``total``) as arguments
+        :param datetime.date min_date: return only plays of the specified date or later
+        :param datetime.date max_date: return only plays of the specified date or earlier
+        :param str subtype: limit plays results to the specified subtype.
+        :param deadline: if not ``None``, the longest time the call may take, in seconds (or a
+                         :py:class:`boardgamegeek.utils.Deadline` shared by several calls), including all the pages,
+                         retries and waits for the rate limiter
+        :return: object containing all the plays
+        :rtype: :py:class:`boardgamegeek.plays.Plays`
+        :return: ``None`` if the user/game couldn't be found
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` in case of invalid parameter(s)
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGApiRetryError` if this request should be retried after a short delay
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGApiError` if the response couldn't be parsed
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGApiTimeoutError` if there was a timeout
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGDeadlineError` if the deadline expired (with the plays retrieved
+                 until then as ``partial``)
+
+        """
+        params, game_id = self._plays_params(name, game_id, min_date, max_date, subtype)
+
+        plays = None
+        try:
+            for plays in self._plays_pages(params, game_id, progress, accumulate=True, deadline=Deadline.of(deadline)):
+                pass
+        except BGGDeadlineError as e:
+            e.partial = plays
+            raise
+
         return plays
 
-    def hot_items(self, item_type):
+    def iter_plays(self, name=None, game_id=None, progress=None, min_date=None, max_date=None,
+                   subtype=BGGRestrictPlaysTo.BOARD_GAME, deadline=None):
+        """
+        Retrieves the plays for an user (if using ``name``) or for a game (if using ``game_id``), yielding each play
+        as soon as the page it's on is retrieved. Unlike :py:meth:`plays`, the plays aren't kept around, so large play
+        histories can be processed using little memory.
+
+        :param str name: user name to retrieve the plays for
+        :param integer game_id: game id to retrieve the plays for
+        :param callable progress: an optional callable for reporting progress, taking two integers (``current``,
+                                  ``total``) as arguments
+        :param datetime.date min_date: return only plays of the specified date or later
+        :param datetime.date max_date: return only plays of the specified date or earlier
+        :param str subtype: limit plays results to the specified subtype.
+        :param deadline: if not ``None``, the longest time the iteration may take from this call on, in seconds (or a
+                         :py:class:`boardgamegeek.utils.Deadline` shared by several calls), including all the pages,
+                         retries and waits for the rate limiter
+        :return: generator of play sessions
+        :rtype: generator of :py:class:`boardgamegeek.plays.PlaySession`
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` in case of invalid parameter(s)
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGItemNotFoundError` (while iterating) if the user/game couldn't
+                 be found
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGApiRetryError` if this request should be retried after a short delay
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGApiError` if the response couldn't be parsed
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGApiTimeoutError` if there was a timeout
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGDeadlineError` (while iterating) if the deadline expired
+        """
+        # validate the parameters now, not when the iteration starts
+        params, game_id = self._plays_params(name, game_id, min_date, max_date, subtype)
+        return self._iter_plays(params, game_id, progress, Deadline.of(deadline))
+
+    def _iter_plays(self, params, game_id, progress, deadline):
+        for plays in self._plays_pages(params, game_id, progress, accumulate=False, deadline=deadline):
+            for play in plays:
+                yield play
+
+    @_traced("hot_items", {"bgg.type": "item_type"})
+    def hot_items(self, item_type, deadline=None):
         """
         Return the list of "Hot Items"
 
         :param str item_type: hot item type. Valid values: "boardgame", "rpg", "videogame", "boardgameperson",
                               "rpgperson", "boardgamecompany", "rpgcompany", "videogamecompany")
+        :param deadline: if not ``None``, the longest time the call may take, in seconds (or a
+                         :py:class:`boardgamegeek.utils.Deadline` shared by several calls), including the retries and
+                         the waits for the rate limiter
         :return: ``HotItems`` object
         :rtype: :py:class:`boardgamegeek.hotitems.HotItems`
         :return: ``None`` in case the hot items couldn't be retrieved
@@ -481,29 +686,28 @@ class BGGCommon(object):
                   a short delay
         :raises: :py:exc:`boardgamegeek.exceptions.BGGApiError` if the response couldn't be parsed
         :raises: :py:exc:`boardgamegeek.exceptions.BGGApiTimeoutError` if there was a timeout
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGDeadlineError` if the deadline expired
         """
+        from .loaders import create_hot_items_from_xml, add_hot_items_from_xml
+
         if item_type not in HOT_ITEM_CHOICES:
             raise BGGValueError("invalid type specified")
 
         params = {"type": item_type}
 
-        xml_root = request_and_parse_xml(self.requests_session,
-                                         self._hot_api_url,
-                                         params=params,
-                                         timeout=self._timeout,
-                                         retries=self._retries,
-                                         retry_delay=self._retry_delay)
+        def load(xml_root):
+            hot_items = create_hot_items_from_xml(xml_root)
+            add_hot_items_from_xml(hot_items, xml_root)
+            return hot_items
 
-        hot_items = create_hot_items_from_xml(xml_root)
-        add_hot_items_from_xml(hot_items, xml_root)
-
-        return hot_items
+        return self._request(self._hot_api_url, params=params, load=load, deadline=Deadline.of(deadline))
 
+    @_traced("collection", {"bgg.username": "user_name"})
     def collection(self, user_name, subtype=BGGRestrictCollectionTo.BOARD_GAME, exclude_subtype=None, ids=None, versions=None,
                    version=None, own=None, rated=None, played=None, commented=None, trade=None, want=None, wishlist=None,
                    wishlist_prio=None, preordered=None, want_to_play=None, want_to_buy=None, prev_owned=None,
                    has_parts=None, want_parts=None, min_rating=None, rating=None, min_bgg_rating=None, bgg_rating=None,
-                   min_plays=None, max_plays=None, collection_id=None, modified_since=None):
+                   min_plays=None, max_plays=None, collection_id=None, modified_since=None, lazy=False, deadline=None):
         """
         Returns an user's game collection
 
@@ -535,6 +739,11 @@ class BGGCommon(object):
         :param double bgg_rating: return items rated on BGG with a maximum of ``bgg_rating``
         :param int collection_id: restrict results to the collection specified by this id
         :param str modified_since: restrict results to those whose status (own, want, etc.) has been changed/added since ``modified_since``. Format: ``YY-MM-DD`` or ``YY-MM-DD HH:MM:SS``
+        :param bool lazy: if ``True``, each item keeps a reference to its XML element and decodes its data when first
+                          accessed (see :py:meth:`boardgamegeek.objects.games.BaseGame.materialize`)
+        :param deadline: if not ``None``, the longest time the call may take, in seconds (or a
+                         :py:class:`boardgamegeek.utils.Deadline` shared by several calls), including the retries and
+                         the waits for the rate limiter
 
 
         :return: ``Collection`` object
@@ -545,7 +754,9 @@ class BGGCommon(object):
         :raises: :py:exc:`boardgamegeek.exceptions.BGGApiRetryError` if this request should be retried after a short delay
         :raises: :py:exc:`boardgamegeek.exceptions.BGGApiError` if the response couldn't be parsed
         :raises: :py:exc:`boardgamegeek.exceptions.BGGApiTimeoutError` if there was a timeout
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGDeadlineError` if the deadline expired
         """
+        from .loaders import create_collection_from_xml, add_collection_items_from_xml
 
         # Parameter validation
 
@@ -632,25 +843,24 @@ class BGGCommon(object):
         if modified_since is not None:
             params["modifiedsince"] = modified_since
 
-        xml_root = request_and_parse_xml(self.requests_session,
-                                         self._collection_api_url,
-                                         params=params,
-                                         timeout=self._timeout,
-                                         retries=self._retries,
-                                         retry_delay=self._retry_delay)
-
-        collection = create_collection_from_xml(xml_root, user_name)
-        add_collection_items_from_xml(collection, xml_root, subtype)
+        def load(xml_root):
+            collection = create_collection_from_xml(xml_root, user_name)
+            add_collection_items_from_xml(collection, xml_root, subtype, lazy=lazy, pool=self._string_pool)
+            return collection
 
-        return collection
+        return self._request(self._collection_api_url, params=params, load=load, deadline=Deadline.of(deadline))
 
-    def search(self, query, search_type=None, exact=False):
+    @_traced("search", {"bgg.query": "query"})
+    def search(self, query, search_type=None, exact=False, deadline=None):
         """
         Search for a game
 
         :param str query: the string to search for
         :param list search_type: list of :py:class:`boardgamegeek.api.BGGRestrictItemTypeTo`, indicating what to include in the search results.
         :param bool exact: if True, try to match the name exactly
+        :param deadline: if not ``None``, the longest time the call may take, in seconds (or a
+                         :py:class:`boardgamegeek.utils.Deadline` shared by several calls), including the retries and
+                         the waits for the rate limiter
         :return: list of ``SearchResult``
         :rtype: list of :py:class:`boardgamegeek.search.SearchResult`
 
@@ -658,6 +868,7 @@ class BGGCommon(object):
         :raises: :py:exc:`boardgamegeek.exceptions.BGGApiRetryError` if this request should be retried after a short delay
         :raises: :py:exc:`boardgamegeek.exceptions.BGGApiError` if the API response was invalid or couldn't be parsed
         :raises: :py:exc:`boardgamegeek.exceptions.BGGApiTimeoutError` if there was a timeout
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGDeadlineError` if the deadline expired
         """
         if not query:
             raise BGGValueError("invalid query string")
@@ -677,27 +888,22 @@ class BGGCommon(object):
         if exact:
             params["exact"] = 1
 
-        root = request_and_parse_xml(self.requests_session,
-                                     self._search_api_url,
-                                     params=params,
-                                     timeout=self._timeout,
-                                     retries=self._retries,
-                                     retry_delay=self._retry_delay)
-
-        results = []
-        for item in root.findall("item"):
-            kwargs = {"id": item.attrib["id"],
-                      "name": xml_subelement_attr(item, "name"),
-                      "yearpublished": xml_subelement_attr(item,
-                                                           "yearpublished",
-                                                           default=0,
-                                                           convert=int,
-                                                           quiet=True),
-                      "type": item.attrib["type"]}
+        def load(root):
+            results = []
+            for item in root.findall("item"):
+                kwargs = {"id": item.attrib["id"],
+                          "name": xml_subelement_attr(item, "name"),
+                          "yearpublished": xml_subelement_attr(item,
+                                                               "yearpublished",
+                                                               default=0,
+                                                               convert=int,
+                                                               quiet=True),
+                          "type": item.attrib["type"]}
 
-            results.append(SearchResult(kwargs))
+                results.append(SearchResult(kwargs))
+            return results
 
-        return results
+        return self._request(self._search_api_url, params=params, load=load, deadline=Deadline.of(deadline))
 
 
 class BGGClient(BGGCommon):
@@ -713,6 +919,11 @@ class BGGClient(BGGCommon):
         :param float retry_delay: Time to sleep, in seconds, between retries when the API returns HTTP 202 (retry)
         :param disable_ssl: ignored, left for backwards compatibility
         :param requests_per_minute: how many requests per minute to allow to go out to BGG (throttle prevention)
+        :param str api_endpoint: URL of the API (e.g. of a local server standing in for BGG, for testing)
+        :param :py:class:`boardgamegeek.retry.RetryPolicy` retry_policy: how the requests are retried (backoff, jitter,
+                                                                         limits for each error, time and retry budgets).
+                                                                         If given, ``retries`` and ``retry_delay`` are
+                                                                         ignored.
 
         Example usage::
 
@@ -724,21 +935,26 @@ class BGGClient(BGGCommon):
             >>> bgg_sqlite_cache = BGGClient(cache=CacheBackendSqlite(path="/path/to/cache.db", ttl=3600))
 
     """
-    def __init__(self, cache=CacheBackendMemory(ttl=3600), timeout=15, retries=3, retry_delay=5, disable_ssl=False, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE):
+    def __init__(self, cache=CacheBackendMemory(ttl=3600), timeout=15, retries=3, retry_delay=5, disable_ssl=False, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE,
+                 api_endpoint=API_ENDPOINT, retry_policy=None):
 
-        super(BGGClient, self).__init__(api_endpoint="https://www.boardgamegeek.com/xmlapi2",
+        super(BGGClient, self).__init__(api_endpoint=api_endpoint,
                                         cache=cache,
                                         timeout=timeout,
                                         retries=retries,
                                         retry_delay=retry_delay,
-                                        requests_per_minute=requests_per_minute)
+                                        requests_per_minute=requests_per_minute,
+                                        retry_policy=retry_policy)
 
-    def get_game_id(self, name, choose=BGGChoose.FIRST):
+    def get_game_id(self, name, choose=BGGChoose.FIRST, deadline=None):
         """
         Returns the BGG ID of a game, searching by name
 
         :param str name: The name of the game to search for
         :param boardgamegeek.BGGChoose choose: method of selecting the game by name, when dealing with multiple results.
+        :param deadline: if not ``None``, the longest time the call may take, in seconds (or a
+                         :py:class:`boardgamegeek.utils.Deadline` shared by several calls), including all the pages,
+                         retries and waits for the rate limiter
         :return: the game's id
         :rtype: integer
         :return: ``None`` if game wasn't found
@@ -746,11 +962,14 @@ class BGGClient(BGGCommon):
         :raises: :py:exc:`boardgamegeek.exceptions.BGGApiRetryError` if this request should be retried after a short delay
         :raises: :py:exc:`boardgamegeek.exceptions.BGGApiError` if the response couldn't be parsed
         :raises: :py:exc:`boardgamegeek.exceptions.BGGApiTimeoutError` if there was a timeout
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGDeadlineError` if the deadline expired
         """
-        return self._get_game_id(name, game_type=BGGRestrictSearchResultsTo.BOARD_GAME, choose=choose)
+        return self._get_game_id(name, game_type=BGGRestrictSearchResultsTo.BOARD_GAME, choose=choose,
+                                 deadline=Deadline.of(deadline))
 
+    @_traced("game_list", {"bgg.game_ids": "game_id_list"})
     def game_list(self, game_id_list, versions=False,
-                  videos=False, historical=False, marketplace=False):
+                  videos=False, historical=False, marketplace=False, lazy=False, deadline=None):
         """
         Get list of games by from a list of ids.
 
@@ -759,6 +978,11 @@ class BGGClient(BGGCommon):
         :param bool videos: include videos
         :param bool historical: include historical data
         :param bool marketplace: include marketplace data
+        :param bool lazy: if ``True``, each game keeps a reference to its XML element and decodes its data when first
+                          accessed (see :py:meth:`boardgamegeek.objects.games.BaseGame.materialize`)
+        :param deadline: if not ``None``, the longest time the call may take, in seconds (or a
+                         :py:class:`boardgamegeek.utils.Deadline` shared by several calls), including the retries and
+                         the waits for the rate limiter
         :return: list of ``BoardGame`` objects
         :rtype: list`
 
@@ -768,7 +992,10 @@ class BGGClient(BGGCommon):
             if the response couldn't be parsed
         :raises: :py:exc:`boardgamegeek.exceptions.BoardGameGeekTimeoutError`
             if there was a timeout
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGDeadlineError`
+            if the deadline expired
         """
+        from .loaders import create_game_from_xml
 
         if not game_id_list:
             raise BGGError("List of Game Ids must be specified")
@@ -782,28 +1009,26 @@ class BGGClient(BGGCommon):
                   "marketplace": int(marketplace),
                   "stats": 1}
 
-        xml_root = request_and_parse_xml(self.requests_session,
-                                         self._thing_api_url,
-                                         params=params,
-                                         timeout=self._timeout,
-                                         retries=self._retries,
-                                         retry_delay=self._retry_delay)
-
-        xml_root = xml_root.findall("item")
-        if xml_root is None:
-            msg = "invalid data for game ids: {}".format(game_id_list,)
-            raise BGGApiError(msg)
+        def load(xml_root):
+            xml_root = xml_root.findall("item")
+            if xml_root is None:
+                msg = "invalid data for game ids: {}".format(game_id_list,)
+                raise BGGApiError(msg)
 
-        game_list = []
-        for i, game_root in enumerate(xml_root):
-            game = create_game_from_xml(game_root,
-                                        game_id=game_id_list[i])
-            game_list.append(game)
+            game_list = []
+            for i, game_root in enumerate(xml_root):
+                game = create_game_from_xml(game_root,
+                                            game_id=game_id_list[i],
+                                            lazy=lazy,
+                                            pool=self._string_pool)
+                game_list.append(game)
+            return game_list
 
-        return game_list
+        return self._request(self._thing_api_url, params=params, load=load, deadline=Deadline.of(deadline))
 
+    @_traced("game", {"bgg.game_id": "game_id", "bgg.name": "name"})
     def game(self, name=None, game_id=None, choose=BGGChoose.FIRST, versions=False, videos=False, historical=False,
-             marketplace=False, comments=False, rating_comments=False, progress=None):
+             marketplace=False, comments=False, rating_comments=False, progress=None, lazy=False, deadline=None):
         """
         Get information about a game.
 
@@ -818,6 +1043,11 @@ class BGGClient(BGGCommon):
         :param bool comments: include comments
         :param bool rating_comments: include comments with rating (ignored in favor of ``comments``, if that is true)
         :param callable progress: callable for reporting progress if fetching comments
+        :param bool lazy: if ``True``, the game keeps a reference to its XML element and decodes its data when first
+                          accessed (see :py:meth:`boardgamegeek.objects.games.BaseGame.materialize`)
+        :param deadline: if not ``None``, the longest time the call may take, in seconds (or a
+                         :py:class:`boardgamegeek.utils.Deadline` shared by several calls), including all the pages,
+                         retries and waits for the rate limiter
         :return: ``BoardGame`` object
         :rtype: :py:class:`boardgamegeek.games.BoardGame`
 
@@ -826,13 +1056,18 @@ class BGGClient(BGGCommon):
                  short delay
         :raises: :py:exc:`boardgamegeek.exceptions.BoardGameGeekAPIError` if the response couldn't be parsed
         :raises: :py:exc:`boardgamegeek.exceptions.BoardGameGeekTimeoutError` if there was a timeout
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGDeadlineError` if the deadline expired (with the game and the
+                 comments retrieved until then as ``partial``, if the game was retrieved)
         """
+        from .loaders import create_game_from_xml, add_game_comments_from_xml
 
         if not name and game_id is None:
             raise BGGError("game name or id not specified")
 
+        deadline = Deadline.of(deadline)
+
         if game_id is None:
-            game_id = self.get_game_id(name, choose=choose)
+            game_id = self.get_game_id(name, choose=choose, deadline=deadline)
             if game_id is None:
                 raise BGGItemNotFoundError
 
@@ -849,25 +1084,29 @@ class BGGClient(BGGCommon):
                   "page": 1,
                   "stats": 1}
 
-        xml_root = request_and_parse_xml(self.requests_session,
-                                         self._thing_api_url,
-                                         params=params,
-                                         timeout=self._timeout,
-                                         retries=self._retries,
-                                         retry_delay=self._retry_delay)
+        def item(xml_root):
+            xml_root = xml_root.find("item")
+            if xml_root is None:
+                msg = "invalid data for game id: {}{}".format(game_id, "" if name is None else " ({})".format(name))
+                raise BGGApiError(msg)
+            return xml_root
 
-        xml_root = xml_root.find("item")
-        if xml_root is None:
-            msg = "invalid data for game id: {}{}".format(game_id, "" if name is None else " ({})".format(name))
-            raise BGGApiError(msg)
+        def load(xml_root):
+            xml_root = item(xml_root)
+            game = create_game_from_xml(xml_root,
+                                        game_id=game_id,
+                                        lazy=lazy,
+                                        pool=self._string_pool)
+            if not (comments or rating_comments):
+                return game, None
+            return game, add_game_comments_from_xml(game, xml_root)
 
-        game = create_game_from_xml(xml_root,
-                                    game_id=game_id)
+        game, added_comments = self._request(self._thing_api_url, params=params, load=load, deadline=deadline)
 
         if not (comments or rating_comments):
             return game
 
-        added_items, total = add_game_comments_from_xml(game, xml_root)
+        added_items, total = added_comments
 
         try:
             call_progress_cb(progress, len(game.comments), total)
@@ -875,46 +1114,57 @@ class BGGClient(BGGCommon):
             return game
 
         page = 1
-        while added_items and len(game.comments) < total:
-            page += 1
-
-            params['page'] = page
-            xml_root = request_and_parse_xml(self.requests_session,
-                                             self._thing_api_url,
-                                             params={"id": game_id,
-                                                     "pagesize": 100,
-                                                     "comments": int(comments),
-                                                     "ratingcomments": int(rating_comments),
-                                                     "page": page},
-                                             timeout=self._timeout,
-                                             retries=self._retries,
-                                             retry_delay=self._retry_delay)
-
-            xml_root = xml_root.find("item")
-            if xml_root is None:
-                msg = "invalid data for game id: {}{}".format(game_id, "" if name is None else " ({})".format(name))
-                raise BGGApiError(msg)
-
-            added_items, total = add_game_comments_from_xml(game, xml_root)
-
-            try:
-                call_progress_cb(progress, len(game.comments), total)
-            except:
-                break
+        try:
+            while added_items and len(game.comments) < total:
+                page += 1
+
+                params['page'] = page
+                added_items, total = self._request(self._thing_api_url,
+                                                   params={"id": game_id,
+                                                           "pagesize": 100,
+                                                           "comments": int(comments),
+                                                           "ratingcomments": int(rating_comments),
+                                                           "page": page},
+                                                   load=lambda xml_root: add_game_comments_from_xml(game, item(xml_root)),
+                                                   deadline=deadline)
+
+                try:
+                    call_progress_cb(progress, len(game.comments), total)
+                except:
+                    break
+        except BGGDeadlineError as e:
+            e.partial = game
+            raise
 
         return game
 
-    def games(self, name):
+    @_traced("games", {"bgg.name": "name"})
+    def games(self, name, deadline=None):
         """
         Return a list containing all games with the given name
 
         :param str name: the name of the game to search for
+        :param deadline: if not ``None``, the longest time the call may take, in seconds (or a
+                         :py:class:`boardgamegeek.utils.Deadline` shared by several calls), including all the games,
+                         retries and waits for the rate limiter
         :return: list of :py:class:`boardgamegeek.games.BoardGame`
         :raises: :py:exc:`boardgamegeek.exceptions.BoardGameGeekAPIRetryError` if this request should be retried after a short delay
         :raises: :py:exc:`boardgamegeek.exceptions.BoardGameGeekAPIError` if the response couldn't be parsed
         :raises: :py:exc:`boardgamegeek.exceptions.BoardGameGeekTimeoutError` if there was a timeout
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGDeadlineError` if the deadline expired (with the list of the games
+                 retrieved until then as ``partial``)
         """
-        return [self.game(game_id=s.id)
-                for s in self.search(name,
-                                     search_type=[BGGRestrictSearchResultsTo.BOARD_GAME, BGGRestrictSearchResultsTo.BOARD_GAME_EXPANSION],
-                                     exact=True)]
+        deadline = Deadline.of(deadline)
+
+        games = []
+        try:
+            for s in self.search(name,
+                                 search_type=[BGGRestrictSearchResultsTo.BOARD_GAME, BGGRestrictSearchResultsTo.BOARD_GAME_EXPANSION],
+                                 exact=True,
+                                 deadline=deadline):
+                games.append(self.game(game_id=s.id, deadline=deadline))
+        except BGGDeadlineError as e:
+            e.partial = games
+            raise
+
+        return games
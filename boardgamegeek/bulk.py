@@ -0,0 +1,164 @@
+# coding: utf-8
+"""
+:mod:`boardgamegeek.bulk` - Bulk retrieval
+==========================================
+
+.. module:: boardgamegeek.bulk
+   :platform: Unix, Windows
+   :synopsis: concurrent retrieval of many games, collections or plays with a single client
+
+.. moduleauthor:: Cosmin Luță <q4break@gmail.com>
+
+"""
+from __future__ import unicode_literals
+
+import logging
+import threading
+
+try:
+    import queue
+except ImportError:
+    # Python 2
+    import Queue as queue
+
+from .exceptions import BGGValueError
+
+
+log = logging.getLogger("boardgamegeek.bulk")
+
+DEFAULT_WORKERS = 4
+
+_POLL_INTERVAL = 0.1        # how often blocked threads check if they should stop
+_DONE = object()            # marks the end of the keys, and that a worker finished
+
+
+def read_keys(stream, convert=None):
+    """
+    Reads the keys (game ids, user names) to retrieve from a text stream. Keys are separated by newlines, commas or
+    whitespace; empty lines and lines starting with ``#`` are ignored. The stream is read lazily, so keys can be
+    processed as they're written (e.g. by a pipeline feeding the standard input).
+
+    :param stream: the text stream to read from
+    :param callable convert: if not ``None``, function used to convert each key (e.g. ``int``). Keys which can't be
+                             converted are logged and skipped.
+    :return: generator of keys
+    """
+    for line in stream:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+
+        for key in line.replace(",", " ").split():
+            if convert is not None:
+                try:
+                    key = convert(key)
+                except ValueError:
+                    log.warning("skipping invalid key: {}".format(key))
+                    continue
+            yield key
+
+
+def chunks(keys, size):
+    """
+    Groups keys in lists of at most ``size`` elements
+
+    :param keys: iterable of keys
+    :param int size: maximum size of a group
+    :return: generator of lists
+    """
+    chunk = []
+    for key in keys:
+        chunk.append(key)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _put(q, item, stop):
+    # put an item in a bounded queue, giving up if asked to stop
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=_POLL_INTERVAL)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def fetch_concurrently(fetch, keys, workers=DEFAULT_WORKERS):
+    """
+    Calls ``fetch`` for each key, using several threads, and yields the results as they become available (not
+    necessarily in the order of the keys). Keys are consumed from the iterable as the workers need them and at most
+    a couple of results per worker are kept waiting to be consumed, so memory usage doesn't depend on the number of
+    keys.
+
+    Requests made by the same :py:class:`boardgamegeek.api.BGGClient` still obey its rate limiting, the threads only
+    allow waiting for several responses at the same time.
+
+    :param callable fetch: function retrieving the data for a key
+    :param keys: iterable of keys (may be a generator)
+    :param int workers: number of threads
+    :return: generator of ``(key, result, exception)`` tuples, where ``exception`` is the exception raised by
+             ``fetch`` (and ``result`` is ``None``) if it failed
+    :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` if the number of workers is invalid
+    """
+    if workers < 1:
+        raise BGGValueError("invalid number of workers: {}".format(workers))
+
+    return _fetch_concurrently(fetch, keys, workers)
+
+
+def _fetch_concurrently(fetch, keys, workers):
+    tasks = queue.Queue(maxsize=workers * 2)
+    results = queue.Queue(maxsize=workers * 2)
+    stop = threading.Event()
+
+    def feeder():
+        try:
+            for key in keys:
+                if not _put(tasks, key, stop):
+                    return
+        except Exception as e:
+            log.error("error reading the keys: {}".format(e))
+        for _ in range(workers):
+            _put(tasks, _DONE, stop)
+
+    def worker():
+        while not stop.is_set():
+            try:
+                key = tasks.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+
+            if key is _DONE:
+                break
+
+            try:
+                item = (key, fetch(key), None)
+            except Exception as e:
+                log.debug("fetching {} failed: {}".format(key, e))
+                item = (key, None, e)
+
+            if not _put(results, item, stop):
+                return
+
+        _put(results, _DONE, stop)
+
+    threads = [threading.Thread(target=feeder)] + [threading.Thread(target=worker) for _ in range(workers)]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+
+    try:
+        finished = 0
+        while finished < workers:
+            item = results.get()
+            if item is _DONE:
+                finished += 1
+            else:
+                yield item
+    finally:
+        # the consumer stopped early (or we're done): let the threads finish
+        stop.set()
@@ -1,16 +1,86 @@
+import os
+import threading
+
 import requests
-import requests_cache
 
 from .exceptions import BGGValueError
 
 
+def default_cache_path():
+    """
+    :return: path of the on-disk cache used by default by the command line tool: ``boardgamegeek/cache.sqlite``
+             in the ``$XDG_CACHE_HOME`` directory (``~/.cache`` if it isn't set)
+    :rtype: str
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "boardgamegeek", "cache.sqlite")
+
+
+class CacheStats(object):
+    """
+    Counts the responses served from the cache (hits) and those retrieved from the network (misses)
+    """
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def record(self, response, *args, **kwargs):
+        """
+        Response hook counting a response
+        """
+        with self._lock:
+            if getattr(response, "from_cache", False):
+                self.hits += 1
+            else:
+                self.misses += 1
+        return response
+
+    @property
+    def requests(self):
+        """
+        :return: number of responses counted
+        :rtype: integer
+        """
+        return self.hits + self.misses
+
+    @property
+    def hit_ratio(self):
+        """
+        :return: the fraction of responses served from the cache
+        :rtype: float
+        """
+        return self.hits / float(self.requests) if self.requests else 0.0
+
+    def __str__(self):
+        return "{} requests, {} cache hits, {} misses ({:.1%} hit ratio)".format(self.requests, self.hits,
+                                                                                 self.misses, self.hit_ratio)
+
+
 class CacheBackend(object):
-    pass
+    """
+    Base class of the cache backends: ``cache`` is the session used for the requests, ``stats`` the
+    :py:class:`CacheStats` of its responses.
+
+    The session is only created when it's first used, so that creating a backend (e.g. the default one of
+    :py:class:`boardgamegeek.api.BGGClient`, created when the module is imported) doesn't import ``requests_cache``.
+    Subclasses create it in ``_create_session()``.
+    """
+    def __init__(self):
+        self._session = None
+        self.stats = CacheStats()
+
+    @property
+    def cache(self):
+        if self._session is None:
+            self._session = self._create_session()
+            self._session.hooks["response"].append(self.stats.record)
+        return self._session
 
 
 class CacheBackendNone(CacheBackend):
-    def __init__(self):
-        self.cache = requests.Session()
+    def _create_session(self):
+        return requests.Session()
 
 
 class CacheBackendMemory(CacheBackend):
@@ -20,19 +90,39 @@ class CacheBackendMemory(CacheBackend):
             int(ttl)
         except ValueError:
             raise BGGValueError
-        self.cache = requests_cache.core.CachedSession(backend="memory", expire_after=ttl, allowable_codes=(200,))
+        super(CacheBackendMemory, self).__init__()
+        self._ttl = ttl
+
+    def _create_session(self):
+        import requests_cache
+        return requests_cache.core.CachedSession(backend="memory", expire_after=self._ttl, allowable_codes=(200,))
 
 
 class CacheBackendSqlite(CacheBackend):
+    """ Cache HTTP requests in a SQLite database, which is created (along with its directory) if needed """
     def __init__(self, path, ttl, fast_save=True):
         try:
             int(ttl)
         except ValueError:
             raise BGGValueError
 
-        self.cache = requests_cache.core.CachedSession(cache_name=path,
-                                                       backend="sqlite",
-                                                       expire_after=ttl,
-                                                       extension="",
-                                                       fast_save=fast_save,
-                                                       allowable_codes=(200,))
+        directory = os.path.dirname(path)
+        if directory and not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError as e:
+                raise BGGValueError("can't create the cache directory {}: {}".format(directory, e))
+
+        super(CacheBackendSqlite, self).__init__()
+        self._path = path
+        self._ttl = ttl
+        self._fast_save = fast_save
+
+    def _create_session(self):
+        import requests_cache
+        return requests_cache.core.CachedSession(cache_name=self._path,
+                                                 backend="sqlite",
+                                                 expire_after=self._ttl,
+                                                 extension="",
+                                                 fast_save=self._fast_save,
+                                                 allowable_codes=(200,))
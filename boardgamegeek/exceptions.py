@@ -30,6 +30,16 @@ class BGGApiTimeoutError(BGGError):
     pass
 
 
+class BGGDeadlineError(BGGApiTimeoutError):
+    """
+    The deadline of a call expired before it was done. ``partial`` holds what was retrieved until then (e.g. the
+    pages of plays fetched), or ``None`` if there's nothing.
+    """
+    def __init__(self, *args, **kwargs):
+        super(BGGDeadlineError, self).__init__(*args)
+        self.partial = kwargs.get("partial")
+
+
 class BGGApiError(BGGError):
     """ An error related to the BGG XML2 API """
     pass
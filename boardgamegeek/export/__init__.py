@@ -0,0 +1,18 @@
+# coding: utf-8
+"""
+:mod:`boardgamegeek.export` - Bulk export
+=========================================
+
+.. module:: boardgamegeek.export
+   :platform: Unix, Windows
+   :synopsis: export of games, collections and plays to tabular formats
+
+.. moduleauthor:: Cosmin Luță <q4break@gmail.com>
+
+"""
+from __future__ import unicode_literals
+
+from .rows import TABLES, game_rows, collection_rows, play_rows
+from .arrow import schema, record_batches, ArrowExporter, export_games, export_collections, export_plays, \
+    FORMAT_PARQUET, FORMAT_ARROW
+from . import ndjson
@@ -0,0 +1,273 @@
+# coding: utf-8
+"""
+:mod:`boardgamegeek.export.arrow` - Arrow and Parquet export
+============================================================
+
+.. module:: boardgamegeek.export.arrow
+   :platform: Unix, Windows
+   :synopsis: streaming export of games, collections and plays to Arrow record batches and Parquet files
+
+.. moduleauthor:: Cosmin Luță <q4break@gmail.com>
+
+Entities are consumed from iterators and converted to rows, which are buffered and written out in record batches of
+``batch_size`` rows, so memory usage stays bounded no matter how many entities get exported.
+
+"""
+from __future__ import unicode_literals
+
+import logging
+import os
+
+from ..exceptions import BGGValueError
+from ..utils import import_optional
+from .rows import TABLES, GAME_TABLES, COLLECTION_TABLES, PLAYS_TABLES, game_rows, collection_rows, play_rows
+
+
+log = logging.getLogger("boardgamegeek.export.arrow")
+
+FORMAT_PARQUET = "parquet"
+FORMAT_ARROW = "arrow"
+
+DEFAULT_BATCH_SIZE = 10000
+
+_EXTENSIONS = {FORMAT_PARQUET: "parquet", FORMAT_ARROW: "arrow"}
+
+
+def _pyarrow(feature):
+    return import_optional("pyarrow", feature)
+
+
+def schema(table):
+    """
+    :param str table: name of the table (one of the keys of :py:data:`boardgamegeek.export.rows.TABLES`)
+    :return: the table's Arrow schema
+    :rtype: `pyarrow.Schema`
+    :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` if the table doesn't exist
+    :raises: `ImportError` if PyArrow isn't installed
+    """
+    pa = _pyarrow("Arrow export")
+
+    try:
+        columns = TABLES[table]
+    except KeyError:
+        raise BGGValueError("invalid table: {}".format(table))
+
+    types = {"int64": pa.int64(),
+             "float64": pa.float64(),
+             "bool": pa.bool_(),
+             "string": pa.string(),
+             "date": pa.date32()}
+
+    return pa.schema([pa.field(name, types[column_type]) for name, column_type in columns])
+
+
+def _record_batch(pa, table_schema, rows):
+    columns = list(zip(*rows)) if rows else [()] * len(table_schema)
+    arrays = [pa.array(values, type=field.type) for values, field in zip(columns, table_schema)]
+    return pa.RecordBatch.from_arrays(arrays, schema=table_schema)
+
+
+def record_batches(table, rows, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Groups rows into record batches
+
+    :param str table: name of the table the rows belong to
+    :param rows: iterable of row tuples (see :py:mod:`boardgamegeek.export.rows`)
+    :param int batch_size: maximum number of rows in a batch
+    :return: generator of record batches
+    :rtype: generator of `pyarrow.RecordBatch`
+    :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` if the table doesn't exist or the batch size is invalid
+    :raises: `ImportError` if PyArrow isn't installed
+    """
+    pa = _pyarrow("Arrow export")
+    table_schema = schema(table)
+
+    if batch_size < 1:
+        raise BGGValueError("invalid batch size: {}".format(batch_size))
+
+    buffered = []
+    for row in rows:
+        buffered.append(row)
+        if len(buffered) >= batch_size:
+            yield _record_batch(pa, table_schema, buffered)
+            buffered = []
+
+    if buffered:
+        yield _record_batch(pa, table_schema, buffered)
+
+
+class ArrowExporter(object):
+    """
+    Writes the rows of several tables to one file per table, in ``directory``. Rows are buffered and written
+    out in record batches of ``batch_size`` rows.
+
+    :param str directory: where to write the files (created if it doesn't exist)
+    :param list tables: names of the tables to write
+    :param str format: :py:data:`FORMAT_PARQUET` (``<table>.parquet`` files) or :py:data:`FORMAT_ARROW`
+                       (``<table>.arrow`` files, in the Arrow IPC file format)
+    :param int batch_size: maximum number of rows buffered (and written at once) for each table
+    :param str compression: Parquet compression codec
+    :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` if the parameters are invalid
+    :raises: `ImportError` if PyArrow isn't installed
+    """
+    def __init__(self, directory, tables, format=FORMAT_PARQUET, batch_size=DEFAULT_BATCH_SIZE,
+                 compression="snappy"):
+        self._pa = _pyarrow("Arrow export")
+
+        if format not in _EXTENSIONS:
+            raise BGGValueError("invalid export format: {}".format(format))
+
+        if batch_size < 1:
+            raise BGGValueError("invalid batch size: {}".format(batch_size))
+
+        self._schemas = {table: schema(table) for table in tables}
+        self._format = format
+        self._batch_size = batch_size
+        self._compression = compression
+        self._directory = directory
+
+        self._buffers = {table: [] for table in tables}
+        self._writers = {}
+        self._row_counts = {table: 0 for table in tables}
+        self._closed = False
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def path(self, table):
+        """
+        :param str table: name of the table
+        :return: path of the file the table is written to
+        :rtype: str
+        """
+        return os.path.join(self._directory, "{}.{}".format(table, _EXTENSIONS[self._format]))
+
+    @property
+    def row_counts(self):
+        """
+        :return: number of rows written (or buffered) for each table
+        :rtype: dict
+        """
+        return dict(self._row_counts)
+
+    def _open_writer(self, table):
+        table_schema = self._schemas[table]
+        if self._format == FORMAT_PARQUET:
+            pq = import_optional("pyarrow.parquet", "Parquet export")
+            return pq.ParquetWriter(self.path(table), table_schema, compression=self._compression)
+        return self._pa.ipc.new_file(self.path(table), table_schema)
+
+    def _flush(self, table):
+        rows = self._buffers[table]
+        writer = self._writers.get(table)
+        if writer is None:
+            writer = self._writers[table] = self._open_writer(table)
+        if rows:
+            batch = _record_batch(self._pa, self._schemas[table], rows)
+            if self._format == FORMAT_PARQUET:
+                writer.write_table(self._pa.Table.from_batches([batch]))
+            else:
+                writer.write_batch(batch)
+            log.debug("wrote {} rows to {}".format(len(rows), self.path(table)))
+        self._buffers[table] = []
+
+    def write_rows(self, table, rows):
+        """
+        Adds rows to a table
+
+        :param str table: name of the table
+        :param rows: iterable of row tuples
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` if the table isn't exported or the exporter is closed
+        """
+        if self._closed:
+            raise BGGValueError("the exporter is closed")
+
+        try:
+            buffered = self._buffers[table]
+        except KeyError:
+            raise BGGValueError("table not exported: {}".format(table))
+
+        for row in rows:
+            buffered.append(row)
+            self._row_counts[table] += 1
+            if len(buffered) >= self._batch_size:
+                self._flush(table)
+                buffered = self._buffers[table]
+
+    def write(self, rows_by_table):
+        """
+        Adds the rows of an entity, as returned by the functions in :py:mod:`boardgamegeek.export.rows`
+
+        :param dict rows_by_table: rows to add, for each table
+        """
+        for table, rows in rows_by_table.items():
+            self.write_rows(table, rows)
+
+    def close(self):
+        """
+        Writes the buffered rows and closes the files. Every table gets a file, even if it has no rows.
+        """
+        if self._closed:
+            return
+
+        try:
+            for table in self._buffers:
+                self._flush(table)
+        finally:
+            for writer in self._writers.values():
+                writer.close()
+            self._writers = {}
+            self._closed = True
+
+
+def _export(entities, rows_function, tables, directory, **kwargs):
+    with ArrowExporter(directory, tables, **kwargs) as exporter:
+        for entity in entities:
+            exporter.write(rows_function(entity))
+    return exporter.row_counts
+
+
+def export_games(games, directory, **kwargs):
+    """
+    Exports games to the ``games``, ``game_links`` and ``ranks`` tables
+
+    :param games: iterable of :py:class:`boardgamegeek.objects.games.BoardGame` (may be a generator)
+    :param str directory: where to write the files
+    :param kwargs: passed to :py:class:`ArrowExporter`
+    :return: number of rows written to each table
+    :rtype: dict
+    """
+    return _export(games, game_rows, GAME_TABLES, directory, **kwargs)
+
+
+def export_collections(collections, directory, **kwargs):
+    """
+    Exports collections to the ``collection_items`` table
+
+    :param collections: iterable of :py:class:`boardgamegeek.objects.collection.Collection` (may be a generator)
+    :param str directory: where to write the files
+    :param kwargs: passed to :py:class:`ArrowExporter`
+    :return: number of rows written to each table
+    :rtype: dict
+    """
+    return _export(collections, collection_rows, COLLECTION_TABLES, directory, **kwargs)
+
+
+def export_plays(plays, directory, **kwargs):
+    """
+    Exports plays to the ``plays`` and ``play_players`` tables
+
+    :param plays: iterable of :py:class:`boardgamegeek.objects.plays.PlaySession` (e.g. a
+                  :py:class:`boardgamegeek.objects.plays.Plays` object, or a generator)
+    :param str directory: where to write the files
+    :param kwargs: passed to :py:class:`ArrowExporter`
+    :return: number of rows written to each table
+    :rtype: dict
+    """
+    return _export(plays, play_rows, PLAYS_TABLES, directory, **kwargs)
@@ -0,0 +1,104 @@
+# coding: utf-8
+"""
+:mod:`boardgamegeek.export.ndjson` - NDJSON export
+==================================================
+
+.. module:: boardgamegeek.export.ndjson
+   :platform: Unix, Windows
+   :synopsis: streaming export of entities as newline delimited JSON
+
+.. moduleauthor:: Cosmin Luță <q4break@gmail.com>
+
+Every entity is written as a JSON object on a line of its own. Containers (collections, plays, hot items) are written
+item by item, and the output is flushed after each line, so a consumer (e.g. a shell pipeline) can process the items
+while they're still being retrieved.
+
+"""
+from __future__ import unicode_literals
+
+import datetime
+import json
+
+from ..objects.collection import Collection
+from ..objects.hotitems import HotItems
+from ..objects.plays import Plays
+from ..utils import BinarySerializable
+
+
+# the containers which are written out item by item
+CONTAINER_TYPES = (Collection, Plays, HotItems)
+
+
+def _default(value):
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if isinstance(value, BinarySerializable):
+        return value._serialized_data()
+    if isinstance(value, bytes):
+        return value.decode("utf-8", "replace")
+    raise TypeError("can't convert {!r} to JSON".format(value))
+
+
+def dumps(entity, extra=None):
+    """
+    :param entity: the entity to convert
+    :param dict extra: if not ``None``, fields added to the entity's data (e.g. the owner of a collection item)
+    :return: the entity's data, as a single line of JSON (without the trailing newline)
+    :rtype: str
+    """
+    data = entity._serialized_data()
+    if extra:
+        data = dict(data, **extra)
+    return json.dumps(data, default=_default, ensure_ascii=False, sort_keys=True,
+                      separators=(",", ":"))
+
+
+def iter_items(entities):
+    """
+    Flattens the entities to be written: containers are replaced by their items
+
+    :param entities: an entity, a container or an iterable of them (e.g. a generator)
+    :return: generator of entities
+    """
+    if isinstance(entities, CONTAINER_TYPES):
+        for item in entities:
+            yield item
+    elif isinstance(entities, BinarySerializable):
+        yield entities
+    else:
+        for entity in entities:
+            for item in iter_items(entity):
+                yield item
+
+
+def iter_lines(entities, extra=None):
+    """
+    :param entities: an entity, a container or an iterable of them (e.g. a generator)
+    :param dict extra: if not ``None``, fields added to each line
+    :return: generator of NDJSON lines (each one ending with a newline)
+    :rtype: generator of str
+    """
+    for item in iter_items(entities):
+        yield dumps(item, extra) + "\n"
+
+
+def write(entities, stream, flush=True, extra=None):
+    """
+    Writes entities to a stream, one line at a time
+
+    :param entities: an entity, a container or an iterable of them (e.g. a generator)
+    :param stream: text stream to write to (e.g. ``sys.stdout``)
+    :param bool flush: if ``True``, flush the stream after each line
+    :param dict extra: if not ``None``, fields added to each line
+    :return: the number of lines written
+    :rtype: int
+    """
+    count = 0
+    for line in iter_lines(entities, extra):
+        stream.write(line)
+        if flush:
+            stream.flush()
+        count += 1
+    return count
@@ -0,0 +1,212 @@
+# coding: utf-8
+"""
+:mod:`boardgamegeek.export.rows` - Flat rows out of entities
+============================================================
+
+.. module:: boardgamegeek.export.rows
+   :platform: Unix, Windows
+   :synopsis: stable tabular layout of games, collections and plays
+
+.. moduleauthor:: Cosmin Luță <q4break@gmail.com>
+
+"""
+from __future__ import unicode_literals
+
+# The tables and their columns. Each column has one of the types: "int64", "float64", "bool", "string", "date".
+# Columns are only ever added at the end of a table, so that the schemas stay stable.
+TABLES = {
+    "games": [("id", "int64"),
+              ("name", "string"),
+              ("year", "int64"),
+              ("min_players", "int64"),
+              ("max_players", "int64"),
+              ("playing_time", "int64"),
+              ("min_playing_time", "int64"),
+              ("max_playing_time", "int64"),
+              ("min_age", "int64"),
+              ("expansion", "bool"),
+              ("accessory", "bool"),
+              ("users_rated", "int64"),
+              ("rating_average", "float64"),
+              ("rating_bayes_average", "float64"),
+              ("rating_stddev", "float64"),
+              ("rating_median", "float64"),
+              ("rating_num_weights", "int64"),
+              ("rating_average_weight", "float64"),
+              ("users_owned", "int64"),
+              ("bgg_rank", "int64"),
+              ("thumbnail", "string"),
+              ("image", "string")],
+
+    "game_links": [("game_id", "int64"),
+                   ("type", "string"),
+                   ("link_id", "int64"),
+                   ("value", "string")],
+
+    "ranks": [("game_id", "int64"),
+              ("rank_id", "int64"),
+              ("name", "string"),
+              ("friendly_name", "string"),
+              ("value", "int64"),
+              ("bayes_average", "float64")],
+
+    "collection_items": [("owner", "string"),
+                         ("game_id", "int64"),
+                         ("name", "string"),
+                         ("year", "int64"),
+                         ("rating", "float64"),
+                         ("numplays", "int64"),
+                         ("owned", "bool"),
+                         ("prev_owned", "bool"),
+                         ("preordered", "bool"),
+                         ("for_trade", "bool"),
+                         ("want", "bool"),
+                         ("want_to_play", "bool"),
+                         ("want_to_buy", "bool"),
+                         ("wishlist", "bool"),
+                         ("wishlist_priority", "int64"),
+                         ("last_modified", "string"),
+                         ("comment", "string"),
+                         ("rating_average", "float64"),
+                         ("bgg_rank", "int64")],
+
+    "plays": [("id", "int64"),
+              ("user_id", "int64"),
+              ("game_id", "int64"),
+              ("game_name", "string"),
+              ("date", "date"),
+              ("quantity", "int64"),
+              ("duration", "int64"),
+              ("incomplete", "bool"),
+              ("nowinstats", "bool"),
+              ("location", "string"),
+              ("comment", "string")],
+
+    "play_players": [("play_id", "int64"),
+                     ("position", "int64"),
+                     ("username", "string"),
+                     ("user_id", "int64"),
+                     ("name", "string"),
+                     ("color", "string"),
+                     ("start_position", "string"),
+                     ("score", "string"),
+                     ("win", "bool"),
+                     ("new", "bool"),
+                     ("rating", "string")]
+}
+
+# the tables filled out of each kind of entity
+GAME_TABLES = ["games", "game_links", "ranks"]
+COLLECTION_TABLES = ["collection_items"]
+PLAYS_TABLES = ["plays", "play_players"]
+
+# link lists of a game, exported to game_links
+GAME_LINKS = [("category", "categories"),
+              ("mechanic", "mechanics"),
+              ("family", "families"),
+              ("designer", "designers"),
+              ("artist", "artists"),
+              ("publisher", "publishers"),
+              ("implementation", "implementations")]
+
+
+def _int(value):
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _float(value):
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _bool(value):
+    if value is None:
+        return None
+    try:
+        return bool(int(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _date(value):
+    if value is None:
+        return None
+    return value.date() if hasattr(value, "date") else value
+
+
+def game_rows(game):
+    """
+    :param game: :py:class:`boardgamegeek.objects.games.BoardGame`
+    :return: the game's rows, for each of :py:data:`GAME_TABLES`
+    :rtype: dict
+    """
+    games = [(game.id, game.name, _int(game.year), _int(game.min_players), _int(game.max_players),
+              _int(game.playing_time), _int(game.min_playing_time), _int(game.max_playing_time), _int(game.min_age),
+              bool(game.expansion), bool(game.accessory), _int(game.users_rated), _float(game.rating_average),
+              _float(game.rating_bayes_average), _float(game.rating_stddev), _float(game.rating_median),
+              _int(game.rating_num_weights), _float(game.rating_average_weight), _int(game.users_owned),
+              _int(game.bgg_rank), game.thumbnail, game.image)]
+
+    links = [(game.id, link_type, None, value)
+             for link_type, attribute in GAME_LINKS
+             for value in getattr(game, attribute) or []]
+    links.extend((game.id, "expansion", thing.id, thing.name) for thing in game.expansions)
+    links.extend((game.id, "expands", thing.id, thing.name) for thing in game.expands)
+
+    ranks = [(game.id, rank.id, rank.name, rank.friendly_name, _int(rank.value), _float(rank.rating_bayes_average))
+             for rank in game.ranks]
+
+    return {"games": games, "game_links": links, "ranks": ranks}
+
+
+def collection_rows(collection):
+    """
+    :param collection: :py:class:`boardgamegeek.objects.collection.Collection`
+    :return: the collection's rows, for each of :py:data:`COLLECTION_TABLES`
+    :rtype: dict
+    """
+    return {"collection_items": [collection_item_row(collection.owner, item) for item in collection]}
+
+
+def collection_item_row(owner, item):
+    """
+    :param str owner: the collection's owner
+    :param item: :py:class:`boardgamegeek.objects.games.CollectionBoardGame`
+    :return: the item's row in the ``collection_items`` table
+    :rtype: tuple
+    """
+    return (owner, item.id, item.name, _int(item.year), _float(item.rating), _int(item.numplays), item.owned,
+            item.prev_owned, item.preordered, item.for_trade, item.want, item.want_to_play, item.want_to_buy,
+            item.wishlist, _int(item.wishlist_priority), item.last_modified, item.comment,
+            _float(item.rating_average), _int(item.bgg_rank))
+
+
+def play_rows(play):
+    """
+    :param play: :py:class:`boardgamegeek.objects.plays.PlaySession`
+    :return: the play's rows, for each of :py:data:`PLAYS_TABLES`
+    :rtype: dict
+    """
+    plays = [(play.id, _int(play.user_id), _int(play.game_id), play.game_name, _date(play.date), _int(play.quantity),
+              _int(play.duration), _bool(play.incomplete), _bool(play.nowinstats), play.location, play.comment)]
+
+    players = [(play.id, position, player.username, _int(player.user_id), player.name, player.color,
+                player.startposition, player.score, _bool(player.win), _bool(player.new), player.rating)
+               for position, player in enumerate(play.players)]
+
+    return {"plays": plays, "play_players": players}
+
+
+def row_dict(table, row):
+    """
+    :param str table: the table's name
+    :param tuple row: a row of the table
+    :return: the row, as a dictionary having the column names as keys
+    :rtype: dict
+    """
+    return {name: value for (name, _), value in zip(TABLES[table], row)}
@@ -0,0 +1,156 @@
+# coding: utf-8
+"""
+:mod:`boardgamegeek.instrumentation` - Request instrumentation
+==============================================================
+
+.. module:: boardgamegeek.instrumentation
+   :platform: Unix, Windows
+   :synopsis: events describing the requests made to the BGG API, for monitoring where the time goes
+
+.. moduleauthor:: Cosmin Luță <q4break@gmail.com>
+
+For each request made to the API, the client creates a :py:class:`RequestEvent`, fills it in while the request is
+retried, waits for the rate limiter, gets the response, parses it and loads the objects out of it, then passes it to
+the hooks added with :py:meth:`boardgamegeek.api.BGGCommon.add_request_hook`::
+
+    >>> def hook(event):
+    ...     print(event.endpoint, event.status, event.network_time, event.load_time)
+    >>> bgg = BGGClient()
+    >>> bgg.add_request_hook(hook)
+
+"""
+from __future__ import unicode_literals
+
+import collections
+import logging
+import threading
+import time
+
+
+log = logging.getLogger("boardgamegeek.instrumentation")
+
+_local = threading.local()
+
+# a step of a request: ``attempt``, ``rate_limit_wait``, ``retry_wait``, ``parse`` or ``load``, when it started and
+# ended (as returned by ``time.time()``) and the details of the step (e.g. the attempt's number and HTTP status)
+Phase = collections.namedtuple("Phase", ["name", "start", "end", "attributes"])
+
+
+class RequestEvent(object):
+    """
+    Describes a call of an API endpoint, including all its attempts. Times are in seconds.
+
+    :ivar str endpoint: the endpoint which was called (e.g. ``thing``)
+    :ivar str url: the endpoint's URL
+    :ivar dict params: the request's parameters
+    :ivar float start: when the request started (as returned by ``time.time()``)
+    :ivar float end: when the event was completed (after loading the objects), ``None`` before
+    :ivar int attempts: how many times the request was sent
+    :ivar list statuses: the HTTP status of each attempt (``None`` for the ones which timed out)
+    :ivar float rate_limit_wait: time spent waiting for the rate limiter
+    :ivar float network_time: time spent sending the requests and receiving the responses
+    :ivar float retry_wait: time spent sleeping between attempts
+    :ivar int bytes: size of the response's body
+    :ivar bool from_cache: ``True`` if the response came from the cache
+    :ivar float parse_time: time spent parsing the XML
+    :ivar int elements: number of XML elements in the response
+    :ivar float load_time: time spent creating the objects out of the XML
+    :ivar Exception error: the exception the request failed with, ``None`` if it succeeded
+    :ivar list phases: the steps of the request, in the order they ended (list of :py:class:`Phase`)
+    """
+    __slots__ = ("endpoint", "url", "params", "start", "end", "attempts", "statuses", "rate_limit_wait",
+                 "network_time", "retry_wait", "bytes", "from_cache", "parse_time", "elements", "load_time", "error",
+                 "phases")
+
+    def __init__(self, url, params):
+        self.url = url
+        self.endpoint = url[url.rfind("/") + 1:]
+        self.params = dict(params or {})
+        self.start = time.time()
+        self.end = None
+        self.attempts = 0
+        self.statuses = []
+        self.rate_limit_wait = 0.0
+        self.network_time = 0.0
+        self.retry_wait = 0.0
+        self.bytes = 0
+        self.from_cache = False
+        self.parse_time = 0.0
+        self.elements = 0
+        self.load_time = 0.0
+        self.error = None
+        self.phases = []
+
+    def add_phase(self, name, start, end, **attributes):
+        """
+        Records a step of the request
+
+        :param str name: the step's name
+        :param float start: when it started
+        :param float end: when it ended
+        :param attributes: its details
+        """
+        self.phases.append(Phase(name, start, end, attributes))
+
+    @property
+    def status(self):
+        """
+        :return: the HTTP status of the last attempt, ``None`` if there was none or it timed out
+        :rtype: int
+        """
+        return self.statuses[-1] if self.statuses else None
+
+    @property
+    def retries(self):
+        """
+        :return: how many times the request was retried
+        :rtype: int
+        """
+        return max(self.attempts - 1, 0)
+
+    @property
+    def total_time(self):
+        """
+        :return: the time from the start of the request until the objects were loaded (or until now, if not done)
+        :rtype: float
+        """
+        return (self.end if self.end is not None else time.time()) - self.start
+
+    def __repr__(self):
+        return "RequestEvent({} {}, status: {}, attempts: {}, {:.3f}s)".format(self.endpoint, self.params, self.status,
+                                                                         self.attempts, self.total_time)
+
+
+def current_event():
+    """
+    :return: the event of the request being sent by the current thread, ``None`` if there is none
+    :rtype: :py:class:`RequestEvent`
+    """
+    return getattr(_local, "event", None)
+
+
+def set_current_event(event):
+    """
+    Sets the event of the request being sent by the current thread (so the layers below the client, e.g. the rate
+    limiter, can report to it)
+
+    :param RequestEvent event: the event, or ``None``
+    :return: the previous current event
+    """
+    previous = current_event()
+    _local.event = event
+    return previous
+
+
+def emit(hooks, event):
+    """
+    Passes an event to hooks. Exceptions raised by the hooks are logged, they don't affect the request.
+
+    :param list hooks: callables receiving the event
+    :param RequestEvent event: the event
+    """
+    for hook in hooks:
+        try:
+            hook(event)
+        except Exception as e:
+            log.warning("request hook {!r} failed: {}".format(hook, e))
@@ -1,7 +1,7 @@
 from ..objects.collection import Collection
 from ..exceptions import BGGApiError, BGGItemNotFoundError
 from ..utils import get_board_game_version_from_element
-from ..utils import xml_subelement_text, xml_subelement_attr
+from ..utils import xml_subelement_text, xml_subelement_attr, LazyXmlData, decode_all, pool_intern, ABSENT
 
 
 def create_collection_from_xml(xml_root, user_name):
@@ -16,77 +16,101 @@ def create_collection_from_xml(xml_root, user_name):
     return Collection({"owner": user_name})
 
 
-def add_collection_items_from_xml(collection, xml_root, subtype):
+def _decode_stats(item, pool=None):
+    stats = item.find("stats")
+    if stats is None:
+        raise BGGApiError("missing 'stats'")
+    return stats
 
-    added_items = False
 
-    for item in xml_root.findall("item[@subtype='{}']".format(subtype)):
+def _decode_stat_data(item, pool):
+    stats = _decode_stats(item)
 
-        # initial data for this collection item
-        data = {"name": xml_subelement_text(item, "name"),
-                "id": int(item.attrib["objectid"]),
-                "image": xml_subelement_text(item, "image"),
-                "thumbnail": xml_subelement_text(item, "thumbnail"),
-                "yearpublished": xml_subelement_attr(item,
-                                                     "yearpublished",
-                                                     default=0,
-                                                     convert=int,
-                                                     quiet=True),
-                "numplays": xml_subelement_text(item, "numplays", convert=int, default=0),
-                "comment": xml_subelement_text(item, "comment", default='')}
-
-        # Add item statistics
-        stats = item.find("stats")
-        if stats is None:
-            raise BGGApiError("missing 'stats'")
-
-        stat_data = {"usersrated": xml_subelement_attr(stats, "usersrated", convert=int, quiet=True),
-                     "average": xml_subelement_attr(stats, "average", convert=float, quiet=True),
-                     "bayesaverage": xml_subelement_attr(stats, "bayesaverage", convert=float, quiet=True),
-                     "stddev": xml_subelement_attr(stats, "stddev", convert=float, quiet=True),
-                     "median": xml_subelement_attr(stats, "median", convert=float, quiet=True),
-                     "ranks": []}
-
-        for rank in stats.findall("ranks/rank"):
-            stat_data["ranks"].append({"type": rank.attrib.get("type"),
-                                       "id": rank.attrib["id"],
-                                       "name": rank.attrib["name"],
-                                       "friendlyname": rank.attrib["friendlyname"],
+    stat_data = {"usersrated": xml_subelement_attr(stats, "usersrated", convert=int, quiet=True),
+                 "average": xml_subelement_attr(stats, "average", convert=float, quiet=True),
+                 "bayesaverage": xml_subelement_attr(stats, "bayesaverage", convert=float, quiet=True),
+                 "stddev": xml_subelement_attr(stats, "stddev", convert=float, quiet=True),
+                 "median": xml_subelement_attr(stats, "median", convert=float, quiet=True),
+                 "ranks": []}
+
+    for rank in stats.findall("ranks/rank"):
+        try:
+            stat_data["ranks"].append({"type": pool_intern(pool, rank.attrib.get("type")),
+                                       "id": pool_intern(pool, rank.attrib["id"]),
+                                       "name": pool_intern(pool, rank.attrib["name"]),
+                                       "friendlyname": pool_intern(pool, rank.attrib["friendlyname"]),
                                        "value": rank.attrib.get("value"),
                                        "bayesaverage": float(rank.attrib.get("bayesaverage", 0.0))})
+        except KeyError:
+            raise BGGApiError("malformed XML element ('rank')")
+    return stat_data
 
-        data.update({"stats": stat_data,
-                     "minplayers": int(stats.attrib.get("minplayers", 0)),
-                     "maxplayers": int(stats.attrib.get("maxplayers", 0)),
-                     "minplaytime": int(stats.attrib.get("minplaytime", 0)),
-                     "maxplaytime": int(stats.attrib.get("maxplaytime", 0)),
-                     "playingtime": int(stats.attrib.get("playingtime", 0)),
-                     "rating": xml_subelement_attr(stats, "rating", convert=float, quiet=True)})
 
+def _decode_stats_int(attribute):
+    def decode(item, pool):
+        return int(_decode_stats(item).attrib.get(attribute, 0))
+    return decode
+
+
+def _decode_status(attribute):
+    def decode(item, pool):
         # status of the item in the collection
         status = item.find("status")
-        if status is not None:
-            data.update({stat: status.attrib.get(stat) for stat in ["lastmodified",
-                                                                    "own",
-                                                                    "preordered",
-                                                                    "prevowned",
-                                                                    "want",
-                                                                    "wanttobuy",
-                                                                    "wanttoplay",
-                                                                    "fortrade",
-                                                                    "wishlist",
-                                                                    "wishlistpriority"]})
-
-        # get the version, if any
-        version = item.find("version")
-        if version is not None:
-            # This collection item has version information
-            ver = version.find("item[@type='boardgameversion']")
-            if ver is not None:
-                try:
-                    data["versions"] = [get_board_game_version_from_element(ver)]
-                except KeyError:
-                    raise BGGApiError("malformed XML element ('version')")
+        if status is None:
+            return ABSENT
+        return status.attrib.get(attribute)
+    return decode
+
+
+def _decode_versions(item, pool):
+    # get the version, if any
+    version = item.find("version")
+    ver = version.find("item[@type='boardgameversion']") if version is not None else None
+    if ver is None:
+        return ABSENT
+
+    # This collection item has version information
+    try:
+        return [get_board_game_version_from_element(ver, pool)]
+    except KeyError:
+        raise BGGApiError("malformed XML element ('version')")
+
+
+# how each key of a collection item's data is decoded out of its <item> element. A decoder returns ABSENT if the
+# key isn't present for an item, and raises BGGApiError if the XML is malformed.
+COLLECTION_ITEM_DECODERS = {
+    "name": lambda item, pool: xml_subelement_text(item, "name"),
+    "image": lambda item, pool: xml_subelement_text(item, "image"),
+    "thumbnail": lambda item, pool: xml_subelement_text(item, "thumbnail"),
+    "yearpublished": lambda item, pool: xml_subelement_attr(item, "yearpublished", default=0, convert=int, quiet=True),
+    "numplays": lambda item, pool: xml_subelement_text(item, "numplays", convert=int, default=0),
+    "comment": lambda item, pool: xml_subelement_text(item, "comment", default=''),
+    "stats": _decode_stat_data,
+    "rating": lambda item, pool: xml_subelement_attr(_decode_stats(item), "rating", convert=float, quiet=True),
+    "versions": _decode_versions
+}
+
+for _stat in ["minplayers", "maxplayers", "minplaytime", "maxplaytime", "playingtime"]:
+    COLLECTION_ITEM_DECODERS[_stat] = _decode_stats_int(_stat)
+
+for _stat in ["lastmodified", "own", "preordered", "prevowned", "want", "wanttobuy", "wanttoplay", "fortrade",
+              "wishlist", "wishlistpriority"]:
+    COLLECTION_ITEM_DECODERS[_stat] = _decode_status(_stat)
+
+
+def add_collection_items_from_xml(collection, xml_root, subtype, lazy=False, pool=None):
+
+    added_items = False
+
+    for item in xml_root.findall("item[@subtype='{}']".format(subtype)):
+
+        # initial data for this collection item
+        data = {"id": int(item.attrib["objectid"])}
+
+        if lazy:
+            data = LazyXmlData(item, COLLECTION_ITEM_DECODERS, data, pool=pool)
+        else:
+            decode_all(item, COLLECTION_ITEM_DECODERS, data, pool=pool)
 
         collection.add_game(data)
         added_items = True
@@ -3,149 +3,212 @@ import logging
 from ..objects.games import BoardGame
 from ..exceptions import BGGApiError
 from ..utils import xml_subelement_attr_list, xml_subelement_text, xml_subelement_attr, get_board_game_version_from_element, html_unescape
+from ..utils import LazyXmlData, decode_all, pool_intern, ABSENT
 
 log = logging.getLogger("boardgamegeek.loaders.game")
 
 
-def create_game_from_xml(xml_root, game_id):
+def _decode_link_list(link_type):
+    def decode(xml_root, pool):
+        values = xml_subelement_attr_list(xml_root, "link[@type='{}']".format(link_type))
+        if pool is None:
+            return values
+        # the same names show up in the lists of many games, share them (not the lists, which are the games' own)
+        return [pool.intern(value) for value in values]
+    return decode
 
-    game_type = xml_root.attrib["type"]
-    if game_type not in ["boardgame", "boardgameexpansion", "boardgameaccessory"]:
-        log.debug("unsupported type {} for item id {}".format(game_type, game_id))
-        raise BGGApiError("item has an unsupported type")
 
-    data = {"id": game_id,
-            "name": xml_subelement_attr(xml_root, "name[@type='primary']"),
-            "alternative_names": xml_subelement_attr_list(xml_root, "name[@type='alternate']"),
-            "thumbnail": xml_subelement_text(xml_root, "thumbnail"),
-            "image": xml_subelement_text(xml_root, "image"),
-            "expansion": game_type == "boardgameexpansion",       # is this game an expansion?
-            "accessory": game_type == "boardgameaccessory",       # is this game an accessory?
-            "families": xml_subelement_attr_list(xml_root, "link[@type='boardgamefamily']"),
-            "categories": xml_subelement_attr_list(xml_root, "link[@type='boardgamecategory']"),
-            "implementations": xml_subelement_attr_list(xml_root, "link[@type='boardgameimplementation']"),
-            "mechanics": xml_subelement_attr_list(xml_root, "link[@type='boardgamemechanic']"),
-            "designers": xml_subelement_attr_list(xml_root, "link[@type='boardgamedesigner']"),
-            "artists": xml_subelement_attr_list(xml_root, "link[@type='boardgameartist']"),
-            "publishers": xml_subelement_attr_list(xml_root, "link[@type='boardgamepublisher']"),
-            "description": xml_subelement_text(xml_root, "description", convert=html_unescape, quiet=True)}
-
-    expands = []        # list of items this game expands
-    expansions = []     # list of expansions this game has
-    for e in xml_root.findall("link[@type='boardgameexpansion']"):
-        try:
-            item = {"id": e.attrib["id"], "name": e.attrib["value"]}
-        except KeyError:
-            raise BGGApiError("malformed XML element ('link type=boardgameexpansion')")
+def _decode_int(subelement):
+    def decode(xml_root, pool):
+        return xml_subelement_attr(xml_root, subelement, convert=int, quiet=True)
+    return decode
+
 
-        if e.attrib.get("inbound", "false").lower()[0] == 't':
-            # this is an item expanded by game_id
-            expands.append(item)
-        else:
-            expansions.append(item)
+def _decode_expansion_links(inbound):
+    def decode(xml_root, pool):
+        items = []
+        for e in xml_root.findall("link[@type='boardgameexpansion']"):
+            try:
+                item = {"id": e.attrib["id"], "name": e.attrib["value"]}
+            except KeyError:
+                raise BGGApiError("malformed XML element ('link type=boardgameexpansion')")
 
-    data["expansions"] = expansions
-    data["expands"] = expands
+            # inbound links are the items expanded by this game
+            if (e.attrib.get("inbound", "false").lower()[0] == 't') == inbound:
+                items.append(item)
+        return items
+    return decode
 
-    # These XML elements have a numberic value, attempt to convert them to integers
-    for i in ["yearpublished", "minplayers", "maxplayers", "playingtime", "minplaytime", "maxplaytime", "minage"]:
-        data[i] = xml_subelement_attr(xml_root, i, convert=int, quiet=True)
 
-    # Look for the videos
+def _decode_videos(xml_root, pool):
     # TODO: The BGG API doesn't take the page=NNN parameter into account for videos; when it does, paginate them too
     videos = xml_root.find("videos")
-    if videos is not None:
-        vid_list = []
-        for vid in videos.findall("video"):
-            try:
-                vd = {"id": vid.attrib["id"],
-                      "name": vid.attrib["title"],
-                      "category": vid.attrib.get("category"),
-                      "language": vid.attrib.get("language"),
-                      "link": vid.attrib["link"],
-                      "uploader": vid.attrib.get("username"),
-                      "uploader_id": vid.attrib.get("userid"),
-                      "post_date": vid.attrib.get("postdate")
-                      }
-                vid_list.append(vd)
-            except KeyError:
-                raise BGGApiError("malformed XML element ('video')")
+    if videos is None:
+        return ABSENT
 
-        data["videos"] = vid_list
+    vid_list = []
+    for vid in videos.findall("video"):
+        try:
+            vd = {"id": vid.attrib["id"],
+                  "name": vid.attrib["title"],
+                  "category": pool_intern(pool, vid.attrib.get("category")),
+                  "language": pool_intern(pool, vid.attrib.get("language")),
+                  "link": vid.attrib["link"],
+                  "uploader": vid.attrib.get("username"),
+                  "uploader_id": vid.attrib.get("userid"),
+                  "post_date": vid.attrib.get("postdate")
+                  }
+            vid_list.append(vd)
+        except KeyError:
+            raise BGGApiError("malformed XML element ('video')")
 
-    # look for the versions
-    versions = xml_root.find("versions")
-    if versions is not None:
-        ver_list = []
+    return vid_list
 
-        for version in versions.findall("item[@type='boardgameversion']"):
-            try:
-                vd = get_board_game_version_from_element(version)
-                ver_list.append(vd)
-            except KeyError:
-                raise BGGApiError("malformed XML element ('versions')")
 
-        data["versions"] = ver_list
+def _decode_versions(xml_root, pool):
+    versions = xml_root.find("versions")
+    if versions is None:
+        return ABSENT
 
-    # look for the statistics
-    stats = xml_root.find("statistics/ratings")
-    if stats is not None:
-        sd = {
-            "usersrated": xml_subelement_attr(stats, "usersrated", convert=int, quiet=True),
-            "average": xml_subelement_attr(stats, "average", convert=float, quiet=True),
-            "bayesaverage": xml_subelement_attr(stats, "bayesaverage", convert=float, quiet=True),
-            "stddev": xml_subelement_attr(stats, "stddev", convert=float, quiet=True),
-            "median": xml_subelement_attr(stats, "median", convert=float, quiet=True),
-            "owned": xml_subelement_attr(stats, "owned", convert=int, quiet=True),
-            "trading": xml_subelement_attr(stats, "trading", convert=int, quiet=True),
-            "wanting": xml_subelement_attr(stats, "wanting", convert=int, quiet=True),
-            "wishing": xml_subelement_attr(stats, "wishing", convert=int, quiet=True),
-            "numcomments": xml_subelement_attr(stats, "numcomments", convert=int, quiet=True),
-            "numweights": xml_subelement_attr(stats, "numweights", convert=int, quiet=True),
-            "averageweight": xml_subelement_attr(stats, "averageweight", convert=float, quiet=True),
-            "ranks": []
-        }
-
-        ranks = stats.findall("ranks/rank")
-        for rank in ranks:
-            try:
-                rank_value = int(rank.attrib.get("value"))
-            except:
-                rank_value = None
-            sd["ranks"].append({"id": rank.attrib["id"],
-                                "name": rank.attrib["name"],
-                                "friendlyname": rank.attrib.get("friendlyname"),
-                                "value": rank_value})
+    ver_list = []
+    for version in versions.findall("item[@type='boardgameversion']"):
+        try:
+            vd = get_board_game_version_from_element(version, pool)
+            ver_list.append(vd)
+        except KeyError:
+            raise BGGApiError("malformed XML element ('versions')")
 
-        data["stats"] = sd
-        data["suggested_players"] = {}
+    return ver_list
 
-        suggested_players_poll = xml_root.find("poll[@name='suggested_numplayers']")
-        if suggested_players_poll is not None:
-            dsp = data["suggested_players"]
-            dsp.update({"total_votes": int(suggested_players_poll.attrib.get("totalvotes", 0)),
-                        "results": {}})
 
-            for results in suggested_players_poll.findall("results"):
+def _decode_stats(xml_root, pool):
+    stats = xml_root.find("statistics/ratings")
+    if stats is None:
+        return ABSENT
+
+    sd = {
+        "usersrated": xml_subelement_attr(stats, "usersrated", convert=int, quiet=True),
+        "average": xml_subelement_attr(stats, "average", convert=float, quiet=True),
+        "bayesaverage": xml_subelement_attr(stats, "bayesaverage", convert=float, quiet=True),
+        "stddev": xml_subelement_attr(stats, "stddev", convert=float, quiet=True),
+        "median": xml_subelement_attr(stats, "median", convert=float, quiet=True),
+        "owned": xml_subelement_attr(stats, "owned", convert=int, quiet=True),
+        "trading": xml_subelement_attr(stats, "trading", convert=int, quiet=True),
+        "wanting": xml_subelement_attr(stats, "wanting", convert=int, quiet=True),
+        "wishing": xml_subelement_attr(stats, "wishing", convert=int, quiet=True),
+        "numcomments": xml_subelement_attr(stats, "numcomments", convert=int, quiet=True),
+        "numweights": xml_subelement_attr(stats, "numweights", convert=int, quiet=True),
+        "averageweight": xml_subelement_attr(stats, "averageweight", convert=float, quiet=True),
+        "ranks": []
+    }
+
+    ranks = stats.findall("ranks/rank")
+    for rank in ranks:
+        try:
+            rank_value = int(rank.attrib.get("value"))
+        except:
+            rank_value = None
+        try:
+            sd["ranks"].append({"id": pool_intern(pool, rank.attrib["id"]),
+                                "name": pool_intern(pool, rank.attrib["name"]),
+                                "friendlyname": pool_intern(pool, rank.attrib.get("friendlyname")),
+                                "value": rank_value})
+        except KeyError:
+            raise BGGApiError("malformed XML element ('rank')")
+
+    return sd
+
+
+def _decode_suggested_players(xml_root, pool):
+    # only available together with the statistics
+    if xml_root.find("statistics/ratings") is None:
+        return ABSENT
+
+    dsp = {}
+
+    suggested_players_poll = xml_root.find("poll[@name='suggested_numplayers']")
+    if suggested_players_poll is not None:
+        dsp.update({"total_votes": int(suggested_players_poll.attrib.get("totalvotes", 0)),
+                    "results": {}})
+
+        for results in suggested_players_poll.findall("results"):
+
+            player_count = results.attrib.get("numplayers")
+            dspr = {"best_rating": 0,
+                    "recommended_rating": 0,
+                    "not_recommended_rating": 0}
+
+            for result in results.findall("result"):
+                kind = result.attrib.get("value")
+                votes = int(result.attrib.get("numvotes", 0))
+                if kind == "Best":
+                    dspr["best_rating"] = votes
+                elif kind == "Recommended":
+                    dspr["recommended_rating"] = votes
+                elif kind == "Not Recommended":
+                    dspr["not_recommended_rating"] = votes
+
+            dsp["results"][player_count] = dspr
+
+    return dsp
+
+
+# how each key of a game's data is decoded out of its <item> element. A decoder returns ABSENT if the key isn't
+# present for an item, and raises BGGApiError if the XML is malformed.
+GAME_DECODERS = {
+    "name": lambda xml_root, pool: xml_subelement_attr(xml_root, "name[@type='primary']"),
+    "alternative_names": lambda xml_root, pool: xml_subelement_attr_list(xml_root, "name[@type='alternate']"),
+    "thumbnail": lambda xml_root, pool: xml_subelement_text(xml_root, "thumbnail"),
+    "image": lambda xml_root, pool: xml_subelement_text(xml_root, "image"),
+    "families": _decode_link_list("boardgamefamily"),
+    "categories": _decode_link_list("boardgamecategory"),
+    "implementations": _decode_link_list("boardgameimplementation"),
+    "mechanics": _decode_link_list("boardgamemechanic"),
+    "designers": _decode_link_list("boardgamedesigner"),
+    "artists": _decode_link_list("boardgameartist"),
+    "publishers": _decode_link_list("boardgamepublisher"),
+    "description": lambda xml_root, pool: xml_subelement_text(xml_root, "description", convert=html_unescape,
+                                                              quiet=True),
+    "expansions": _decode_expansion_links(inbound=False),
+    "expands": _decode_expansion_links(inbound=True),
+    "videos": _decode_videos,
+    "versions": _decode_versions,
+    "stats": _decode_stats,
+    "suggested_players": _decode_suggested_players
+}
+
+# These XML elements have a numeric value, attempt to convert them to integers
+for _i in ["yearpublished", "minplayers", "maxplayers", "playingtime", "minplaytime", "maxplaytime", "minage"]:
+    GAME_DECODERS[_i] = _decode_int(_i)
+
+
+def create_game_from_xml(xml_root, game_id, lazy=False, pool=None):
+    """
+    Creates a :py:class:`boardgamegeek.objects.games.BoardGame` out of an ``<item>`` element
+
+    :param xml_root: the item's XML element
+    :param integer game_id: the game's id
+    :param bool lazy: if ``True``, the game keeps a reference to ``xml_root`` and decodes each value when first
+                      accessed, instead of decoding everything now
+    :param pool: :py:class:`boardgamegeek.utils.StringPool` used for interning the categorical values (categories,
+                 mechanics, designers, languages, ...), or ``None``
+    :return: the game
+    :rtype: :py:class:`boardgamegeek.objects.games.BoardGame`
+    """
 
-                player_count = results.attrib.get("numplayers")
-                dspr = {"best_rating": 0,
-                        "recommended_rating": 0,
-                        "not_recommended_rating": 0}
+    game_type = xml_root.attrib["type"]
+    if game_type not in ["boardgame", "boardgameexpansion", "boardgameaccessory"]:
+        log.debug("unsupported type {} for item id {}".format(game_type, game_id))
+        raise BGGApiError("item has an unsupported type")
 
-                for result in results.findall("result"):
-                    kind = result.attrib.get("value")
-                    votes = int(result.attrib.get("numvotes", 0))
-                    if kind == "Best":
-                        dspr["best_rating"] = votes
-                    elif kind == "Recommended":
-                        dspr["recommended_rating"] = votes
-                    elif kind == "Not Recommended":
-                        dspr["not_recommended_rating"] = votes
+    data = {"id": game_id,
+            "expansion": game_type == "boardgameexpansion",       # is this game an expansion?
+            "accessory": game_type == "boardgameaccessory"}       # is this game an accessory?
 
-                dsp["results"][player_count] = dspr
+    if lazy:
+        return BoardGame(LazyXmlData(xml_root, GAME_DECODERS, data, pool=pool))
 
-    return BoardGame(data)
+    return BoardGame(decode_all(xml_root, GAME_DECODERS, data, pool=pool))
 
 
 def add_game_comments_from_xml(game, xml_root):
@@ -2,7 +2,7 @@ import logging
 
 from ..objects.plays import UserPlays, GamePlays
 from ..exceptions import BGGItemNotFoundError
-from ..utils import xml_subelement_text, xml_subelement_attr
+from ..utils import xml_subelement_text, xml_subelement_attr, pool_intern
 
 
 log = logging.getLogger("boardgamegeek.loaders.plays")
@@ -31,7 +31,7 @@ def create_plays_from_xml(xml_root, game_id=None):
         return GamePlays({"game_id": game_id, "plays_count": count})
 
 
-def add_plays_from_xml(plays, xml_root):
+def add_plays_from_xml(plays, xml_root, pool=None):
 
     added_items = False
 
@@ -47,7 +47,9 @@ def add_plays_from_xml(plays, xml_root):
                            "win": player.attrib.get("win"),
                            "rating": player.attrib.get("rating"),
                            "score": player.attrib.get("score"),
-                           "color": player.attrib.get("color"),
+                           # the same few colors show up in many plays (names and locations are free text, they
+                           # aren't pooled: the pool would grow with every new player)
+                           "color": pool_intern(pool, player.attrib.get("color")),
                            "location": player.attrib.get("location")}
 
             player_list.append(player_data)
@@ -1,9 +1,15 @@
-from __future__ import unicode_literals
+from __future__ import unicode_literals, print_function
+import io
 import sys
 import argparse
 import logging
 
 from boardgamegeek.api import BGGClient, HOT_ITEM_CHOICES
+from boardgamegeek.exceptions import BGGValueError
+from boardgamegeek.cache import CacheBackendNone, CacheBackendSqlite, default_cache_path
+from boardgamegeek.bulk import DEFAULT_WORKERS, chunks, fetch_concurrently, read_keys
+from boardgamegeek.export import ndjson
+from boardgamegeek.profiling import Profiler
 
 log = logging.getLogger("boardgamegeek")
 log_fmt = "[%(levelname)s] %(message)s"
@@ -18,7 +24,7 @@ def brief_game_stats(game):
                " / ".join(game.categories).lower(),
                " / ".join(game.mechanics).lower())
 
-        print >>sys.stderr, "{}".format(desc)
+        print(desc)
         sys.stdout.flush()
     except Exception as e:
         pass
@@ -37,7 +43,141 @@ def brief_game_stats(game):
     log.info("MY SCORE    : {}".format(my_score))
 
 
-def main():
+def output(result, args, extra=None):
+    """
+    Outputs a result: logs its human readable description, or writes it to the standard output as NDJSON (containers
+    and iterables are written item by item, as they're retrieved, with the ``extra`` fields added to each line)
+    """
+    if args.output == "ndjson":
+        ndjson.write(result, sys.stdout, extra=extra)
+        return
+
+    if isinstance(result, list):
+        for item in result:
+            item._format(log)
+            log.info("")
+    else:
+        result._format(log)
+
+
+def open_keys(path):
+    if path == "-":
+        return sys.stdin
+    return io.open(path, "r", encoding="utf-8")
+
+
+def run_bulk(bgg, args):
+    """
+    Runs a bulk command: retrieves the games, collections or plays for all the ids or user names read from a file
+    (or the standard input), using several threads, and outputs each result as soon as it's retrieved.
+
+    :return: the number of ids or users which couldn't be retrieved
+    """
+    source = open_keys(args.ids_from if args.command == "games" else args.users_from)
+
+    if args.command == "games":
+        # several games are retrieved with a single request
+        keys = chunks(read_keys(source, convert=int), args.chunk_size)
+        fetch = lambda ids: bgg.game_list(ids, versions=args.versions, videos=args.videos)
+        extra = lambda ids: None
+    elif args.command == "collections":
+        keys = read_keys(source)
+        fetch = lambda user: bgg.collection(user, versions=True)
+        extra = lambda user: {"owner": user}
+    else:
+        keys = read_keys(source)
+        fetch = lambda user: bgg.plays(name=user)
+        extra = lambda user: {"username": user}
+
+    failures = 0
+    try:
+        for key, result, error in fetch_concurrently(fetch, keys, workers=args.workers):
+            if error is not None:
+                log.error("failed to retrieve {}: {}".format(key, error))
+                failures += 1
+            else:
+                output(result, args, extra=extra(key))
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+    return failures
+
+
+def run(bgg, args, progress_cb):
+    """
+    Runs the operations requested on the command line
+
+    :return: the number of ids or users which couldn't be retrieved by the bulk commands
+    """
+    failures = 0
+    if args.command:
+        failures = run_bulk(bgg, args)
+
+    if args.user:
+        user = bgg.user(args.user, progress=progress_cb)
+        output(user, args)
+
+    # query by game id
+    if args.id:
+        game = bgg.game(game_id=args.id, comments=True)
+        output(game, args)
+
+    # query by game name
+    if args.game:
+        # fetch the most popular
+        if args.most_popular:
+            game = bgg.game(args.game, choose="best-rank", comments=True)
+        else:
+        # fetch the most recent one
+            game = bgg.game(args.game, choose="recent", comments=True)
+        output(game, args)
+
+    if args.game_stats:
+        game = bgg.game(args.game_stats)
+        if args.output == "ndjson":
+            output(game, args)
+        else:
+            brief_game_stats(game)
+
+    if args.guild:
+        guild = bgg.guild(args.guild, progress=progress_cb)
+        output(guild, args)
+
+    if args.collection:
+        collection = bgg.collection(args.collection, versions=True)
+        output(collection, args)
+
+    if args.plays:
+        if args.output == "ndjson":
+            # stream the plays as the pages are retrieved
+            output(bgg.iter_plays(name=args.plays, progress=progress_cb), args)
+        else:
+            output(bgg.plays(name=args.plays, progress=progress_cb), args)
+
+    if args.plays_by_game:
+        try:
+            game_id = int(args.plays_by_game)
+        except:
+            game_id = bgg.get_game_id(args.plays_by_game)
+
+        if args.output == "ndjson":
+            output(bgg.iter_plays(game_id=game_id, progress=progress_cb), args)
+        else:
+            output(bgg.plays(game_id=game_id, progress=progress_cb), args)
+
+    if args.hot_items:
+        hot_items = bgg.hot_items(args.hot_items)
+        output(list(hot_items), args)
+
+    if args.search:
+        results = bgg.search(args.search)
+        output(results, args)
+
+    return failures
+
+
+def main(argv=None):
     p = argparse.ArgumentParser(prog="boardgamegeek")
 
     p.add_argument("-u", "--user", help="Query by user name")
@@ -54,12 +194,46 @@ def main():
     p.add_argument("-H", "--hot-items", help="List all hot items by type", choices=HOT_ITEM_CHOICES)
     p.add_argument("-S", "--search", help="search and return results")
     p.add_argument("--debug", action="store_true")
+    p.add_argument("--profile", help="profile the operation and write a report of where the time was spent to the "
+                                     "standard error", action="store_true")
+    p.add_argument("--profile-output", help="with --profile, also save the profiling statistics (for pstats) to FILE",
+                   metavar="FILE")
     p.add_argument("--retries", help="number of retries to perform in case of timeout or API HTTP 202 code",
                    type=int,
                    default=5)
     p.add_argument("--timeout", help="Timeout for API operations", type=int, default=10)
+    p.add_argument("--cache", help="path of the on-disk cache of the API responses (default: %(default)s)",
+                   metavar="PATH", default=default_cache_path())
+    p.add_argument("--cache-ttl", help="how long (in seconds) the cached responses are used (default: %(default)s)",
+                   type=int, default=3600)
+    p.add_argument("--no-cache", help="don't cache the API responses", action="store_true")
+    p.add_argument("-o", "--output", help="output format: human readable text (default) or NDJSON (one JSON object "
+                                          "per line, written to the standard output)",
+                   choices=["text", "ndjson"], default="text")
+
+    commands = p.add_subparsers(dest="command", title="bulk commands",
+                                description="retrieve data for many ids or users, reading them from a file "
+                                            "(or - for the standard input), one or more per line")
+    commands.required = False
+
+    games = commands.add_parser("games", help="retrieve games")
+    games.add_argument("--ids-from", help="file containing the game ids", required=True, metavar="FILE")
+    games.add_argument("--chunk-size", help="number of games retrieved with each request (default: %(default)s)",
+                       type=int, default=20)
+    games.add_argument("--versions", help="include the games' versions", action="store_true")
+    games.add_argument("--videos", help="include the games' videos", action="store_true")
+
+    collections = commands.add_parser("collections", help="retrieve users' collections")
+    collections.add_argument("--users-from", help="file containing the user names", required=True, metavar="FILE")
+
+    plays = commands.add_parser("plays", help="retrieve users' plays")
+    plays.add_argument("--users-from", help="file containing the user names", required=True, metavar="FILE")
+
+    for command in [games, collections, plays]:
+        command.add_argument("--workers", help="number of concurrent requests (default: %(default)s)",
+                             type=int, default=DEFAULT_WORKERS)
 
-    args = p.parse_args()
+    args = p.parse_args(argv)
 
     # configure logging
     if args.debug:
@@ -80,67 +254,41 @@ def main():
     def progress_cb(items, total):
         log.debug("fetching items: {}% complete".format(items*100/total))
 
-    if not any([args.user, args.game, args.id, args.guild, args.collection,
+    if not any([args.command, args.user, args.game, args.id, args.guild, args.collection,
                 args.plays, args.plays_by_game, args.hot_items, args.search]):
         p.error("no action specified!")
 
-    bgg = BGGClient(timeout=args.timeout, retries=args.retries)
+    if args.command == "games" and args.chunk_size < 1:
+        p.error("invalid chunk size")
 
-    if args.user:
-        user = bgg.user(args.user, progress=progress_cb)
-        user._format(log)
+    if args.command and args.workers < 1:
+        p.error("invalid number of workers")
 
-    # query by game id
-    if args.id:
-        game = bgg.game(game_id=args.id, comments=True)
-        game._format(log)
-
-    # query by game name
-    if args.game:
-        # fetch the most popular
-        if args.most_popular:
-            game = bgg.game(args.game, choose="best-rank", comments=True)
-        else:
-        # fetch the most recent one
-            game = bgg.game(args.game, choose="recent", comments=True)
-        game._format(log)
-
-    if args.game_stats:
-        game = bgg.game(args.game_stats)
-        brief_game_stats(game)
-
-    if args.guild:
-        guild = bgg.guild(args.guild, progress=progress_cb)
-        guild._format(log)
-
-    if args.collection:
-        collection = bgg.collection(args.collection, versions=True)
-        collection._format(log)
+    if args.no_cache:
+        cache = CacheBackendNone()
+    else:
+        try:
+            cache = CacheBackendSqlite(path=args.cache, ttl=args.cache_ttl)
+        except BGGValueError as e:
+            p.error(str(e))
 
-    if args.plays:
-        plays = bgg.plays(name=args.plays, progress=progress_cb)
-        plays._format(log)
+    bgg = BGGClient(cache=cache, timeout=args.timeout, retries=args.retries)
 
-    if args.plays_by_game:
+    if args.profile:
+        profiler = Profiler().attach(bgg)
         try:
-            game_id = int(args.plays_by_game)
-        except:
-            game_id = bgg.get_game_id(args.plays_by_game)
+            failures = profiler.run(run, bgg, args, progress_cb)
+        finally:
+            # failed runs (timeouts, API errors) are often the ones worth looking into
+            profiler.report(sys.stderr)
+            if args.profile_output:
+                profiler.dump(args.profile_output)
+    else:
+        failures = run(bgg, args, progress_cb)
 
-        plays = bgg.plays(game_id=game_id, progress=progress_cb)
-        plays._format(log)
+    log.debug("cache {}: {}".format("disabled" if args.no_cache else args.cache, cache.stats))
 
-    if args.hot_items:
-        hot_items = bgg.hot_items(args.hot_items)
-        for item in hot_items:
-            item._format(log)
-            log.info("")
-
-    if args.search:
-        results = bgg.search(args.search)
-        for r in results:
-            r._format(log)
-            log.info("")
+    return 1 if failures else 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
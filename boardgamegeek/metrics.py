@@ -0,0 +1,312 @@
+# coding: utf-8
+"""
+:mod:`boardgamegeek.metrics` - Client metrics
+=============================================
+
+.. module:: boardgamegeek.metrics
+   :platform: Unix, Windows
+   :synopsis: counters and histograms of the requests made by clients, in the OpenMetrics (Prometheus) text format
+
+.. moduleauthor:: Cosmin Luță <q4break@gmail.com>
+
+:py:class:`ClientMetrics` is a request hook (see :py:meth:`boardgamegeek.api.BGGCommon.add_request_hook`) keeping
+counters and histograms of the requests it sees, which can be exposed for scraping with :py:func:`start_http_server`.
+There are no dependencies besides the standard library::
+
+    >>> metrics = ClientMetrics()
+    >>> bgg = BGGClient()
+    >>> metrics.attach(bgg)
+    >>> server = start_http_server(metrics, port=9300)
+    >>> print(metrics.exposition())
+
+The same object can be attached to several clients.
+
+"""
+from __future__ import unicode_literals
+
+import logging
+import threading
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+except ImportError:
+    # Python 2
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+
+
+log = logging.getLogger("boardgamegeek.metrics")
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# upper bounds of the request duration histogram's buckets, in seconds
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value):
+    return "{}".format(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_value(value):
+    if isinstance(value, float):
+        if value == float("inf"):
+            return "+Inf"
+        return repr(value)
+    return "{}".format(value)
+
+
+def _sample(name, labels, value):
+    if labels:
+        return "{}{{{}}} {}".format(name,
+                                    ",".join("{}=\"{}\"".format(k, _escape(v)) for k, v in labels),
+                                    _format_value(value))
+    return "{} {}".format(name, _format_value(value))
+
+
+class Metric(object):
+    """
+    Base class of the metrics: a family of values, one for each combination of the values of its labels.
+    Subclasses set ``type`` and define ``samples()``, returning the lines of the metric's samples in the OpenMetrics
+    text format.
+
+    :param str name: the metric's name
+    :param str help: its description
+    :param labels: the names of its labels
+    """
+    type = None
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values = {}
+
+    def _key(self, labels):
+        try:
+            return tuple(labels[name] for name in self.labels)
+        except KeyError as e:
+            raise ValueError("missing label {} of {}".format(e, self.name))
+
+    def exposition(self):
+        """
+        :return: the metric's description and samples, in the OpenMetrics text format
+        :rtype: str
+        """
+        lines = ["# TYPE {} {}".format(self.name, self.type),
+                 "# HELP {} {}".format(self.name, _escape(self.help))]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """ A value which only increases """
+    type = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self):
+        for key in sorted(self._values):
+            yield _sample(self.name + "_total", zip(self.labels, key), self._values[key])
+
+
+class Gauge(Metric):
+    """ A value which can go up and down """
+    type = "gauge"
+
+    def set(self, value, **labels):
+        self._values[self._key(labels)] = value
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels))
+
+    def samples(self):
+        for key in sorted(self._values):
+            yield _sample(self.name, zip(self.labels, key), self._values[key])
+
+
+class Histogram(Metric):
+    """
+    Counts of the observed values falling in buckets, along with their sum
+
+    :param buckets: the upper bounds of the buckets, in increasing order
+    """
+    type = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        super(Histogram, self).__init__(name, help, labels)
+        self.buckets = tuple(float(b) for b in buckets) + (float("inf"),)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        counts, total = self._values.get(key, ([0] * len(self.buckets), 0.0))
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+        self._values[key] = (counts, total + value)
+
+    def count(self, **labels):
+        counts, _ = self._values.get(self._key(labels), ([0], 0.0))
+        return counts[-1]
+
+    def samples(self):
+        for key in sorted(self._values):
+            counts, total = self._values[key]
+            labels = list(zip(self.labels, key))
+            for bound, count in zip(self.buckets, counts):
+                yield _sample(self.name + "_bucket", labels + [("le", _format_value(bound))], count)
+            yield _sample(self.name + "_count", labels, counts[-1])
+            yield _sample(self.name + "_sum", labels, total)
+
+
+class ClientMetrics(object):
+    """
+    Request hook maintaining the metrics of the requests made by clients. Requests are labeled by endpoint (e.g.
+    ``thing``, ``plays``) and, for the statuses, by HTTP status (``timeout`` for the attempts which timed out).
+
+    :param buckets: the upper bounds of the request duration histogram's buckets, in seconds
+    """
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self._lock = threading.Lock()
+
+        self.requests = Counter("bgg_requests", "Requests made to the BGG API, by the status of their last attempt",
+                                ["endpoint", "status"])
+        self.attempts = Counter("bgg_request_attempts", "Attempts of the requests (202 means queued, 503 throttled)",
+                                ["endpoint", "status"])
+        self.errors = Counter("bgg_request_errors", "Requests which failed", ["endpoint"])
+        self.duration = Histogram("bgg_request_duration_seconds",
+                                  "Time from the start of a request until the objects were loaded out of it",
+                                  ["endpoint"], buckets=buckets)
+        self.rate_limit_wait = Counter("bgg_rate_limit_wait_seconds", "Time spent waiting for the rate limiter",
+                                       ["endpoint"])
+        self.retry_wait = Counter("bgg_retry_wait_seconds", "Time spent sleeping before retrying requests",
+                                  ["endpoint"])
+        self.network = Counter("bgg_network_seconds", "Time spent sending requests and receiving responses",
+                               ["endpoint"])
+        self.parse = Counter("bgg_parse_seconds", "Time spent parsing the responses", ["endpoint"])
+        self.load = Counter("bgg_load_seconds", "Time spent creating the objects out of the responses", ["endpoint"])
+        self.response_bytes = Counter("bgg_response_bytes", "Size of the responses", ["endpoint"])
+        self.elements = Counter("bgg_parsed_elements", "XML elements parsed", ["endpoint"])
+        self.cache = Counter("bgg_cache_requests", "Requests answered from the cache (hit) or not (miss)",
+                             ["endpoint", "result"])
+        self.cache_hit_ratio = Gauge("bgg_cache_hit_ratio", "Ratio of the requests answered from the cache")
+        self.elements_per_second = Gauge("bgg_parsed_elements_per_second",
+                                         "XML elements parsed and loaded per second spent parsing and loading")
+
+        self._metrics = [self.requests, self.attempts, self.errors, self.duration, self.rate_limit_wait,
+                         self.retry_wait, self.network, self.parse, self.load, self.response_bytes, self.elements,
+                         self.cache, self.cache_hit_ratio, self.elements_per_second]
+
+        self._cache_hits = 0
+        self._cache_lookups = 0
+        self._elements = 0
+        self._processing_time = 0.0
+
+    def attach(self, client):
+        """
+        Starts counting the requests of a client
+
+        :param client: the client (:py:class:`boardgamegeek.api.BGGCommon`)
+        :return: this object
+        """
+        client.add_request_hook(self)
+        return self
+
+    def detach(self, client):
+        """
+        Stops counting the requests of a client
+
+        :param client: the client (:py:class:`boardgamegeek.api.BGGCommon`)
+        """
+        client.remove_request_hook(self)
+
+    def __call__(self, event):
+        """
+        Updates the metrics with a request
+
+        :param event: :py:class:`boardgamegeek.instrumentation.RequestEvent` describing the request
+        """
+        endpoint = event.endpoint
+
+        def status(value):
+            return "timeout" if value is None else "{}".format(value)
+
+        with self._lock:
+            self.requests.inc(endpoint=endpoint, status=status(event.status))
+            for attempt in event.statuses:
+                self.attempts.inc(endpoint=endpoint, status=status(attempt))
+            if event.error is not None:
+                self.errors.inc(endpoint=endpoint)
+
+            self.duration.observe(event.total_time, endpoint=endpoint)
+            self.rate_limit_wait.inc(event.rate_limit_wait, endpoint=endpoint)
+            self.retry_wait.inc(event.retry_wait, endpoint=endpoint)
+            self.network.inc(event.network_time, endpoint=endpoint)
+            self.parse.inc(event.parse_time, endpoint=endpoint)
+            self.load.inc(event.load_time, endpoint=endpoint)
+            self.response_bytes.inc(event.bytes, endpoint=endpoint)
+            self.elements.inc(event.elements, endpoint=endpoint)
+
+            if event.statuses:
+                self.cache.inc(endpoint=endpoint, result="hit" if event.from_cache else "miss")
+                self._cache_lookups += 1
+                self._cache_hits += int(event.from_cache)
+                self.cache_hit_ratio.set(float(self._cache_hits) / self._cache_lookups)
+
+            self._elements += event.elements
+            self._processing_time += event.parse_time + event.load_time
+            if self._processing_time > 0:
+                self.elements_per_second.set(self._elements / self._processing_time)
+
+    def exposition(self):
+        """
+        :return: the metrics, in the OpenMetrics text format
+        :rtype: str
+        """
+        with self._lock:
+            families = [metric.exposition() for metric in self._metrics]
+        return "\n".join(families) + "\n# EOF\n"
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    # the metrics are set as the server's ``metrics`` attribute
+
+    def do_GET(self):
+        body = self.server.metrics.exposition().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        log.debug("metrics request from {}: {}".format(self.client_address[0], format % args))
+
+
+def start_http_server(metrics, port, addr=""):
+    """
+    Serves the metrics over HTTP (on any path), from a background thread
+
+    :param ClientMetrics metrics: the metrics
+    :param int port: the port to listen on (0 for any free one)
+    :param str addr: the address to listen on (all of them, by default)
+    :return: the server; its ``server_address`` attribute holds the address and port it listens on, calling
+             ``shutdown()`` stops it
+    """
+    server = _ThreadingHTTPServer((addr, port), _MetricsHandler)
+    server.metrics = metrics
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    log.debug("serving metrics on port {}".format(server.server_address[1]))
+    return server
@@ -17,6 +17,8 @@ from copy import copy
 from ..exceptions import BGGError
 from ..utils import DictObject
 from .games import CollectionBoardGame
+from .columnar import CollectionColumns
+from .things import thing_id
 
 
 class Collection(DictObject):
@@ -30,7 +32,8 @@ class Collection(DictObject):
         kw = copy(data)
 
         self._items = []
-        self.__game_ids = set()
+        self._items_by_id = {}          # game id -> item
+        self._columns = None
 
         for game in kw.get("items", []):
             self.add_game(game)
@@ -55,14 +58,46 @@ class Collection(DictObject):
         :raises: :py:class:`boardgamegeek.exceptions.BoardGameGeekError` in case of invalid data
         """
         try:
-            # Collections can have duplicate elements (different collection ids), so don't add the same thing
-            # multiple times
-            if game["id"] not in self.__game_ids:
-                self.__game_ids.add(game["id"])
-                self._items.append(CollectionBoardGame(game))
-        except KeyError:
+            game_id = int(game["id"])
+        except (KeyError, TypeError, ValueError):
             raise BGGError("invalid game data")
 
+        # Collections can have duplicate elements (different collection ids), so don't add the same thing
+        # multiple times
+        if game_id not in self._items_by_id:
+            item = CollectionBoardGame(game)
+            self._items_by_id[game_id] = item
+            self._items.append(item)
+            if self._columns is not None:
+                try:
+                    self._columns.append(item)
+                except BufferError:
+                    # NumPy views of the columns are alive: leave them to their owners, a new columnar view is
+                    # built when requested
+                    self._columns = None
+
+    def get(self, game_id, default=None):
+        """
+        Returns the item of the collection having the specified id
+
+        :param game_id: the game's id (or a :py:class:`boardgamegeek.things.Thing` having that id)
+        :param default: value returned if the game isn't in the collection
+        :return: the item
+        :rtype: :py:class:`boardgamegeek.games.CollectionBoardGame`
+        """
+        try:
+            return self._items_by_id.get(thing_id(game_id), default)
+        except (TypeError, ValueError):
+            return default
+
+    def __contains__(self, item):
+        return self.get(item) is not None
+
+    def _serialized_data(self):
+        data = dict(self._data)
+        data["items"] = [item.data() for item in self._items]
+        return data
+
     def __getitem__(self, item):
         return self._items.__getitem__(item)
 
@@ -95,6 +130,18 @@ class Collection(DictObject):
         """
         return self._items
 
+    def columns(self):
+        """
+        Returns a columnar view of the collection, which can be filtered and sorted in a vectorised way. The view
+        is built on the first call and is kept up to date as games get added.
+
+        :return: columnar view of the collection
+        :rtype: :py:class:`boardgamegeek.columnar.CollectionColumns`
+        """
+        if self._columns is None:
+            self._columns = CollectionColumns(self._items)
+        return self._columns
+
     def __iter__(self):
         for item in self._items:
             yield item
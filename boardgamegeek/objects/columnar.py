@@ -0,0 +1,477 @@
+# coding: utf-8
+"""
+:mod:`boardgamegeek.columnar` - Columnar views
+==============================================
+
+.. module:: boardgamegeek.objects.columnar
+   :platform: Unix, Windows
+   :synopsis: columnar (struct-of-arrays) representations of large lists of objects, for vectorised analytics
+
+.. moduleauthor:: Cosmin Luță <q4break@gmail.com>
+
+"""
+from __future__ import unicode_literals
+
+import array
+import datetime
+import operator
+
+from ..exceptions import BGGValueError
+from ..utils import import_optional
+
+
+try:
+    array.array("q")
+    INT64 = "q"
+except ValueError:
+    # Python 2 has no "long long" arrays
+    INT64 = "l"
+
+MISSING_ID = -1                 # value used for missing ids
+MISSING_DATE = -2 ** 63         # value used for missing dates (NumPy's NaT)
+MISSING_FLAG = -1               # value used for missing boolean flags
+
+_EPOCH = datetime.date(1970, 1, 1).toordinal()
+
+_NUMPY_DTYPES = {INT64: "int64", "b": "int8", "d": "float64"}
+
+_numpy = None
+
+
+def _numpy_or_none():
+    # NumPy is used for vectorising the operations if it's installed, with plain Python loops as a fallback
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy or None
+
+
+def _is_nan(value):
+    return value != value
+
+
+def _date_to_days(value):
+    # dates are stored as the number of days since 1970-01-01, like NumPy's datetime64[D]
+    if value is None:
+        return MISSING_DATE
+    return value.toordinal() - _EPOCH
+
+
+def _int_or(value, default):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _float_or_nan(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def _flag(value):
+    flag = _int_or(value, MISSING_FLAG)
+    return MISSING_FLAG if flag == MISSING_FLAG else int(bool(flag))
+
+
+class PlaysColumns(object):
+    """
+    Columnar representation of a list of play sessions: one ``array.array`` per field, plus a flattened table of the
+    players, which references the plays through the ``player_play_id`` column.
+
+    Missing values are stored as ``-1`` for ids and flags, ``NaN`` for scores and ``NaT`` for dates.
+
+    NumPy views returned by :py:meth:`to_numpy` share the memory of the arrays, therefore no play can be added while
+    they're alive (``array.array`` refuses to grow while exporting its buffer): :py:meth:`append` raises
+    `BufferError`, leaving the columns as they were.
+    """
+    # name, type code
+    PLAY_COLUMNS = [("id", INT64),
+                    ("date", INT64),
+                    ("quantity", INT64),
+                    ("duration", INT64),
+                    ("game_id", INT64),
+                    ("user_id", INT64)]
+
+    PLAYER_COLUMNS = [("player_play_id", INT64),
+                      ("player_user_id", INT64),
+                      ("player_win", "b"),
+                      ("player_new", "b"),
+                      ("player_score", "d")]
+
+    PLAYER_STRING_COLUMNS = ["player_username", "player_name", "player_color", "player_startposition"]
+
+    def __init__(self, plays=None):
+        for name, type_code in self.PLAY_COLUMNS + self.PLAYER_COLUMNS:
+            setattr(self, name, array.array(type_code))
+
+        for name in self.PLAYER_STRING_COLUMNS:
+            setattr(self, name, [])
+
+        for play in plays or []:
+            self.append(play)
+
+    def __len__(self):
+        return len(self.id)
+
+    def append(self, play):
+        """
+        Add a play session. Either all the columns get the play's values, or none does.
+
+        :param play: the :py:class:`boardgamegeek.plays.PlaySession` to add
+        :raises: `BufferError` if the memory of a column is shared with a NumPy view
+        """
+        lengths = [(name, len(getattr(self, name)))
+                   for name in [n for n, _ in self.PLAY_COLUMNS + self.PLAYER_COLUMNS] + self.PLAYER_STRING_COLUMNS]
+        try:
+            self._append(play)
+        except BufferError:
+            # the columns which grew don't export their buffers, so they can be shrunk back
+            for name, length in lengths:
+                column = getattr(self, name)
+                if len(column) > length:
+                    del column[length:]
+            raise
+
+    def _append(self, play):
+        play_id = _int_or(play.id, MISSING_ID)
+
+        self.id.append(play_id)
+        self.date.append(_date_to_days(play.date))
+        self.quantity.append(_int_or(play.quantity, 0))
+        self.duration.append(_int_or(play.duration, 0))
+        self.game_id.append(_int_or(play.game_id, MISSING_ID))
+        self.user_id.append(_int_or(play.user_id, MISSING_ID))
+
+        for player in play.players:
+            self.player_play_id.append(play_id)
+            self.player_user_id.append(_int_or(player.user_id, MISSING_ID))
+            self.player_win.append(_flag(player.win))
+            self.player_new.append(_flag(player.new))
+            self.player_score.append(_float_or_nan(player.score))
+            self.player_username.append(player.username)
+            self.player_name.append(player.name)
+            self.player_color.append(player.color)
+            self.player_startposition.append(player.startposition)
+
+    def to_numpy(self):
+        """
+        :return: NumPy arrays sharing the memory of the play columns (``date`` is a ``datetime64[D]`` array)
+        :rtype: dict of str to `numpy.ndarray`
+        :raises: `ImportError` if NumPy isn't installed
+        """
+        np = import_optional("numpy", "PlaysColumns.to_numpy()")
+
+        columns = {}
+        for name, _ in self.PLAY_COLUMNS:
+            columns[name] = np.frombuffer(getattr(self, name), dtype=np.int64)
+        columns["date"] = columns["date"].view("datetime64[D]")
+        return columns
+
+    def players_to_numpy(self):
+        """
+        :return: NumPy arrays for the players table; the numeric columns share the memory of the arrays, the string
+                 columns are ``object`` arrays
+        :rtype: dict of str to `numpy.ndarray`
+        :raises: `ImportError` if NumPy isn't installed
+        """
+        np = import_optional("numpy", "PlaysColumns.players_to_numpy()")
+
+        columns = {}
+        for name, type_code in self.PLAYER_COLUMNS:
+            columns[name] = np.frombuffer(getattr(self, name), dtype=_NUMPY_DTYPES[type_code])
+        for name in self.PLAYER_STRING_COLUMNS:
+            columns[name] = np.array(getattr(self, name), dtype=object)
+        return columns
+
+    def to_arrow(self):
+        """
+        :return: the plays, as an Arrow table (numeric columns don't get copied)
+        :rtype: `pyarrow.Table`
+        :raises: `ImportError` if PyArrow or NumPy aren't installed
+        """
+        pa = import_optional("pyarrow", "PlaysColumns.to_arrow()")
+
+        columns = self.to_numpy()
+        names = [name for name, _ in self.PLAY_COLUMNS]
+        arrays = []
+        for name in names:
+            if name == "date":
+                arrays.append(pa.array(columns[name], type=pa.date32(), from_pandas=True))
+            else:
+                arrays.append(pa.array(columns[name]))
+        return pa.Table.from_arrays(arrays, names=names)
+
+    def players_to_arrow(self):
+        """
+        :return: the players table, as an Arrow table
+        :rtype: `pyarrow.Table`
+        :raises: `ImportError` if PyArrow or NumPy aren't installed
+        """
+        pa = import_optional("pyarrow", "PlaysColumns.players_to_arrow()")
+
+        columns = self.players_to_numpy()
+        names = [name for name, _ in self.PLAYER_COLUMNS] + self.PLAYER_STRING_COLUMNS
+        arrays = [pa.array(columns[name], type=pa.string() if name in self.PLAYER_STRING_COLUMNS else None)
+                  for name in names]
+        return pa.Table.from_arrays(arrays, names=names)
+
+
+class CollectionColumns(object):
+    """
+    Columnar representation of a collection: one ``array.array`` per numeric field, a list of names, and the
+    :py:class:`boardgamegeek.games.CollectionBoardGame` objects each row was created from.
+
+    Filtering (:py:meth:`where`, :py:meth:`filter`) and sorting (:py:meth:`sort_by`) return new views and are
+    vectorised with NumPy when it's installed (plain Python loops are used otherwise).
+
+    Missing values are stored as ``-1`` for integers and ``NaN`` for ratings; rows missing a value never match a
+    condition on it.
+    """
+    # name, type code
+    COLUMNS = [("id", INT64),
+               ("year", INT64),
+               ("rating", "d"),
+               ("average", "d"),
+               ("bgg_rank", INT64),
+               ("numplays", INT64),
+               ("min_players", INT64),
+               ("max_players", INT64),
+               ("min_playing_time", INT64),
+               ("max_playing_time", INT64),
+               ("playing_time", INT64),
+               ("wishlist_priority", INT64),
+               ("owned", "b"),
+               ("prev_owned", "b"),
+               ("preordered", "b"),
+               ("for_trade", "b"),
+               ("want", "b"),
+               ("want_to_play", "b"),
+               ("want_to_buy", "b"),
+               ("wishlist", "b")]
+
+    FLAGS = ["owned", "prev_owned", "preordered", "for_trade", "want", "want_to_play", "want_to_buy", "wishlist"]
+
+    def __init__(self, items=None):
+        for name, type_code in self.COLUMNS:
+            setattr(self, name, array.array(type_code))
+        self.name = []
+        self._items = []
+
+        for item in items or []:
+            self.append(item)
+
+    def __len__(self):
+        return len(self.id)
+
+    @property
+    def items(self):
+        """
+        :return: the collection items, in the order of the rows of this view
+        :rtype: list of :py:class:`boardgamegeek.games.CollectionBoardGame`
+        """
+        return self._items
+
+    def append(self, item):
+        """
+        Add a collection item. Either all the columns get the item's values, or none does.
+
+        :param item: the :py:class:`boardgamegeek.games.CollectionBoardGame` to add
+        :raises: `BufferError` if the memory of a column is shared with a NumPy view
+        """
+        lengths = [(name, len(getattr(self, name))) for name in [n for n, _ in self.COLUMNS] + ["name", "_items"]]
+        try:
+            self._append(item)
+        except BufferError:
+            # the columns which grew don't export their buffers, so they can be shrunk back
+            for name, length in lengths:
+                column = getattr(self, name)
+                if len(column) > length:
+                    del column[length:]
+            raise
+
+    def _append(self, item):
+        self.id.append(item.id)
+        self.name.append(item.name)
+        self.year.append(_int_or(item.year, MISSING_ID))
+        self.rating.append(_float_or_nan(item.rating))
+        self.average.append(_float_or_nan(item.rating_average))
+        self.bgg_rank.append(_int_or(item.bgg_rank, MISSING_ID))
+        self.numplays.append(_int_or(item.numplays, 0))
+        self.min_players.append(_int_or(item.min_players, MISSING_ID))
+        self.max_players.append(_int_or(item.max_players, MISSING_ID))
+        self.min_playing_time.append(_int_or(item.min_playing_time, MISSING_ID))
+        self.max_playing_time.append(_int_or(item.max_playing_time, MISSING_ID))
+        self.playing_time.append(_int_or(item.playing_time, MISSING_ID))
+        self.wishlist_priority.append(_int_or(item.wishlist_priority, MISSING_ID))
+        for flag in self.FLAGS:
+            getattr(self, flag).append(int(getattr(item, flag)))
+        self._items.append(item)
+
+    def to_numpy(self):
+        """
+        :return: NumPy arrays sharing the memory of the numeric columns, plus an ``object`` array for ``name``
+        :rtype: dict of str to `numpy.ndarray`
+        :raises: `ImportError` if NumPy isn't installed
+        """
+        np = import_optional("numpy", "CollectionColumns.to_numpy()")
+
+        columns = {name: np.frombuffer(getattr(self, name), dtype=_NUMPY_DTYPES[type_code])
+                   for name, type_code in self.COLUMNS}
+        columns["name"] = np.array(self.name, dtype=object)
+        return columns
+
+    def _column_values(self, name):
+        np = _numpy_or_none()
+        if name == "name":
+            return np.array(self.name, dtype=object) if np else self.name
+
+        type_code = dict(self.COLUMNS)[name]
+        column = getattr(self, name)
+        return np.frombuffer(column, dtype=_NUMPY_DTYPES[type_code]) if np else column
+
+    def _compare(self, name, op, value):
+        values = self._column_values(name)
+        if _numpy_or_none():
+            return op(values, value)
+        return [op(v, value) for v in values]
+
+    def filter(self, mask):
+        """
+        Returns a view containing only the selected rows
+
+        :param mask: sequence of booleans (one per row), e.g. a NumPy boolean array
+        :return: a new view
+        :rtype: :py:class:`boardgamegeek.columnar.CollectionColumns`
+        """
+        np = _numpy_or_none()
+        if np:
+            return self._take(np.flatnonzero(np.asarray(mask, dtype=bool)))
+        return self._take([i for i, selected in enumerate(mask) if selected])
+
+    def where(self, min_rating=None, max_rating=None, min_average=None, max_bgg_rank=None, min_plays=None,
+              max_plays=None, players=None, max_playing_time=None, min_year=None, max_year=None, **flags):
+        """
+        Returns a view containing only the rows matching all the conditions
+
+        :param float min_rating: minimum rating given by the user
+        :param float max_rating: maximum rating given by the user
+        :param float min_average: minimum average rating on BGG
+        :param int max_bgg_rank: maximum (worst) BGG rank
+        :param int min_plays: minimum number of plays
+        :param int max_plays: maximum number of plays
+        :param int players: number of players the game must support
+        :param int max_playing_time: maximum playing time
+        :param int min_year: minimum publishing year
+        :param int max_year: maximum publishing year
+        :param flags: status flags the items must (``True``) or mustn't (``False``) have, e.g. ``owned=True``
+        :return: a new view
+        :rtype: :py:class:`boardgamegeek.columnar.CollectionColumns`
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` in case of an invalid flag
+        """
+        conditions = []
+        for value, name, op in [(min_rating, "rating", operator.ge),
+                                (max_rating, "rating", operator.le),
+                                (min_average, "average", operator.ge),
+                                (max_bgg_rank, "bgg_rank", operator.le),
+                                (min_plays, "numplays", operator.ge),
+                                (max_plays, "numplays", operator.le),
+                                (players, "min_players", operator.le),
+                                (players, "max_players", operator.ge),
+                                (max_playing_time, "playing_time", operator.le),
+                                (min_year, "year", operator.ge),
+                                (max_year, "year", operator.le)]:
+            if value is not None:
+                conditions.append((name, op, value))
+
+        # missing integers are stored as -1, which would match the upper bounds (NaN ratings never match)
+        types = dict(self.COLUMNS)
+        conditions += [(name, operator.ne, MISSING_ID)
+                       for name in sorted(set(name for name, _, _ in conditions if types[name] == INT64))]
+
+        for flag, value in flags.items():
+            if flag not in self.FLAGS:
+                raise BGGValueError("invalid flag: {}".format(flag))
+            conditions.append((flag, operator.eq, int(bool(value))))
+
+        np = _numpy_or_none()
+        mask = np.ones(len(self), dtype=bool) if np else [True] * len(self)
+        for name, op, value in conditions:
+            result = self._compare(name, op, value)
+            if np:
+                mask &= result
+            else:
+                mask = [m and r for m, r in zip(mask, result)]
+
+        return self.filter(mask)
+
+    def sort_by(self, name, descending=False):
+        """
+        Returns a view with the rows sorted by a column. The sort is stable (rows having equal values keep their
+        order, in descending sorts too) and missing values (``NaN`` ratings, ``-1`` integers) always come last.
+
+        :param str name: name of the column to sort by
+        :param bool descending: sort in descending order
+        :return: a new view
+        :rtype: :py:class:`boardgamegeek.columnar.CollectionColumns`
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` in case of an invalid column
+        """
+        if name != "name" and name not in dict(self.COLUMNS):
+            raise BGGValueError("invalid column: {}".format(name))
+
+        values = self._column_values(name)
+        type_code = dict(self.COLUMNS).get(name)
+        np = _numpy_or_none()
+
+        if np:
+            if name == "name":
+                if descending:
+                    # the names' ranks, negated (reversing the ascending order would reverse the equal names too)
+                    _, ranks = np.unique(values, return_inverse=True)
+                    order = np.argsort(-ranks, kind="stable")
+                else:
+                    order = np.argsort(values, kind="stable")
+            else:
+                if type_code == "d":
+                    missing = np.isnan(values)
+                elif type_code == INT64:
+                    missing = values == MISSING_ID
+                else:
+                    missing = np.zeros(len(values), dtype=bool)
+                # sorted by the values, then (primary key, last) by being missing
+                order = np.lexsort((-values if descending else values, missing))
+        else:
+            if name == "name":
+                key = lambda i: values[i]
+            else:
+                def key(i):
+                    value = values[i]
+                    missing = _is_nan(value) if type_code == "d" else type_code == INT64 and value == MISSING_ID
+                    return missing, -value if descending else value
+            order = sorted(range(len(values)), key=key, reverse=descending and name == "name")
+
+        return self._take(order)
+
+    def _take(self, indices):
+        view = CollectionColumns()
+        np = _numpy_or_none()
+
+        if np:
+            indices = np.asarray(indices, dtype=np.intp)
+            for name, type_code in self.COLUMNS:
+                selected = np.frombuffer(getattr(self, name), dtype=_NUMPY_DTYPES[type_code])[indices]
+                getattr(view, name).frombytes(selected.tobytes())
+        else:
+            for name, type_code in self.COLUMNS:
+                column = getattr(self, name)
+                getattr(view, name).extend(column[i] for i in indices)
+
+        view.name = [self.name[i] for i in indices]
+        view._items = [self._items[i] for i in indices]
+        return view
@@ -17,10 +17,35 @@ from copy import copy
 
 from .things import Thing
 from ..exceptions import BGGError
-from ..utils import fix_url, DictObject, fix_unsigned_negative
+from ..utils import fix_url, DictObject, SlottedObject, LazyXmlData, fix_unsigned_negative
+
+
+def _unique_things(items, cls, error_message):
+    """
+    Creates objects out of a list of dictionaries, skipping the ones having an id that was already seen
+
+    :param list items: data of the objects
+    :param cls: class of the objects to create
+    :param str error_message: message of the exception raised in case of invalid data
+    :return: the objects and the set of their ids
+    :rtype: tuple
+    :raises: :py:exc:`boardgamegeek.exceptions.BGGError` if data is invalid
+    """
+    objects = []
+    ids = set()
+    for item in items:
+        try:
+            if item["id"] not in ids:
+                objects.append(cls(item))
+                ids.add(item["id"])
+        except KeyError:
+            raise BGGError(error_message)
+    return objects, ids
 
 
 class BoardGameRank(Thing):
+    __slots__ = ()
+
     @property
     def type(self):
         return self._data.get("type")
@@ -42,6 +67,8 @@ class PlayerSuggestion(DictObject):
     """
     Player Suggestion
     """
+    __slots__ = ()
+
     def __init__(self, data):
         super(PlayerSuggestion, self).__init__(data)
 
@@ -62,8 +89,11 @@ class BoardGameStats(DictObject):
     """
     Statistics about a board game
     """
+    __slots__ = ("_ranks", "_bgg_rank")
+
     def __init__(self, data):
-        self._ranks = []
+        self._ranks = None          # created when first accessed
+        self._bgg_rank = None
 
         for rank in data.get("ranks", []):
             if rank.get("name") == "boardgame":
@@ -71,7 +101,6 @@ class BoardGameStats(DictObject):
                     self._bgg_rank = int(rank["value"])
                 except (KeyError, TypeError):
                     self._bgg_rank = None
-            self._ranks.append(BoardGameRank(rank))
 
         super(BoardGameStats, self).__init__(data)
 
@@ -81,6 +110,8 @@ class BoardGameStats(DictObject):
 
     @property
     def ranks(self):
+        if self._ranks is None:
+            self._ranks = [BoardGameRank(rank) for rank in self._data.get("ranks", [])]
         return self._ranks
 
     @property
@@ -192,19 +223,21 @@ class BoardGameStats(DictObject):
         return self._data.get("averageweight")
 
 
-class BoardGameComment(DictObject):
+class BoardGameComment(SlottedObject):
+    _fields = ("username", "comment", "rating")
+    __slots__ = tuple("_" + f for f in _fields)
 
     @property
     def commenter(self):
-        return self._data["username"]
+        return self._username
 
     @property
     def comment(self):
-        return self._data["comment"]
+        return self._comment
 
     @property
     def rating(self):
-        return self._data["rating"]
+        return self._rating
 
     def _format(self, log):
         log.info(u"comment by {} (rating: {}): {}".format(self.commenter, self.rating, self.comment))
@@ -214,6 +247,8 @@ class BoardGameVideo(Thing):
     """
     Object containing information about a board game video
     """
+    __slots__ = ()
+
     def __init__(self, data):
         kw = copy(data)
 
@@ -298,6 +333,8 @@ class BoardGameVersion(Thing):
     """
     Object containing information about a board game version
     """
+    __slots__ = ()
+
     def __init__(self, data):
         kw = copy(data)
 
@@ -416,33 +453,56 @@ class BoardGameVersion(Thing):
 
 
 class BaseGame(Thing):
+    __slots__ = ("_stats", "_versions", "_versions_set")
 
     def __init__(self, data):
-
-        self._thumbnail = fix_url(data["thumbnail"]) if "thumbnail" in data else None
-        self._image = fix_url(data["image"]) if "image" in data else None
-        if "stats" not in data:
+        # lazily decoded data is checked when the statistics are first accessed
+        if not isinstance(data, LazyXmlData) and "stats" not in data:
             raise BGGError("invalid data")
 
-        self._stats = BoardGameStats(data["stats"])
+        # the statistics and the versions are created when first accessed
+        self._stats = None
+        self._versions = None
+        self._versions_set = None
 
-        self._versions = []
-        self._versions_set = set()
+        super(BaseGame, self).__init__(data)
 
-        try:
-            self._year_published = fix_unsigned_negative(data["yearpublished"])
-        except:
-            self._year_published = None
+    @property
+    def lazy(self):
+        """
+        :return: ``True`` if this object still decodes its data from the XML response when accessed
+        :rtype: bool
+        """
+        return isinstance(self._data, LazyXmlData) and not self._data.detached
 
-        for version in data.get("versions", []):
-            try:
-                if version["id"] not in self._versions_set:
-                    self._versions.append(BoardGameVersion(version))
-                    self._versions_set.add(version["id"])
-            except KeyError:
-                raise BGGError("invalid version data")
+    def materialize(self):
+        """
+        Decodes all the data of an object created in lazy mode and releases the XML element it was decoded from.
+        Does nothing for other objects.
 
-        super(BaseGame, self).__init__(data)
+        :return: this object
+        """
+        if isinstance(self._data, LazyXmlData):
+            self._data = self._data.materialize()
+        return self
+
+    def data(self):
+        self.materialize()
+        return super(BaseGame, self).data()
+
+    def _get_stats(self):
+        if self._stats is None:
+            if "stats" not in self._data:
+                raise BGGError("invalid data")
+            self._stats = BoardGameStats(self._data["stats"])
+        return self._stats
+
+    def _get_versions(self):
+        if self._versions is None:
+            self._versions, self._versions_set = _unique_things(self._data.get("versions", []),
+                                                                BoardGameVersion,
+                                                                "invalid version data")
+        return self._versions
 
     @property
     def thumbnail(self):
@@ -451,7 +511,7 @@ class BaseGame(Thing):
         :rtype: str
         :return: ``None`` if n/a
         """
-        return self._thumbnail
+        return fix_url(self._data["thumbnail"]) if "thumbnail" in self._data else None
 
     @property
     def image(self):
@@ -460,7 +520,7 @@ class BaseGame(Thing):
         :rtype: str
         :return: ``None`` if n/a
         """
-        return self._image
+        return fix_url(self._data["image"]) if "image" in self._data else None
 
     @property
     def year(self):
@@ -469,7 +529,10 @@ class BaseGame(Thing):
         :rtype: integer
         :return: ``None`` if n/a
         """
-        return self._year_published
+        try:
+            return fix_unsigned_negative(self._data["yearpublished"])
+        except:
+            return None
 
     @property
     def min_players(self):
@@ -525,7 +588,7 @@ class BaseGame(Thing):
         :rtype: integer
         :return: ``None`` if n/a
         """
-        return self._stats.users_rated
+        return self._get_stats().users_rated
 
     @property
     def rating_average(self):
@@ -534,7 +597,7 @@ class BaseGame(Thing):
         :rtype: float
         :return: ``None`` if n/a
         """
-        return self._stats.rating_average
+        return self._get_stats().rating_average
 
     @property
     def rating_bayes_average(self):
@@ -543,7 +606,7 @@ class BaseGame(Thing):
         :rtype: float
         :return: ``None`` if n/a
         """
-        return self._stats.rating_bayes_average
+        return self._get_stats().rating_bayes_average
 
     @property
     def rating_stddev(self):
@@ -552,7 +615,7 @@ class BaseGame(Thing):
         :rtype: float
         :return: ``None`` if n/a
         """
-        return self._stats.rating_stddev
+        return self._get_stats().rating_stddev
 
     @property
     def rating_median(self):
@@ -561,7 +624,7 @@ class BaseGame(Thing):
         :rtype: float
         :return: ``None`` if n/a
         """
-        return self._stats.rating_median
+        return self._get_stats().rating_median
 
     @property
     def ranks(self):
@@ -572,7 +635,7 @@ class BaseGame(Thing):
                 (name of the rank, e.g "boardgame"), ``value`` (the rank)
         :return: ``None`` if n/a
         """
-        return self._stats.ranks
+        return self._get_stats().ranks
 
     @property
     def bgg_rank(self):
@@ -580,7 +643,7 @@ class BaseGame(Thing):
         :return: The board game geek rank of this game
         """
         # TODO: document this
-        return self._stats.bgg_rank
+        return self._get_stats().bgg_rank
 
     @property
     def boardgame_rank(self):
@@ -593,6 +656,7 @@ class CollectionBoardGame(BaseGame):
     A boardgame retrieved from the collection information, which has less information than the one retrieved
     via the /thing api and which also contains some user-specific information.
     """
+    __slots__ = ()
 
     def __init__(self, data):
         super(CollectionBoardGame, self).__init__(data)
@@ -616,7 +680,7 @@ class CollectionBoardGame(BaseGame):
         log.info("wishlist priority : {}".format(self.wishlist_priority))
         log.info("for trade         : {}".format(self.for_trade))
         log.info("comment           : {}".format(self.comment))
-        for v in self._versions:
+        for v in self._get_versions():
             v._format(log)
 
     @property
@@ -634,8 +698,9 @@ class CollectionBoardGame(BaseGame):
 
     @property
     def version(self):
-        if len(self._versions):
-            return self._versions[0]
+        versions = self._get_versions()
+        if len(versions):
+            return versions[0]
         else:
             return None
 
@@ -734,50 +799,20 @@ class BoardGame(BaseGame):
     """
     Object containing information about a board game
     """
-    def __init__(self, data):
+    __slots__ = ("_expansions", "_expansions_set", "_expands", "_expands_set", "_videos", "_videos_ids",
+                 "_comments", "_player_suggestion")
 
-        self._expansions = []                      # list of Thing for the expansions
-        self._expansions_set = set()               # set for making sure things are unique
-        for exp in data.get("expansions", []):
-            try:
-                if exp["id"] not in self._expansions_set:
-                    self._expansions_set.add(exp["id"])
-                    self._expansions.append(Thing(exp))
-            except KeyError:
-                raise BGGError("invalid expansion data")
-
-        self._expands = []                         # list of Thing which this item expands
-        self._expands_set = set()                  # set for keeping things unique
-        for exp in data.get("expands", []):        # for all the items this game expands, create a Thing
-            try:
-                if exp["id"] not in self._expands_set:
-                    self._expands_set.add(exp["id"])
-                    self._expands.append(Thing(exp))
-            except KeyError:
-                raise BGGError("invalid expanded game data")
-
-        self._videos = []
-        self._videos_ids = set()
-        for video in data.get("videos", []):
-            try:
-                if video["id"] not in self._videos_ids:
-                    self._videos.append(BoardGameVideo(video))
-                    self._videos_ids.add(video["id"])
-            except KeyError:
-                raise BGGError("invalid video data")
-
-        self._comments = []
-        for comment in data.get("comments", []):
-            self.add_comment(comment)
-
-        self._player_suggestion = []
-        if "suggested_players" in data and "results" in data["suggested_players"]:
-            for count, result in data["suggested_players"]["results"].items():
-                suggestion_data = {"player_count": count,
-                                   "best": result["best_rating"],
-                                   "recommended": result["recommended_rating"],
-                                   "not_recommended": result["not_recommended_rating"]}
-                self._player_suggestion.append(PlayerSuggestion(suggestion_data))
+    def __init__(self, data):
+        # The objects for expansions, expanded games, videos, comments and player suggestions are created from
+        # the data when first accessed
+        self._expansions = None                    # list of Thing for the expansions
+        self._expansions_set = None                # set for making sure things are unique
+        self._expands = None                       # list of Thing which this item expands
+        self._expands_set = None                   # set for keeping things unique
+        self._videos = None
+        self._videos_ids = None
+        self._comments = None
+        self._player_suggestion = None
 
         super(BoardGame, self).__init__(data)
 
@@ -785,7 +820,9 @@ class BoardGame(BaseGame):
         return "BoardGame (id: {})".format(self.id)
 
     def add_comment(self, data):
-        self._comments.append(BoardGameComment(data))
+        self._data.setdefault("comments", []).append(data)
+        if self._comments is not None:
+            self._comments.append(BoardGameComment(data))
 
     def add_expanded_game(self, data):
         """
@@ -794,9 +831,10 @@ class BoardGame(BaseGame):
         :param dict data: expanded game's data
         :raises: :py:exc:`boardgamegeek.exceptions.BoardGameGeekError` if data is invalid
         """
+        self.expands    # make sure the list exists
         try:
             if data["id"] not in self._expands_set:
-                self._data["expands"].append(data)
+                self._data.setdefault("expands", []).append(data)
                 self._expands_set.add(data["id"])
                 self._expands.append(Thing(data))
         except KeyError:
@@ -809,9 +847,10 @@ class BoardGame(BaseGame):
         :param dict data: expansion data
         :raises: :py:exc:`boardgamegeek.exceptions.BoardGameGeekError` if data is invalid
         """
+        self.expansions     # make sure the list exists
         try:
             if data["id"] not in self._expansions_set:
-                self._data["expansions"].append(data)
+                self._data.setdefault("expansions", []).append(data)
                 self._expansions_set.add(data["id"])
                 self._expansions.append(Thing(data))
         except KeyError:
@@ -948,6 +987,8 @@ class BoardGame(BaseGame):
 
     @property
     def comments(self):
+        if self._comments is None:
+            self._comments = [BoardGameComment(comment) for comment in self._data.get("comments", [])]
         return self._comments
 
     @property
@@ -964,6 +1005,10 @@ class BoardGame(BaseGame):
         :return: expansions
         :rtype: list of :py:class:`boardgamegeek.things.Thing`
         """
+        if self._expansions is None:
+            self._expansions, self._expansions_set = _unique_things(self._data.get("expansions", []),
+                                                                    Thing,
+                                                                    "invalid expansion data")
         return self._expansions
 
     @property
@@ -972,6 +1017,10 @@ class BoardGame(BaseGame):
         :return: games this item expands
         :rtype: list of :py:class:`boardgamegeek.things.Thing`
         """
+        if self._expands is None:
+            self._expands, self._expands_set = _unique_things(self._data.get("expands", []),
+                                                              Thing,
+                                                              "invalid expanded game data")
         return self._expands
 
     @property
@@ -1038,7 +1087,7 @@ class BoardGame(BaseGame):
         :rtype: integer
         :return: ``None`` if n/a
         """
-        return self._stats.users_owned
+        return self._get_stats().users_owned
 
     @property
     def users_trading(self):
@@ -1047,7 +1096,7 @@ class BoardGame(BaseGame):
         :rtype: integer
         :return: ``None`` if n/a
         """
-        return self._stats.users_trading
+        return self._get_stats().users_trading
 
     @property
     def users_wanting(self):
@@ -1083,7 +1132,7 @@ class BoardGame(BaseGame):
         :rtype: integer
         :return: ``None`` if n/a
         """
-        return self._stats.rating_num_weights
+        return self._get_stats().rating_num_weights
 
     @property
     def rating_average_weight(self):
@@ -1092,7 +1141,7 @@ class BoardGame(BaseGame):
         :rtype: float
         :return: ``None`` if n/a
         """
-        return self._stats.rating_average_weight
+        return self._get_stats().rating_average_weight
 
     @property
     def videos(self):
@@ -1100,6 +1149,10 @@ class BoardGame(BaseGame):
         :return: videos of this game
         :rtype: list of :py:class:`boardgamegeek.game.BoardGameVideo`
         """
+        if self._videos is None:
+            self._videos, self._videos_ids = _unique_things(self._data.get("videos", []),
+                                                            BoardGameVideo,
+                                                            "invalid video data")
         return self._videos
 
     @property
@@ -1108,7 +1161,7 @@ class BoardGame(BaseGame):
         :return: versions of this game
         :rtype: list of :py:class:`boardgamegeek.game.BoardGameVersion`
         """
-        return self._versions
+        return self._get_versions()
 
     @property
     def player_suggestions(self):
@@ -1116,4 +1169,12 @@ class BoardGame(BaseGame):
         :return player suggestion list with votes
         :rtype: list of dicts
         """
+        if self._player_suggestion is None:
+            self._player_suggestion = []
+            for count, result in self._data.get("suggested_players", {}).get("results", {}).items():
+                suggestion_data = {"player_count": count,
+                                   "best": result["best_rating"],
+                                   "recommended": result["recommended_rating"],
+                                   "not_recommended": result["not_recommended_rating"]}
+                self._player_suggestion.append(PlayerSuggestion(suggestion_data))
         return self._player_suggestion
@@ -49,6 +49,11 @@ class Guild(Thing):
 
         super(Guild, self).__init__(kw)
 
+    def _serialized_data(self):
+        data = dict(self._data)
+        data["members"] = sorted(self._members)
+        return data
+
     @property
     def country(self):
         """
@@ -14,7 +14,7 @@ from __future__ import unicode_literals
 
 from copy import copy
 
-from .things import Thing
+from .things import Thing, thing_id
 from ..exceptions import BGGError
 from ..utils import DictObject, fix_url
 
@@ -82,11 +82,17 @@ class HotItems(DictObject):
             kw["items"] = []
 
         self._items = []
+        self._items_by_id = {}
         for data in kw["items"]:
-            self._items.append(HotItem(data))
+            self._add_item(HotItem(data))
 
         super(HotItems, self).__init__(kw)
 
+    def _add_item(self, item):
+        self._items.append(item)
+        # keep the first one (the best ranked) if an item shows up multiple times
+        self._items_by_id.setdefault(item.id, item)
+
     def add_hot_item(self, data):
         """
         Add a new hot item to the container
@@ -94,7 +100,24 @@ class HotItems(DictObject):
         :param data: dictionary containing the data
         """
         self._data["items"].append(data)
-        self._items.append(HotItem(data))
+        self._add_item(HotItem(data))
+
+    def get(self, item_id, default=None):
+        """
+        Returns the hot item having the specified id
+
+        :param item_id: the item's id (or a :py:class:`boardgamegeek.things.Thing` having that id)
+        :param default: value returned if the item isn't a hot item
+        :return: the hot item
+        :rtype: :py:class:`boardgamegeek.hotitems.HotItem`
+        """
+        try:
+            return self._items_by_id.get(thing_id(item_id), default)
+        except (TypeError, ValueError):
+            return default
+
+    def __contains__(self, item):
+        return self.get(item) is not None
 
     @property
     def items(self):
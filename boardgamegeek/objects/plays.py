@@ -15,19 +15,20 @@ from copy import copy
 import datetime
 
 from boardgamegeek.exceptions import BGGError
-from boardgamegeek.utils import DictObject
+from boardgamegeek.utils import DictObject, SlottedObject
+from boardgamegeek.objects.columnar import PlaysColumns
+from boardgamegeek.objects.things import thing_id
 
 
-class PlaysessionPlayer(DictObject):
+class PlaysessionPlayer(SlottedObject):
     """
     Class representing a player in a play session
 
     :param dict data: a dictionary containing the collection data
     :raises: :py:class:`boardgamegeek.exceptions.BoardGameGeekError` in case of invalid data
     """
-
-    def __init__(self, data):
-        self._data = data
+    _fields = ("username", "user_id", "name", "startposition", "new", "win", "rating", "score", "color", "location")
+    __slots__ = tuple("_" + f for f in _fields)
 
     @property
     def username(self):
@@ -36,7 +37,7 @@ class PlaysessionPlayer(DictObject):
         :rtype: str
         :return: ``None`` if n/a
         """
-        return self._data.get("username")
+        return self._username
 
     @property
     def user_id(self):
@@ -45,7 +46,7 @@ class PlaysessionPlayer(DictObject):
         :rtype: integer
         :return: ``None`` if n/a
         """
-        return self._data.get("user_id")
+        return self._user_id
 
     @property
     def name(self):
@@ -54,7 +55,7 @@ class PlaysessionPlayer(DictObject):
         :rtype:
         :return: ``None`` if n/a
         """
-        return self._data.get("name")
+        return self._name
 
     @property
     def startposition(self):
@@ -63,7 +64,7 @@ class PlaysessionPlayer(DictObject):
         :rtype:
         :return: ``None`` if n/a
         """
-        return self._data.get("startposition")
+        return self._startposition
 
     @property
     def new(self):
@@ -72,7 +73,7 @@ class PlaysessionPlayer(DictObject):
         :rtype:
         :return: ``None`` if n/a
         """
-        return self._data.get("new")
+        return self._new
 
     @property
     def win(self):
@@ -81,7 +82,7 @@ class PlaysessionPlayer(DictObject):
         :rtype:
         :return: ``None`` if n/a
         """
-        return self._data.get("win")
+        return self._win
 
     @property
     def rating(self):
@@ -90,7 +91,7 @@ class PlaysessionPlayer(DictObject):
         :rtype:
         :return: ``None`` if n/a
         """
-        return self._data.get("rating")
+        return self._rating
 
     @property
     def score(self):
@@ -99,7 +100,7 @@ class PlaysessionPlayer(DictObject):
         :rtype:
         :return: ``None`` if n/a
         """
-        return self._data.get("score")
+        return self._score
 
     @property
     def color(self):
@@ -108,34 +109,49 @@ class PlaysessionPlayer(DictObject):
         :rtype:
         :return: ``None`` if n/a
         """
-        return self._data.get("color")
+        return self._color
+
+    @property
+    def location(self):
+        """
+        :return:
+        :rtype:
+        :return: ``None`` if n/a
+        """
+        return self._location
 
 
-class PlaySession(DictObject):
+class PlaySession(SlottedObject):
     """
     Container for a play session information.
 
     :param dict data: a dictionary containing the collection data
     :raises: :py:class:`boardgamegeek.exceptions.BoardGameGeekError` in case of invalid data
     """
+    _fields = ("id", "user_id", "date", "quantity", "duration", "incomplete", "nowinstats", "location", "game_id",
+               "game_name", "comment")
+    _nested_fields = ("players",)
+    __slots__ = tuple("_" + f for f in _fields) + ("_players",)
 
     def __init__(self, data):
         if "id" not in data:
             raise BGGError("missing id of PlaySession")
 
-        kw = copy(data)
+        super(PlaySession, self).__init__(data)
 
-        if "date" in kw:
-            if type(kw["date"]) != datetime.datetime:
-                try:
-                    kw["date"] = datetime.datetime.strptime(kw["date"], "%Y-%m-%d")
-                except:
-                    kw["date"] = None
+        if self._date is not None and type(self._date) != datetime.datetime:
+            try:
+                self._date = datetime.datetime.strptime(self._date, "%Y-%m-%d")
+            except:
+                self._date = None
 
-        # create "nice" dictionaries out of plain ones, so you can .dot access stuff.
-        self._players = [PlaysessionPlayer(player) for player in kw.get("players", [])]
+        # create "nice" objects out of plain dictionaries, so you can .dot access stuff.
+        self._players = [PlaysessionPlayer(player) for player in data.get("players", [])]
 
-        super(PlaySession, self).__init__(kw)
+    def data(self):
+        data = super(PlaySession, self).data()
+        data["players"] = [player.data() for player in self._players]
+        return data
 
     def _format(self, log):
         log.info("play id         : {}".format(self.id))
@@ -168,7 +184,7 @@ class PlaySession(DictObject):
         :rtype: integer
         :return: ``None`` if n/a
         """
-        return self._data.get("id")
+        return self._id
 
     @property
     def user_id(self):
@@ -177,7 +193,7 @@ class PlaySession(DictObject):
         :rtype: integer
         :return: ``None`` if n/a
         """
-        return self._data.get("user_id")
+        return self._user_id
 
     @property
     def date(self):
@@ -186,7 +202,7 @@ class PlaySession(DictObject):
         :rtype: datetime.datetime
         :return: ``None`` if n/a
         """
-        return self._data.get("date")
+        return self._date
 
     @property
     def quantity(self):
@@ -195,7 +211,7 @@ class PlaySession(DictObject):
         :rtype: integer
         :return: ``None`` if n/a
         """
-        return self._data.get("quantity")
+        return self._quantity
 
     @property
     def duration(self):
@@ -204,7 +220,7 @@ class PlaySession(DictObject):
         :rtype: integer
         :return: ``None`` if n/a
         """
-        return self._data.get("duration")
+        return self._duration
 
     @property
     def incomplete(self):
@@ -212,21 +228,21 @@ class PlaySession(DictObject):
         :return: incomplete session
         :rtype: bool
         """
-        return bool(self._data.get("incomplete"))
+        return bool(self._incomplete)
 
     @property
     def nowinstats(self):
         """
         :return:
         """
-        return self._data.get("nowinstats")
+        return self._nowinstats
 
     @property
     def location(self):
         """
         :return:
         """
-        return self._data.get("location")
+        return self._location
 
     @property
     def game_id(self):
@@ -235,7 +251,7 @@ class PlaySession(DictObject):
         :rtype: integer
         :return: ``None`` if n/a
         """
-        return self._data.get("game_id")
+        return self._game_id
 
     @property
     def game_name(self):
@@ -244,7 +260,7 @@ class PlaySession(DictObject):
         :rtype: str
         :return: ``None`` if n/a
         """
-        return self._data.get("game_name")
+        return self._game_name
 
     @property
     def comment(self):
@@ -253,7 +269,7 @@ class PlaySession(DictObject):
         :rtype: str
         :return: ``None`` if n/a
         """
-        return self._data.get("comment")
+        return self._comment
 
     @property
     def players(self):
@@ -270,12 +286,73 @@ class Plays(DictObject):
     def __init__(self, data):
         kw = copy(data)
         self._plays = []
+        self._plays_by_id = {}          # play id -> play session
+        self._plays_by_game = {}        # game id -> list of play sessions
+        self._columns = None
 
         for p in kw.get("plays", []):
-            self._plays.append(PlaySession(p))
+            self._add_play_session(PlaySession(p))
 
         super(Plays, self).__init__(kw)
 
+    def _add_play_session(self, play):
+        if self._columns is not None:
+            try:
+                self._columns.append(play)
+            except BufferError:
+                # NumPy views of the columns are alive: leave them to their owners, a new columnar view is built
+                # when requested
+                self._columns = None
+
+        self._plays.append(play)
+        self._plays_by_id.setdefault(play.id, play)
+        self._plays_by_game.setdefault(play.game_id, []).append(play)
+
+    def get(self, play_id, default=None):
+        """
+        Returns the play session having the specified id
+
+        :param integer play_id: the play's id
+        :param default: value returned if there's no such play
+        :return: the play session
+        :rtype: :py:class:`boardgamegeek.plays.PlaySession`
+        """
+        try:
+            return self._plays_by_id.get(int(play_id), default)
+        except (TypeError, ValueError):
+            return default
+
+    def by_game(self, game_id):
+        """
+        Returns the play sessions of a game
+
+        :param game_id: the game's id (or a :py:class:`boardgamegeek.things.Thing` having that id)
+        :return: the play sessions, in the order they were added
+        :rtype: list of :py:class:`boardgamegeek.plays.PlaySession`
+        """
+        try:
+            return list(self._plays_by_game.get(thing_id(game_id), ()))
+        except (TypeError, ValueError):
+            return []
+
+    @property
+    def game_ids(self):
+        """
+        :return: the ids of the games having play sessions
+        :rtype: set of integers
+        """
+        return set(self._plays_by_game)
+
+    def __contains__(self, play):
+        if isinstance(play, PlaySession):
+            play = play.id
+        return self.get(play) is not None
+
+    def _serialized_data(self):
+        data = dict(self._data)
+        data["plays"] = [play.data() for play in self._plays]
+        return data
+
     def __getitem__(self, item):
         return self._plays.__getitem__(item)
 
@@ -290,6 +367,19 @@ class Plays(DictObject):
         """
         return self._plays
 
+    def columns(self):
+        """
+        Returns a columnar view of the plays, for vectorised analytics. The view is built on the first call and is
+        kept up to date as plays get added, unless plays are added while NumPy views of it are alive (see
+        :py:meth:`boardgamegeek.columnar.PlaysColumns.to_numpy`): a new view is built by the next call then.
+
+        :return: columnar view of the plays
+        :rtype: :py:class:`boardgamegeek.columnar.PlaysColumns`
+        """
+        if self._columns is None:
+            self._columns = PlaysColumns(self._plays)
+        return self._columns
+
     @property
     def plays_count(self):
         """
@@ -309,10 +399,10 @@ class UserPlays(Plays):
             log.info("")
 
     def add_play(self, data):
-        kw = copy(data)
+        play = PlaySession(data)
         # User plays don't have the ID set in the XML
-        kw["user_id"] = self.user_id
-        self._plays.append(PlaySession(kw))
+        play._user_id = self.user_id
+        self._add_play_session(play)
 
     @property
     def user(self):
@@ -343,7 +433,7 @@ class GamePlays(Plays):
             log.info("")
 
     def add_play(self, data):
-        self._plays.append(PlaySession(data))
+        self._add_play_session(PlaySession(data))
 
     @property
     def game_id(self):
@@ -16,10 +16,28 @@ from ..exceptions import BGGError
 from ..utils import DictObject
 
 
+def thing_id(item):
+    """
+    :param item: a :py:class:`Thing` or an id
+    :return: the id of ``item``
+    :rtype: integer
+    :raises: ``ValueError`` or ``TypeError`` if ``item`` isn't a valid id
+    """
+    return item.id if isinstance(item, Thing) else int(item)
+
+
 class Thing(DictObject):
     """
     A thing, an object with a name and an id. Base class for various objects in the library.
+
+    Things are identified by their id and kind: two things are equal if they have the same id and are the same kind
+    of object (e.g. a :py:class:`boardgamegeek.objects.games.BoardGame` and a
+    :py:class:`boardgamegeek.objects.games.CollectionBoardGame` are both games, but a game is never equal to an user).
+    A plain :py:class:`Thing`, as used for the references to other objects (expansions, buddies, ...), is a kind of
+    its own, only equal to plain things. Things can be used in sets and as dictionary keys.
     """
+    __slots__ = ("_id", "_name")
+
     def __init__(self, data):
         for i in ["id", "name"]:
             if i not in data:
@@ -52,3 +70,22 @@ class Thing(DictObject):
 
     def __repr__(self):
         return "Thing (id: {})".format(self.id)
+
+    def _kind(self):
+        # the class right under Thing in the hierarchy (e.g. BaseGame for both BoardGame and CollectionBoardGame)
+        mro = type(self).__mro__
+        return mro[mro.index(Thing) - 1] if mro[0] is not Thing else Thing
+
+    def __eq__(self, other):
+        if not isinstance(other, Thing):
+            return NotImplemented
+        return self._id == other._id and self._kind() is other._kind()
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    def __hash__(self):
+        return hash((self._kind(), self._id))
@@ -14,7 +14,7 @@ from __future__ import unicode_literals
 
 from copy import copy
 
-from .things import Thing
+from .things import Thing, thing_id
 
 
 class User(Thing):
@@ -27,8 +27,9 @@ class User(Thing):
             kw["buddies"] = []
 
         self._buddies = []
+        self._buddies_by_id = {}
         for i in kw["buddies"]:
-            self._buddies.append(Thing(i))
+            self.add_buddy(i)
 
         if "guilds" not in kw:
             kw["guilds"] = []
@@ -50,6 +51,12 @@ class User(Thing):
 
         super(User, self).__init__(kw)
 
+    def _serialized_data(self):
+        data = dict(self._data)
+        data["buddies"] = [buddy.data() for buddy in self._buddies]
+        data["guilds"] = [guild.data() for guild in self._guilds]
+        return data
+
     def __str__(self):
         return "User: {} {}".format(self.firstname, self.lastname)
 
@@ -62,9 +69,33 @@ class User(Thing):
 
         :param dict data: buddy's data
         """
-        self._buddies.append(Thing(data))
+        buddy = Thing(data)
+        self._buddies.append(buddy)
+        self._buddies_by_id[buddy.id] = buddy
         #self._data["buddies"].append(data)
 
+    def buddy(self, user_id, default=None):
+        """
+        Returns the buddy having the specified id
+
+        :param user_id: the buddy's user id (or a :py:class:`boardgamegeek.things.Thing` having that id)
+        :param default: value returned if there's no such buddy
+        :return: the buddy
+        :rtype: :py:class:`boardgamegeek.things.Thing`
+        """
+        try:
+            return self._buddies_by_id.get(thing_id(user_id), default)
+        except (TypeError, ValueError):
+            return default
+
+    def is_buddy(self, user_id):
+        """
+        :param user_id: the user's id (or a :py:class:`boardgamegeek.things.Thing` having that id)
+        :return: ``True`` if the user is one of this user's buddies
+        :rtype: bool
+        """
+        return self.buddy(user_id) is not None
+
     def add_guild(self, data):
         self._guilds.append(Thing(data))
         #self._data["guilds"].append(data)
@@ -0,0 +1,215 @@
+# coding: utf-8
+"""
+:mod:`boardgamegeek.profiling` - Profiling
+==========================================
+
+.. module:: boardgamegeek.profiling
+   :platform: Unix, Windows
+   :synopsis: profiling API calls and reporting where the time goes
+
+.. moduleauthor:: Cosmin Luță <q4break@gmail.com>
+
+:py:class:`Profiler` runs a function (e.g. the operation requested from the command line) under ``cProfile`` and
+breaks down the time spent in it by subsystem: network, rate limiter and retry sleeps, XML parsing, loaders and object
+construction. The requests made by the profiled clients are reported too (see
+:py:mod:`boardgamegeek.instrumentation`)::
+
+    >>> profiler = Profiler().attach(bgg)
+    >>> plays = profiler.run(bgg.plays, name="fagentu007")
+    >>> profiler.report(sys.stderr)
+
+``cProfile`` only profiles the thread it's enabled in, so the work done by other threads (e.g. by the bulk retrieval
+workers) is only accounted for in the requests' timings.
+
+"""
+from __future__ import unicode_literals
+
+import cProfile
+import os
+import pstats
+import time
+
+
+NETWORK = "network"
+RATE_LIMIT_SLEEP = "rate limit sleep"
+RETRY_SLEEP = "retry sleep"
+XML_PARSE = "XML parse"
+LOADERS = "loaders"
+OBJECTS = "object construction"
+CACHE = "cache"
+LIBRARY = "boardgamegeek (other)"
+OTHER = "other"
+
+SUBSYSTEMS = [NETWORK, RATE_LIMIT_SLEEP, RETRY_SLEEP, XML_PARSE, LOADERS, OBJECTS, CACHE, LIBRARY, OTHER]
+
+_PACKAGE_PATH = os.path.dirname(os.path.abspath(__file__))
+
+# (subsystem, fragments of the paths of its modules or of the names of its built-in functions)
+_RULES = [(CACHE, ["requests_cache", "sqlite3"]),
+          (NETWORK, ["requests{}".format(os.sep), "urllib3", "http{}client".format(os.sep), "socket", "ssl", "select",
+                     "_socket", "_ssl"]),
+          (XML_PARSE, ["xml{}etree".format(os.sep), "pyexpat", "XMLParser"]),
+          (LOADERS, [os.path.join(_PACKAGE_PATH, "loaders")]),
+          (OBJECTS, [os.path.join(_PACKAGE_PATH, "objects")]),
+          (LIBRARY, [_PACKAGE_PATH])]
+
+
+def _is_sleep(function):
+    return function[0] == "~" and "sleep" in function[2]
+
+
+def classify(function, caller=None):
+    """
+    :param tuple function: a function, as identified by :py:mod:`pstats`: (file name, line number, function name)
+    :param tuple caller: the function calling it, used for telling apart the sleeps
+    :return: the subsystem the function belongs to (one of :py:data:`SUBSYSTEMS`)
+    :rtype: str
+    """
+    if _is_sleep(function) and caller is not None and caller[0].startswith(_PACKAGE_PATH):
+        return RETRY_SLEEP if caller[2] == "_sleep" else RATE_LIMIT_SLEEP
+
+    location = function[2] if function[0] == "~" else function[0]
+    for subsystem, fragments in _RULES:
+        if any(fragment in location for fragment in fragments):
+            return subsystem
+    return OTHER
+
+
+def _describe(function):
+    filename, line, name = function
+    if filename == "~":
+        return name
+    return "{}:{}({})".format(filename.replace(_PACKAGE_PATH, "boardgamegeek"), line, name)
+
+
+class Profiler(object):
+    """
+    Profiles the calls of clients
+    """
+    def __init__(self):
+        self.profile = cProfile.Profile()
+        self.events = []
+        self.elapsed = 0.0
+
+    def attach(self, client):
+        """
+        Records the requests of a client
+
+        :param client: the client (:py:class:`boardgamegeek.api.BGGCommon`)
+        :return: this object
+        """
+        client.add_request_hook(self.events.append)
+        return self
+
+    def run(self, function, *args, **kwargs):
+        """
+        Calls a function under the profiler
+
+        :return: the function's result
+        """
+        start = time.time()
+        self.profile.enable()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            self.profile.disable()
+            self.elapsed += time.time() - start
+
+    def stats(self):
+        """
+        :return: the profiling statistics
+        :rtype: :py:class:`pstats.Stats`
+        """
+        return pstats.Stats(self.profile)
+
+    def subsystems(self):
+        """
+        :return: the time (in seconds) spent in each subsystem, by the profiled thread. Each function's own time (not
+                 including the functions it called) is added to its subsystem's.
+        :rtype: dict
+        """
+        times = dict((subsystem, 0.0) for subsystem in SUBSYSTEMS)
+        for function, (_, _, own_time, _, callers) in self.stats().stats.items():
+            if _is_sleep(function) and callers:
+                # the sleeps are attributed to their callers' subsystems
+                for caller, caller_stats in callers.items():
+                    times[classify(function, caller)] += caller_stats[2]
+            else:
+                times[classify(function)] += own_time
+        return times
+
+    def hot_functions(self, top=10):
+        """
+        :param int top: how many functions to return
+        :return: the functions in which the most time was spent (not including the functions they called): tuples of
+                 (time, number of calls, description of the function, subsystem)
+        :rtype: list
+        """
+        def subsystem(function, callers):
+            if _is_sleep(function) and callers:
+                # the subsystem of the caller which slept the most
+                caller = max(callers, key=lambda c: callers[c][2])
+                return classify(function, caller)
+            return classify(function)
+
+        functions = sorted(self.stats().stats.items(), key=lambda item: item[1][2], reverse=True)[:top]
+        return [(own_time, calls, _describe(function), subsystem(function, callers))
+                for function, (_, calls, own_time, _, callers) in functions]
+
+    def requests_summary(self):
+        """
+        :return: totals of the recorded requests: count, cached, retried, failed and the time spent in each step
+        :rtype: dict
+        """
+        return {"requests": len(self.events),
+                "cached": sum(1 for e in self.events if e.from_cache),
+                "retried": sum(1 for e in self.events if e.retries),
+                "failed": sum(1 for e in self.events if e.error is not None),
+                "bytes": sum(e.bytes for e in self.events),
+                "rate_limit_wait": sum(e.rate_limit_wait for e in self.events),
+                "network": sum(e.network_time for e in self.events),
+                "retry_wait": sum(e.retry_wait for e in self.events),
+                "parse": sum(e.parse_time for e in self.events),
+                "load": sum(e.load_time for e in self.events)}
+
+    def report(self, stream, top=10):
+        """
+        Writes a condensed report: the time spent in each subsystem, the requests made and the hottest functions
+
+        :param stream: text stream to write to
+        :param int top: how many of the hottest functions to list
+        """
+        subsystems = self.subsystems()
+        profiled = sum(subsystems.values()) or 1.0
+        requests = self.requests_summary()
+
+        lines = ["profile: {:.3f}s elapsed".format(self.elapsed),
+                 "",
+                 "time by subsystem (profiled thread, includes the profiler's overhead):"]
+        for subsystem in SUBSYSTEMS:
+            if subsystems[subsystem]:
+                lines.append("  {:<24} {:>9.3f}s {:>6.1f}%".format(subsystem, subsystems[subsystem],
+                                                                100.0 * subsystems[subsystem] / profiled))
+
+        lines += ["",
+                  "requests (all threads): {requests} ({cached} from the cache, {retried} retried, {failed} failed), "
+                  "{bytes} bytes".format(**requests),
+                  "  {:<24} {:>9.3f}s".format("rate limiter wait", requests["rate_limit_wait"]),
+                  "  {:<24} {:>9.3f}s".format("network", requests["network"]),
+                  "  {:<24} {:>9.3f}s".format("retry wait", requests["retry_wait"]),
+                  "  {:<24} {:>9.3f}s".format("XML parse", requests["parse"]),
+                  "  {:<24} {:>9.3f}s".format("loaders and objects", requests["load"]),
+                  "",
+                  "hot functions (own time):"]
+        for own_time, calls, description, subsystem in self.hot_functions(top):
+            lines.append("  {:>9.3f}s {:>9} calls  {} [{}]".format(own_time, calls, description, subsystem))
+
+        stream.write("\n".join(lines) + "\n")
+
+    def dump(self, path):
+        """
+        Saves the profiling statistics, to be analyzed with :py:mod:`pstats` or other tools
+
+        :param str path: the file to save them to
+        """
+        self.profile.dump_stats(path)
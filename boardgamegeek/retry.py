@@ -0,0 +1,236 @@
+# coding: utf-8
+"""
+:mod:`boardgamegeek.retry` - Retry policies
+===========================================
+
+.. module:: boardgamegeek.retry
+   :platform: Unix, Windows
+   :synopsis: deciding if and when the failed requests are retried
+
+.. moduleauthor:: Cosmin Luță <q4break@gmail.com>
+
+Requests to the BGG API are retried when the API answers with 202 (the request was queued and the data will be
+available later), 503 (too many requests) or when they time out. A :py:class:`RetryPolicy` decides how many times
+each of these is retried, how long to wait before retrying (exponential backoff with jitter, so that concurrent
+clients don't retry in lockstep) and how long a call may spend retrying. A :py:class:`RetryBudget` shared by the calls
+of a client limits the retries to a fraction of the requests, so a struggling API isn't hit by a storm of retries::
+
+    >>> policy = RetryPolicy(retries={ACCEPTED: 5, THROTTLED: 3, TIMEOUT: 1}, time_budget=120,
+    ...                      budget=RetryBudget(ratio=0.2))
+    >>> bgg = BGGClient(retry_policy=policy)
+
+"""
+from __future__ import unicode_literals
+
+import collections
+import random
+import threading
+import time
+
+from .exceptions import BGGValueError
+
+
+ACCEPTED = 202          # the request was queued, the data will be available later
+THROTTLED = 503         # too many requests
+TIMEOUT = "timeout"     # no response in time
+
+ERRORS = (ACCEPTED, THROTTLED, TIMEOUT)
+
+DEFAULT_RETRIES = {ACCEPTED: 5, THROTTLED: 3, TIMEOUT: 2}
+DEFAULT_DELAYS = {ACCEPTED: 2.0, THROTTLED: 5.0, TIMEOUT: 1.0}
+
+_random = random.Random()
+
+
+def _per_error(value, name):
+    # a setting given for all the errors or for each of them
+    if isinstance(value, dict):
+        unknown = set(value) - set(ERRORS)
+        if unknown:
+            raise BGGValueError("invalid errors in '{}': {}".format(name, ", ".join(str(e) for e in unknown)))
+        return value
+    return dict.fromkeys(ERRORS, value)
+
+
+class RetryBudget(object):
+    """
+    Limits the retries to a fraction of the requests made in a sliding time window. Shared by the calls of a client
+    (or of several ones), it stops them from retrying when many requests fail, instead of multiplying the load of the
+    API.
+
+    :param float ratio: retries allowed for each request
+    :param int min_retries: retries allowed within the window regardless of the number of requests
+    :param float window: length of the window, in seconds
+    """
+    def __init__(self, ratio=0.2, min_retries=10, window=60.0):
+        if ratio < 0 or min_retries < 0 or window <= 0:
+            raise BGGValueError("invalid retry budget")
+
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+
+        self._requests = collections.deque()
+        self._retries = collections.deque()
+        self._lock = threading.Lock()
+
+    def _expire(self, now):
+        for times in (self._requests, self._retries):
+            while times and times[0] <= now - self.window:
+                times.popleft()
+
+    def record_request(self):
+        """ Records a request (not a retry) """
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            self._requests.append(now)
+
+    def try_retry(self):
+        """
+        Records a retry, if the budget allows it
+
+        :return: ``True`` if the retry is allowed
+        :rtype: bool
+        """
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            if len(self._retries) >= self.min_retries + self.ratio * len(self._requests):
+                return False
+            self._retries.append(now)
+            return True
+
+
+class RetryPolicy(object):
+    """
+    Decides if and when failed requests are retried
+
+    :param retries: how many times a request is retried, for all the errors or for each of them (a dict having
+                    ``ACCEPTED``, ``THROTTLED`` and/or ``TIMEOUT`` as keys)
+    :param int total_retries: if not ``None``, how many times a request is retried, regardless of the errors
+    :param delay: delay before the first retry, in seconds, for all the errors or for each of them
+    :param multiplier: by how much the delay grows with each retry, for all the errors or for each of them
+    :param float max_delay: if not ``None``, the longest delay before a retry
+    :param float jitter: fraction of the delay which is random: 0 for none, 1 for "full jitter" (a delay between 0 and
+                         the computed one)
+    :param float time_budget: if not ``None``, the longest time a request may take, retries included, in seconds. A
+                              retry isn't done if it couldn't start within it.
+    :param float timeout_multiplier: by how much the timeout grows after each timeout
+    :param RetryBudget budget: if not ``None``, the budget limiting the retries of all the requests using this policy
+    :param random: :py:class:`random.Random` instance generating the jitter (e.g. seeded, for reproducibility)
+    """
+    def __init__(self, retries=None, total_retries=None, delay=None, multiplier=2.0, max_delay=60.0, jitter=0.5,
+                 time_budget=None, timeout_multiplier=2.0, budget=None, random=None):
+        self.retries = dict(DEFAULT_RETRIES)
+        self.retries.update(_per_error(retries if retries is not None else {}, "retries"))
+        self.delays = dict(DEFAULT_DELAYS)
+        self.delays.update(_per_error(delay if delay is not None else {}, "delay"))
+        self.multipliers = dict.fromkeys(ERRORS, 2.0)
+        self.multipliers.update(_per_error(multiplier, "multiplier"))
+
+        if not 0 <= jitter <= 1:
+            raise BGGValueError("invalid jitter: {}".format(jitter))
+        if any(r < 0 for r in self.retries.values()) or (total_retries is not None and total_retries < 0):
+            raise BGGValueError("invalid number of retries")
+
+        self.total_retries = total_retries
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.time_budget = time_budget
+        self.timeout_multiplier = timeout_multiplier
+        self.budget = budget
+        self._random = random or _random
+
+    @classmethod
+    def legacy(cls, retries, retry_delay):
+        """
+        The policy matching the ``retries`` and ``retry_delay`` arguments of the clients: at most ``retries`` retries
+        whatever the errors, after ``retry_delay`` seconds, growing 1.5 times after each 202 and 3 times after each 503;
+        timeouts are retried right away, with a 2.5 times longer timeout. There's no jitter.
+
+        :param int retries: how many times a request is retried
+        :param float retry_delay: the delay before the first retry
+        :return: the policy
+        :rtype: :py:class:`RetryPolicy`
+        """
+        return cls(retries=retries,
+                   total_retries=retries,
+                   delay={ACCEPTED: retry_delay, THROTTLED: retry_delay, TIMEOUT: 0},
+                   multiplier={ACCEPTED: 1.5, THROTTLED: 3.0, TIMEOUT: 1.0},
+                   max_delay=None,
+                   jitter=0,
+                   timeout_multiplier=2.5)
+
+    def delay(self, error, retry):
+        """
+        :param error: the error to retry after (``ACCEPTED``, ``THROTTLED`` or ``TIMEOUT``)
+        :param int retry: the number of the retry after this error (starting with 1)
+        :return: the delay before the retry, in seconds
+        :rtype: float
+        """
+        delay = self.delays[error] * self.multipliers[error] ** (retry - 1)
+        if self.max_delay is not None:
+            delay = min(delay, self.max_delay)
+        return delay * (1 - self.jitter * self._random.random())
+
+    def start(self, timeout):
+        """
+        Starts tracking the retries of a request
+
+        :param float timeout: the timeout of the first attempt
+        :return: the object deciding the retries of the request
+        :rtype: :py:class:`RetryState`
+        """
+        if self.budget is not None:
+            self.budget.record_request()
+        return RetryState(self, timeout)
+
+
+class RetryState(object):
+    """
+    The retries of a request
+
+    :ivar float timeout: the timeout of the next attempt
+    :ivar str reason: why the last retry was refused
+    """
+    def __init__(self, policy, timeout):
+        self.policy = policy
+        self.timeout = timeout
+        self.reason = None
+        self.retries = dict.fromkeys(ERRORS, 0)
+        self.total = 0
+        self.start = time.time()
+
+    def retry(self, error):
+        """
+        Decides if a request which failed is retried
+
+        :param error: the error (``ACCEPTED``, ``THROTTLED`` or ``TIMEOUT``)
+        :return: the delay before retrying, in seconds, or ``None`` if the request shouldn't be retried (see
+                 ``reason``)
+        :rtype: float
+        """
+        policy = self.policy
+        retry = self.retries[error] + 1
+
+        if retry > policy.retries[error] or (policy.total_retries is not None and self.total >= policy.total_retries):
+            self.reason = "failed to retrieve data after {} retries".format(self.total)
+            return None
+
+        delay = policy.delay(error, retry)
+
+        if policy.time_budget is not None and time.time() - self.start + delay > policy.time_budget:
+            self.reason = "failed to retrieve data within {}s".format(policy.time_budget)
+            return None
+
+        if policy.budget is not None and not policy.budget.try_retry():
+            self.reason = "retry budget exhausted, not retrying"
+            return None
+
+        self.retries[error] = retry
+        self.total += 1
+        if error == TIMEOUT:
+            self.timeout *= policy.timeout_multiplier
+        return delay
+
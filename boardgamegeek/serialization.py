@@ -0,0 +1,328 @@
+# coding: utf-8
+"""
+:mod:`boardgamegeek.serialization` - Binary serialization of entities
+=====================================================================
+
+.. module:: boardgamegeek.serialization
+   :platform: Unix, Windows
+   :synopsis: compact, versioned binary encoding of the entities' data
+
+.. moduleauthor:: Cosmin Luță <q4break@gmail.com>
+
+An encoded entity is made of a header (magic bytes, format version, codec and the name of the entity's class)
+followed by the entity's data dictionary, encoded using msgpack (if installed) or a ``struct`` based encoding
+which only needs the standard library.
+
+"""
+from __future__ import unicode_literals
+
+import datetime
+import struct
+
+from .exceptions import BGGValueError
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+MAGIC = b"BGG"
+FORMAT_VERSION = 1
+
+CODEC_MSGPACK = "msgpack"
+CODEC_STRUCT = "struct"
+
+_CODEC_IDS = {CODEC_MSGPACK: b"m", CODEC_STRUCT: b"s"}
+_CODEC_NAMES = {v: k for k, v in _CODEC_IDS.items()}
+
+_HEADER = struct.Struct(">3sBcB")          # magic, version, codec, length of the type name
+
+# msgpack extension types
+_EXT_DATETIME = 1
+_EXT_DATE = 2
+_EXT_BIG_INT = 3
+
+try:
+    _text_type = unicode
+    _int_types = (int, long)
+except NameError:
+    # Python 3
+    _text_type = str
+    _int_types = (int,)
+
+
+def default_codec():
+    """
+    :return: the codec used when none is specified: msgpack if it's installed, the struct based one otherwise
+    :rtype: str
+    """
+    return CODEC_MSGPACK if msgpack is not None else CODEC_STRUCT
+
+
+def _format_datetime(value):
+    return value.strftime("%Y-%m-%dT%H:%M:%S.%f")
+
+
+def _parse_datetime(value):
+    return datetime.datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f")
+
+
+def _parse_date(value):
+    return datetime.datetime.strptime(value, "%Y-%m-%d").date()
+
+
+#
+# msgpack codec
+#
+def _msgpack_default(value):
+    if isinstance(value, datetime.datetime):
+        return msgpack.ExtType(_EXT_DATETIME, _format_datetime(value).encode("ascii"))
+    if isinstance(value, datetime.date):
+        return msgpack.ExtType(_EXT_DATE, value.isoformat().encode("ascii"))
+    if isinstance(value, _int_types):
+        # doesn't fit in 64 bits
+        return msgpack.ExtType(_EXT_BIG_INT, str(value).encode("ascii"))
+    raise TypeError("can't serialize {!r}".format(value))
+
+
+def _msgpack_ext_hook(code, data):
+    if code == _EXT_DATETIME:
+        return _parse_datetime(data.decode("ascii"))
+    if code == _EXT_DATE:
+        return _parse_date(data.decode("ascii"))
+    if code == _EXT_BIG_INT:
+        return int(data.decode("ascii"))
+    return msgpack.ExtType(code, data)
+
+
+def _msgpack_encode(value):
+    return msgpack.packb(value, use_bin_type=True, default=_msgpack_default)
+
+
+def _msgpack_decode(payload):
+    try:
+        return msgpack.unpackb(payload, raw=False, ext_hook=_msgpack_ext_hook, strict_map_key=False)
+    except TypeError:
+        # older msgpack versions don't have strict_map_key (and accept any key)
+        return msgpack.unpackb(payload, raw=False, ext_hook=_msgpack_ext_hook)
+
+
+#
+# struct based codec: each value is a one byte tag, followed by its encoding
+#
+_INT64 = struct.Struct(">q")
+_DOUBLE = struct.Struct(">d")
+_LENGTH = struct.Struct(">I")
+
+_INT64_MIN = -2 ** 63
+_INT64_MAX = 2 ** 63 - 1
+
+
+def _struct_encode_value(value, out):
+    if value is None:
+        out.append(b"N")
+    elif value is True:
+        out.append(b"T")
+    elif value is False:
+        out.append(b"F")
+    elif isinstance(value, _int_types):
+        if _INT64_MIN <= value <= _INT64_MAX:
+            out.append(b"i")
+            out.append(_INT64.pack(value))
+        else:
+            _struct_encode_bytes(b"I", str(value).encode("ascii"), out)
+    elif isinstance(value, float):
+        out.append(b"d")
+        out.append(_DOUBLE.pack(value))
+    elif isinstance(value, _text_type):
+        _struct_encode_bytes(b"s", value.encode("utf-8"), out)
+    elif isinstance(value, bytes):
+        _struct_encode_bytes(b"b", value, out)
+    elif isinstance(value, datetime.datetime):
+        _struct_encode_bytes(b"D", _format_datetime(value).encode("ascii"), out)
+    elif isinstance(value, datetime.date):
+        _struct_encode_bytes(b"a", value.isoformat().encode("ascii"), out)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        out.append(b"l")
+        out.append(_LENGTH.pack(len(value)))
+        for item in value:
+            _struct_encode_value(item, out)
+    elif isinstance(value, dict):
+        out.append(b"m")
+        out.append(_LENGTH.pack(len(value)))
+        for key, item in value.items():
+            _struct_encode_value(key, out)
+            _struct_encode_value(item, out)
+    else:
+        raise TypeError("can't serialize {!r}".format(value))
+
+
+def _struct_encode_bytes(tag, data, out):
+    out.append(tag)
+    out.append(_LENGTH.pack(len(data)))
+    out.append(data)
+
+
+def _struct_decode_value(payload, offset):
+    tag = payload[offset:offset + 1]
+    offset += 1
+
+    if tag == b"N":
+        return None, offset
+    if tag == b"T":
+        return True, offset
+    if tag == b"F":
+        return False, offset
+    if tag == b"i":
+        return _INT64.unpack_from(payload, offset)[0], offset + _INT64.size
+    if tag == b"d":
+        return _DOUBLE.unpack_from(payload, offset)[0], offset + _DOUBLE.size
+
+    length = _LENGTH.unpack_from(payload, offset)[0]
+    offset += _LENGTH.size
+
+    if tag == b"l":
+        items = []
+        for _ in range(length):
+            item, offset = _struct_decode_value(payload, offset)
+            items.append(item)
+        return items, offset
+
+    if tag == b"m":
+        items = {}
+        for _ in range(length):
+            key, offset = _struct_decode_value(payload, offset)
+            items[key], offset = _struct_decode_value(payload, offset)
+        return items, offset
+
+    data = payload[offset:offset + length]
+    if len(data) != length:
+        raise ValueError("truncated data")
+    offset += length
+
+    if tag == b"s":
+        return data.decode("utf-8"), offset
+    if tag == b"b":
+        return bytes(data), offset
+    if tag == b"I":
+        return int(data.decode("ascii")), offset
+    if tag == b"D":
+        return _parse_datetime(data.decode("ascii")), offset
+    if tag == b"a":
+        return _parse_date(data.decode("ascii")), offset
+
+    raise ValueError("invalid tag: {!r}".format(tag))
+
+
+def _struct_encode(value):
+    out = []
+    _struct_encode_value(value, out)
+    return b"".join(out)
+
+
+def _struct_decode(payload):
+    value, offset = _struct_decode_value(payload, 0)
+    if offset != len(payload):
+        raise ValueError("trailing data")
+    return value
+
+
+def dumps(type_name, data, codec=None):
+    """
+    Encodes an entity's data
+
+    :param str type_name: name of the entity's class
+    :param dict data: the entity's data
+    :param str codec: :py:data:`CODEC_MSGPACK`, :py:data:`CODEC_STRUCT` or ``None`` for :py:func:`default_codec`
+    :return: the encoded entity
+    :rtype: bytes
+    :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` if the codec is invalid or not available, or if the data
+             contains values which can't be encoded
+    """
+    if codec is None:
+        codec = default_codec()
+
+    if codec not in _CODEC_IDS:
+        raise BGGValueError("invalid codec: {}".format(codec))
+
+    if codec == CODEC_MSGPACK and msgpack is None:
+        raise BGGValueError("the msgpack codec requires the 'msgpack' package to be installed")
+
+    try:
+        payload = _msgpack_encode(data) if codec == CODEC_MSGPACK else _struct_encode(data)
+    except (TypeError, ValueError, OverflowError) as e:
+        raise BGGValueError("can't serialize {}: {}".format(type_name, e))
+
+    name = type_name.encode("utf-8")
+    return _HEADER.pack(MAGIC, FORMAT_VERSION, _CODEC_IDS[codec], len(name)) + name + payload
+
+
+def loads(encoded):
+    """
+    Decodes an entity encoded by :py:func:`dumps`
+
+    :param bytes encoded: the encoded entity
+    :return: the name of the entity's class and its data
+    :rtype: tuple
+    :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` if the data is invalid, uses an unsupported format
+             version or a codec which isn't available
+    """
+    try:
+        magic, version, codec_id, name_length = _HEADER.unpack_from(encoded, 0)
+    except struct.error:
+        raise BGGValueError("invalid serialized data")
+
+    if magic != MAGIC:
+        raise BGGValueError("invalid serialized data")
+
+    if version != FORMAT_VERSION:
+        raise BGGValueError("unsupported serialization format version: {}".format(version))
+
+    codec = _CODEC_NAMES.get(codec_id)
+    if codec is None:
+        raise BGGValueError("invalid codec in serialized data")
+
+    if codec == CODEC_MSGPACK and msgpack is None:
+        raise BGGValueError("decoding this data requires the 'msgpack' package to be installed")
+
+    start = _HEADER.size + name_length
+    type_name = encoded[_HEADER.size:start].decode("utf-8")
+    payload = encoded[start:]
+
+    try:
+        data = _msgpack_decode(payload) if codec == CODEC_MSGPACK else _struct_decode(payload)
+    except Exception as e:
+        raise BGGValueError("invalid serialized data: {}".format(e))
+
+    return type_name, data
+
+
+def _entity_classes():
+    from .objects.collection import Collection
+    from .objects.games import BoardGame, CollectionBoardGame, BoardGameComment
+    from .objects.guild import Guild
+    from .objects.hotitems import HotItems, HotItem
+    from .objects.plays import Plays, UserPlays, GamePlays, PlaySession
+    from .objects.search import SearchResult
+    from .objects.things import Thing
+    from .objects.user import User
+
+    return {cls.__name__: cls for cls in [Collection, BoardGame, CollectionBoardGame, BoardGameComment, Guild,
+                                          HotItems, HotItem, Plays, UserPlays, GamePlays, PlaySession, SearchResult,
+                                          Thing, User]}
+
+
+def from_bytes(encoded):
+    """
+    Creates an entity out of its encoding, whatever its class
+
+    :param bytes encoded: data returned by the entity's ``to_bytes()``
+    :return: the entity
+    :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` if the data is invalid
+    """
+    type_name, data = loads(encoded)
+    cls = _entity_classes().get(type_name)
+    if cls is None:
+        raise BGGValueError("unknown entity type: {}".format(type_name))
+    return cls(data)
@@ -0,0 +1,584 @@
+# coding: utf-8
+"""
+:mod:`boardgamegeek.store` - Local entity store
+===============================================
+
+.. module:: boardgamegeek.store
+   :platform: Unix, Windows
+   :synopsis: SQLite store of parsed games, collections, plays and guilds
+
+.. moduleauthor:: Cosmin Luță <q4break@gmail.com>
+
+"""
+from __future__ import unicode_literals
+
+import logging
+import sqlite3
+import time
+
+from .exceptions import BGGValueError
+from .objects.collection import Collection
+from .objects.games import BoardGame
+from .objects.guild import Guild
+from .objects.plays import PlaySession, UserPlays
+from .serialization import loads
+
+log = logging.getLogger("boardgamegeek.store")
+
+# the lists of a game's links which are stored in the game_links table, by link type
+GAME_LINK_TYPES = {"category": "categories",
+                   "mechanic": "mechanics",
+                   "family": "families",
+                   "designer": "designers",
+                   "artist": "artists",
+                   "publisher": "publishers",
+                   "implementation": "implementations"}
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    name TEXT,
+    year INTEGER,
+    min_players INTEGER,
+    max_players INTEGER,
+    playing_time INTEGER,
+    min_playing_time INTEGER,
+    max_playing_time INTEGER,
+    min_age INTEGER,
+    users_rated INTEGER,
+    rating_average REAL,
+    rating_bayes_average REAL,
+    rating_average_weight REAL,
+    bgg_rank INTEGER,
+    expansion INTEGER,
+    accessory INTEGER,
+    data BLOB NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_name ON games (name);
+CREATE INDEX IF NOT EXISTS games_bgg_rank ON games (bgg_rank);
+CREATE INDEX IF NOT EXISTS games_players ON games (min_players, max_players);
+CREATE INDEX IF NOT EXISTS games_year ON games (year);
+
+CREATE TABLE IF NOT EXISTS game_links (
+    game_id INTEGER NOT NULL REFERENCES games (id) ON DELETE CASCADE,
+    type TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (game_id, type, value)
+);
+CREATE INDEX IF NOT EXISTS game_links_value ON game_links (type, value);
+
+CREATE TABLE IF NOT EXISTS collection_items (
+    owner TEXT NOT NULL,
+    game_id INTEGER NOT NULL,
+    name TEXT,
+    rating REAL,
+    numplays INTEGER,
+    owned INTEGER,
+    prev_owned INTEGER,
+    preordered INTEGER,
+    for_trade INTEGER,
+    want INTEGER,
+    want_to_play INTEGER,
+    want_to_buy INTEGER,
+    wishlist INTEGER,
+    wishlist_priority INTEGER,
+    last_modified TEXT,
+    data BLOB NOT NULL,
+    PRIMARY KEY (owner, game_id)
+);
+CREATE INDEX IF NOT EXISTS collection_items_game ON collection_items (game_id);
+
+CREATE TABLE IF NOT EXISTS plays (
+    id INTEGER PRIMARY KEY,
+    username TEXT,
+    user_id INTEGER,
+    game_id INTEGER,
+    game_name TEXT,
+    date TEXT,
+    quantity INTEGER,
+    duration INTEGER,
+    incomplete INTEGER,
+    nowinstats INTEGER,
+    location TEXT,
+    data BLOB NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS plays_game_date ON plays (game_id, date);
+CREATE INDEX IF NOT EXISTS plays_user_date ON plays (user_id, date);
+CREATE INDEX IF NOT EXISTS plays_username_date ON plays (username, date);
+
+CREATE TABLE IF NOT EXISTS play_players (
+    play_id INTEGER NOT NULL REFERENCES plays (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    username TEXT,
+    user_id INTEGER,
+    name TEXT,
+    color TEXT,
+    score TEXT,
+    win INTEGER,
+    new INTEGER,
+    PRIMARY KEY (play_id, position)
+);
+CREATE INDEX IF NOT EXISTS play_players_username ON play_players (username);
+
+CREATE TABLE IF NOT EXISTS guilds (
+    id INTEGER PRIMARY KEY,
+    name TEXT,
+    category TEXT,
+    country TEXT,
+    city TEXT,
+    manager TEXT,
+    data BLOB NOT NULL,
+    updated_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS guild_members (
+    guild_id INTEGER NOT NULL REFERENCES guilds (id) ON DELETE CASCADE,
+    username TEXT NOT NULL,
+    PRIMARY KEY (guild_id, username)
+);
+CREATE INDEX IF NOT EXISTS guild_members_username ON guild_members (username);
+
+CREATE TABLE IF NOT EXISTS fetches (
+    key TEXT PRIMARY KEY,
+    fetched_at REAL NOT NULL
+);
+"""
+
+
+def _flag(value):
+    if value is None:
+        return None
+    try:
+        return int(bool(int(value)))
+    except (TypeError, ValueError):
+        return None
+
+
+def _date(value):
+    return value.strftime("%Y-%m-%d") if value is not None else None
+
+
+class EntityStore(object):
+    """
+    A local SQLite store of parsed entities (games, collections, plays and guilds), kept in normalised and indexed
+    tables so that it can be queried (e.g. by mechanic, player count or play date) without hitting BGG.
+
+    Besides the query helpers, the store can act as a read-through cache for a client: :py:meth:`game`,
+    :py:meth:`collection`, :py:meth:`plays` and :py:meth:`guild` serve the stored entity and fetch (and store) it
+    again only if it's older than ``max_age`` seconds.
+
+    :param str path: path of the SQLite database file (``":memory:"`` for an in-memory store)
+    :param client: the :py:class:`boardgamegeek.api.BGGCommon` used for refreshing entities, or ``None`` for a
+                   read-only store
+
+    Example usage::
+
+        >>> store = EntityStore("/path/to/bgg.db", client=BGGClient())
+        >>> game = store.game(31260, max_age=24 * 3600)
+        >>> store.find_games(mechanic="Worker Placement", players=2)
+    """
+    def __init__(self, path=":memory:", client=None):
+        self._client = client
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA foreign_keys = ON")
+
+        version = self._db.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            raise BGGValueError("unsupported store schema version: {}".format(version))
+
+        with self._db:
+            self._db.executescript(_SCHEMA)
+            self._db.execute("PRAGMA user_version = {}".format(SCHEMA_VERSION))
+
+    def close(self):
+        """
+        Closes the database
+        """
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    #
+    # storing entities
+    #
+    def _fetched(self, key, timestamp):
+        self._db.execute("INSERT OR REPLACE INTO fetches (key, fetched_at) VALUES (?, ?)", (key, timestamp))
+
+    def _upsert_game(self, game, now):
+        self._db.execute("INSERT OR REPLACE INTO games (id, name, year, min_players, max_players, playing_time, "
+                         "min_playing_time, max_playing_time, min_age, users_rated, rating_average, "
+                         "rating_bayes_average, rating_average_weight, bgg_rank, expansion, accessory, data, "
+                         "updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                         (game.id, game.name, game.year, game.min_players, game.max_players, game.playing_time,
+                          game.min_playing_time, game.max_playing_time, game.min_age, game.users_rated,
+                          game.rating_average, game.rating_bayes_average, game.rating_average_weight, game.bgg_rank,
+                          int(bool(game.expansion)), int(bool(game.accessory)), game.to_bytes(), now))
+
+        self._db.execute("DELETE FROM game_links WHERE game_id = ?", (game.id,))
+        self._db.executemany("INSERT OR IGNORE INTO game_links (game_id, type, value) VALUES (?, ?, ?)",
+                             [(game.id, link_type, value)
+                              for link_type, attribute in GAME_LINK_TYPES.items()
+                              for value in getattr(game, attribute) or []])
+        self._fetched("game:{}".format(game.id), now)
+
+    def upsert_games(self, games):
+        """
+        Stores games, replacing the previously stored version
+
+        :param games: the games
+        :type games: iterable of :py:class:`boardgamegeek.objects.games.BoardGame`
+        """
+        now = time.time()
+        with self._db:
+            for game in games:
+                self._upsert_game(game, now)
+
+    def upsert_game(self, game):
+        """
+        Stores a game, replacing the previously stored version
+
+        :param game: the game
+        :type game: :py:class:`boardgamegeek.objects.games.BoardGame`
+        """
+        self.upsert_games([game])
+
+    def upsert_collection(self, collection):
+        """
+        Stores an user's collection, replacing the previously stored one
+
+        :param collection: the collection
+        :type collection: :py:class:`boardgamegeek.objects.collection.Collection`
+        """
+        now = time.time()
+        with self._db:
+            self._db.execute("DELETE FROM collection_items WHERE owner = ?", (collection.owner,))
+            self._db.executemany("INSERT INTO collection_items (owner, game_id, name, rating, numplays, owned, "
+                                 "prev_owned, preordered, for_trade, want, want_to_play, want_to_buy, wishlist, "
+                                 "wishlist_priority, last_modified, data) "
+                                 "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                 [(collection.owner, item.id, item.name, item.rating, item.numplays,
+                                   int(item.owned), int(item.prev_owned), int(item.preordered), int(item.for_trade),
+                                   int(item.want), int(item.want_to_play), int(item.want_to_buy), int(item.wishlist),
+                                   item.wishlist_priority, item.last_modified, item.to_bytes())
+                                  for item in collection])
+            self._fetched("collection:{}".format(collection.owner), now)
+
+    def _upsert_plays(self, plays, username, now):
+        if username is None and isinstance(plays, UserPlays):
+            username = plays.user
+
+        for play in plays:
+            self._db.execute("INSERT OR REPLACE INTO plays (id, username, user_id, game_id, game_name, date, "
+                             "quantity, duration, incomplete, nowinstats, location, data, updated_at) "
+                             "VALUES (?, COALESCE(?, (SELECT username FROM plays WHERE id = ?)), "
+                             "?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                             (play.id, username, play.id, play.user_id, play.game_id, play.game_name,
+                              _date(play.date), play.quantity, play.duration, play.incomplete, play.nowinstats,
+                              play.location, play.to_bytes(), now))
+
+            self._db.execute("DELETE FROM play_players WHERE play_id = ?", (play.id,))
+            self._db.executemany("INSERT INTO play_players (play_id, position, username, user_id, name, color, "
+                                 "score, win, new) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                 [(play.id, position, player.username, player.user_id, player.name,
+                                   player.color, player.score, _flag(player.win), _flag(player.new))
+                                  for position, player in enumerate(play.players)])
+
+    def upsert_plays(self, plays, username=None):
+        """
+        Stores play sessions, replacing the previously stored versions
+
+        :param plays: the play sessions (a :py:class:`boardgamegeek.objects.plays.Plays` or an iterable of
+                      :py:class:`boardgamegeek.objects.plays.PlaySession`)
+        :param str username: name of the user who logged the plays (taken from ``plays`` if it's a
+                             :py:class:`boardgamegeek.objects.plays.UserPlays`)
+        """
+        with self._db:
+            self._upsert_plays(plays, username, time.time())
+
+    def upsert_guild(self, guild):
+        """
+        Stores a guild, replacing the previously stored version
+
+        :param guild: the guild
+        :type guild: :py:class:`boardgamegeek.objects.guild.Guild`
+        """
+        now = time.time()
+        with self._db:
+            self._db.execute("INSERT OR REPLACE INTO guilds (id, name, category, country, city, manager, data, "
+                             "updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                             (guild.id, guild.name, guild.category, guild.country, guild.city, guild.manager,
+                              guild.to_bytes(), now))
+            self._db.execute("DELETE FROM guild_members WHERE guild_id = ?", (guild.id,))
+            self._db.executemany("INSERT INTO guild_members (guild_id, username) VALUES (?, ?)",
+                                 [(guild.id, member) for member in guild.members])
+            self._fetched("guild:{}".format(guild.id), now)
+
+    #
+    # reading entities
+    #
+    def get_game(self, game_id):
+        """
+        :param integer game_id: the game's id
+        :return: the stored game
+        :rtype: :py:class:`boardgamegeek.objects.games.BoardGame`
+        :return: ``None`` if the game isn't stored
+        """
+        row = self._db.execute("SELECT data FROM games WHERE id = ?", (game_id,)).fetchone()
+        return BoardGame.from_bytes(row[0]) if row is not None else None
+
+    def get_collection(self, owner):
+        """
+        :param str owner: the collection's owner
+        :return: the stored collection
+        :rtype: :py:class:`boardgamegeek.objects.collection.Collection`
+        :return: ``None`` if the collection isn't stored
+        """
+        if self.fetched_at("collection:{}".format(owner)) is None:
+            return None
+
+        rows = self._db.execute("SELECT data FROM collection_items WHERE owner = ? ORDER BY rowid", (owner,))
+        return Collection({"owner": owner, "items": [loads(row[0])[1] for row in rows]})
+
+    def get_plays(self, username=None, game_id=None, min_date=None, max_date=None):
+        """
+        Returns the stored play sessions matching all the specified criteria, ordered by date
+
+        :param str username: name of the user who logged the plays
+        :param integer game_id: the game's id
+        :param datetime.date min_date: return only plays of the specified date or later
+        :param datetime.date max_date: return only plays of the specified date or earlier
+        :return: the play sessions
+        :rtype: list of :py:class:`boardgamegeek.objects.plays.PlaySession`
+        """
+        where, params = self._plays_conditions(username, game_id, min_date, max_date)
+        rows = self._db.execute("SELECT data FROM plays{} ORDER BY date, id".format(where), params)
+        return [PlaySession.from_bytes(row[0]) for row in rows]
+
+    def get_guild(self, guild_id):
+        """
+        :param integer guild_id: the guild's id
+        :return: the stored guild
+        :rtype: :py:class:`boardgamegeek.objects.guild.Guild`
+        :return: ``None`` if the guild isn't stored
+        """
+        row = self._db.execute("SELECT data FROM guilds WHERE id = ?", (guild_id,)).fetchone()
+        return Guild.from_bytes(row[0]) if row is not None else None
+
+    def fetched_at(self, key):
+        """
+        :param str key: what was fetched (``"game:<id>"``, ``"collection:<owner>"``, ``"plays:user:<name>"``,
+                        ``"plays:game:<id>"`` or ``"guild:<id>"``)
+        :return: when it was last fetched, as a UNIX timestamp
+        :rtype: float
+        :return: ``None`` if it was never fetched
+        """
+        row = self._db.execute("SELECT fetched_at FROM fetches WHERE key = ?", (key,)).fetchone()
+        return row[0] if row is not None else None
+
+    #
+    # query helpers
+    #
+    def find_games(self, mechanic=None, category=None, family=None, designer=None, publisher=None, players=None,
+                   min_rating=None, max_bgg_rank=None, max_playing_time=None, min_year=None, max_year=None,
+                   limit=None):
+        """
+        Returns the stored games matching all the specified criteria, best ranked first
+
+        :param str mechanic: the games must have this mechanic
+        :param str category: the games must have this category
+        :param str family: the games must be part of this family
+        :param str designer: the games must be designed by this designer
+        :param str publisher: the games must be published by this publisher
+        :param integer players: the games must support this number of players
+        :param float min_rating: minimum average rating
+        :param integer max_bgg_rank: maximum (worst) BGG rank; unranked games are excluded
+        :param integer max_playing_time: maximum playing time
+        :param integer min_year: minimum publishing year
+        :param integer max_year: maximum publishing year
+        :param integer limit: maximum number of games to return
+        :return: the games
+        :rtype: list of :py:class:`boardgamegeek.objects.games.BoardGame`
+        """
+        conditions = []
+        params = []
+
+        for link_type, value in [("mechanic", mechanic), ("category", category), ("family", family),
+                                 ("designer", designer), ("publisher", publisher)]:
+            if value is not None:
+                conditions.append("id IN (SELECT game_id FROM game_links WHERE type = ? AND value = ?)")
+                params.extend([link_type, value])
+
+        if players is not None:
+            conditions.append("min_players <= ? AND max_players >= ?")
+            params.extend([players, players])
+
+        for column, operator, value in [("rating_average", ">=", min_rating),
+                                        ("bgg_rank", "<=", max_bgg_rank),
+                                        ("playing_time", "<=", max_playing_time),
+                                        ("year", ">=", min_year),
+                                        ("year", "<=", max_year)]:
+            if value is not None:
+                conditions.append("{} {} ?".format(column, operator))
+                params.append(value)
+
+        query = "SELECT data FROM games"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY bgg_rank IS NULL, bgg_rank, id"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(int(limit))
+
+        return [BoardGame.from_bytes(row[0]) for row in self._db.execute(query, params)]
+
+    def owners(self, game_id):
+        """
+        :param integer game_id: the game's id
+        :return: the users (having a stored collection) who own the game
+        :rtype: list of str
+        """
+        rows = self._db.execute("SELECT owner FROM collection_items WHERE game_id = ? AND owned = 1 ORDER BY owner",
+                                (game_id,))
+        return [row[0] for row in rows]
+
+    def play_counts(self, username=None, game_id=None, min_date=None, max_date=None):
+        """
+        Counts the stored plays (taking the quantity into account) for each game
+
+        :param str username: count only the plays logged by this user
+        :param integer game_id: count only the plays of this game
+        :param datetime.date min_date: count only plays of the specified date or later
+        :param datetime.date max_date: count only plays of the specified date or earlier
+        :return: number of plays for each game id
+        :rtype: dict
+        """
+        where, params = self._plays_conditions(username, game_id, min_date, max_date)
+        rows = self._db.execute("SELECT game_id, SUM(quantity) FROM plays{} GROUP BY game_id".format(where), params)
+        return {row[0]: row[1] for row in rows}
+
+    def guilds_of(self, username):
+        """
+        :param str username: user name
+        :return: ids of the stored guilds the user is a member of
+        :rtype: list of integers
+        """
+        rows = self._db.execute("SELECT guild_id FROM guild_members WHERE username = ? ORDER BY guild_id",
+                                (username,))
+        return [row[0] for row in rows]
+
+    @staticmethod
+    def _plays_conditions(username, game_id, min_date, max_date):
+        conditions = []
+        params = []
+        for column, operator, value in [("username", "=", username),
+                                        ("game_id", "=", game_id),
+                                        ("date", ">=", _date(min_date)),
+                                        ("date", "<=", _date(max_date))]:
+            if value is not None:
+                conditions.append("{} {} ?".format(column, operator))
+                params.append(value)
+
+        if not conditions:
+            return "", []
+        return " WHERE " + " AND ".join(conditions), params
+
+    #
+    # read-through access
+    #
+    def _is_fresh(self, key, max_age):
+        fetched_at = self.fetched_at(key)
+        if fetched_at is None:
+            return False
+        return max_age is None or time.time() - fetched_at <= max_age
+
+    def _refresh(self, key, max_age):
+        # True if the entity has to be fetched from BGG
+        if self._is_fresh(key, max_age):
+            return False
+        if self._client is None:
+            log.debug("{} is stale, but there's no client for refreshing it".format(key))
+            return False
+        return True
+
+    def game(self, game_id, max_age=None, **kwargs):
+        """
+        Returns a game from the store, fetching (and storing) it first if it isn't stored or is older than
+        ``max_age`` seconds
+
+        :param integer game_id: the game's id
+        :param float max_age: maximum age of the stored game, in seconds (``None`` for no limit)
+        :param kwargs: other arguments for :py:meth:`boardgamegeek.api.BGGClient.game`, used when fetching the game
+        :return: the game
+        :rtype: :py:class:`boardgamegeek.objects.games.BoardGame`
+        :return: ``None`` if the game isn't stored and there's no client for fetching it
+        """
+        if self._refresh("game:{}".format(game_id), max_age):
+            self.upsert_game(self._client.game(game_id=game_id, **kwargs))
+        return self.get_game(game_id)
+
+    def collection(self, user_name, max_age=None, **kwargs):
+        """
+        Returns an user's collection from the store, fetching (and storing) it first if it isn't stored or is older
+        than ``max_age`` seconds
+
+        :param str user_name: the collection's owner
+        :param float max_age: maximum age of the stored collection, in seconds (``None`` for no limit)
+        :param kwargs: other arguments for :py:meth:`boardgamegeek.api.BGGCommon.collection`, used when fetching the
+                       collection
+        :return: the collection
+        :rtype: :py:class:`boardgamegeek.objects.collection.Collection`
+        :return: ``None`` if the collection isn't stored and there's no client for fetching it
+        """
+        if self._refresh("collection:{}".format(user_name), max_age):
+            self.upsert_collection(self._client.collection(user_name, **kwargs))
+        return self.get_collection(user_name)
+
+    def plays(self, name=None, game_id=None, max_age=None):
+        """
+        Returns the play sessions of an user (if using ``name``) or of a game (if using ``game_id``) from the store,
+        fetching (and storing) them first if they weren't fetched or were fetched more than ``max_age`` seconds ago
+
+        :param str name: user name
+        :param integer game_id: game id
+        :param float max_age: maximum age of the stored plays, in seconds (``None`` for no limit)
+        :return: the play sessions
+        :rtype: list of :py:class:`boardgamegeek.objects.plays.PlaySession`
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` if neither ``name`` nor ``game_id`` is specified
+        """
+        if not name and game_id is None:
+            raise BGGValueError("no user name or game id specified")
+
+        key = "plays:user:{}".format(name) if name else "plays:game:{}".format(game_id)
+        if self._refresh(key, max_age):
+            fetched = self._client.plays(name=name, game_id=game_id if not name else None)
+            now = time.time()
+            with self._db:
+                self._upsert_plays(fetched, None, now)
+                self._fetched(key, now)
+
+        if name:
+            return self.get_plays(username=name, game_id=game_id)
+        return self.get_plays(game_id=game_id)
+
+    def guild(self, guild_id, max_age=None):
+        """
+        Returns a guild from the store, fetching (and storing) it first if it isn't stored or is older than
+        ``max_age`` seconds
+
+        :param integer guild_id: the guild's id
+        :param float max_age: maximum age of the stored guild, in seconds (``None`` for no limit)
+        :return: the guild
+        :rtype: :py:class:`boardgamegeek.objects.guild.Guild`
+        :return: ``None`` if the guild isn't stored and there's no client for fetching it
+        """
+        if self._refresh("guild:{}".format(guild_id), max_age):
+            self.upsert_guild(self._client.guild(guild_id))
+        return self.get_guild(guild_id)
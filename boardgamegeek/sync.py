@@ -0,0 +1,222 @@
+# coding: utf-8
+"""
+:mod:`boardgamegeek.sync` - Incremental synchronisation
+=======================================================
+
+.. module:: boardgamegeek.sync
+   :platform: Unix, Windows
+   :synopsis: incremental retrieval of plays, using persisted high-water marks
+
+.. moduleauthor:: Cosmin Luță <q4break@gmail.com>
+
+"""
+from __future__ import unicode_literals
+
+import datetime
+import io
+import json
+import logging
+import os
+
+from .exceptions import BGGItemNotFoundError, BGGValueError
+
+
+log = logging.getLogger("boardgamegeek.sync")
+
+
+class PlaysSyncState(object):
+    """
+    High-water marks of incremental plays synchronisations: for each user or game, the date of the newest play seen
+    and the ids of the plays logged on that date (needed for deduplication, since the next synchronisation starts from
+    that same date), as well as the ids of the plays seen without a date (which can't be placed before or after the
+    high-water mark).
+
+    :param str path: if not ``None``, the JSON file where the state is loaded from and saved to. If ``None``, the
+                     state is only kept in memory.
+    """
+    def __init__(self, path=None):
+        self._path = path
+        self._marks = {}
+
+        if path is not None and os.path.isfile(path):
+            with io.open(path, "r", encoding="utf-8") as f:
+                try:
+                    self._marks = json.load(f)
+                except ValueError:
+                    raise BGGValueError("invalid plays sync state file: {}".format(path))
+
+    @staticmethod
+    def key(name=None, game_id=None):
+        """
+        :param str name: user name
+        :param integer game_id: game id
+        :return: the key under which the high-water mark of a user's or game's plays is stored
+        :rtype: str
+        """
+        if name:
+            return "user:{}".format(name)
+        return "game:{}".format(int(game_id))
+
+    def get(self, key):
+        """
+        :param str key: the key of the high-water mark
+        :return: high-water mark, with keys ``last_date`` (:py:class:`datetime.date`, ``None`` if only plays without a
+                 date were seen), ``ids`` (set of the play ids seen on ``last_date``) and ``undated_ids`` (set of
+                 the ids of the plays seen without a date)
+        :rtype: dict
+        :return: ``None`` if nothing was synchronised for this key yet
+        """
+        mark = self._marks.get(key)
+        if mark is None:
+            return None
+
+        last_date = mark["last_date"]
+        return {"last_date": datetime.datetime.strptime(last_date, "%Y-%m-%d").date() if last_date else None,
+                "ids": set(mark["ids"]),
+                "undated_ids": set(mark.get("undated_ids", []))}
+
+    def update(self, key, last_date, ids, undated_ids=()):
+        """
+        Updates the high-water mark for ``key``
+
+        :param str key: the key of the high-water mark
+        :param datetime.date last_date: date of the newest play seen (``None`` if only plays without a date were seen)
+        :param ids: ids of the plays seen on ``last_date``
+        :param undated_ids: ids of the plays seen without a date
+        """
+        self._marks[key] = {"last_date": last_date.isoformat() if last_date is not None else None,
+                            "ids": sorted(ids),
+                            "undated_ids": sorted(undated_ids)}
+
+    def reset(self, key):
+        """
+        Forgets the high-water mark for ``key``, so the next synchronisation fetches the full history again
+
+        :param str key: the key of the high-water mark
+        """
+        self._marks.pop(key, None)
+
+    def save(self):
+        """
+        Saves the state to the file it was loaded from (does nothing for in-memory states)
+        """
+        if self._path is None:
+            return
+
+        tmp_path = "{}.tmp".format(self._path)
+        with io.open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(self._marks, sort_keys=True))
+
+        # replace the old state only when the new one has been written completely
+        try:
+            os.replace(tmp_path, self._path)
+        except AttributeError:
+            # Python 2
+            if os.path.exists(self._path):
+                os.remove(self._path)
+            os.rename(tmp_path, self._path)
+
+
+class PlaysSync(object):
+    """
+    Incremental retrieval of plays, per user or per game. Each synchronisation only fetches the plays logged on or
+    after the date of the newest play seen previously, and skips the plays that were already returned.
+
+    :param client: the :py:class:`boardgamegeek.api.BGGCommon` used to fetch the plays
+    :param state: :py:class:`boardgamegeek.sync.PlaysSyncState` holding the high-water marks. If ``None``, an
+                  in-memory state is used.
+
+    Example usage::
+
+        >>> sync = PlaysSync(BGGClient(), PlaysSyncState("/path/to/plays-sync.json"))
+        >>> new_plays = sync.sync(name="fagentu007")
+    """
+    def __init__(self, client, state=None):
+        self._client = client
+        self._state = state if state is not None else PlaysSyncState()
+
+    @property
+    def state(self):
+        """
+        :return: the high-water marks used by this object
+        :rtype: :py:class:`boardgamegeek.sync.PlaysSyncState`
+        """
+        return self._state
+
+    def sync(self, name=None, game_id=None, progress=None, subtype="boardgame", save=True):
+        """
+        Retrieves the plays of an user (if using ``name``) or of a game (if using ``game_id``) which weren't returned
+        by a previous synchronisation, and updates the high-water mark.
+
+        :param str name: user name to retrieve the plays for
+        :param integer game_id: game id to retrieve the plays for
+        :param callable progress: an optional callable for reporting progress, taking two integers (``current``,
+                                  ``total``) as arguments
+        :param str subtype: limit plays results to the specified subtype.
+        :param bool save: if ``True``, save the state after updating the high-water mark
+        :return: the new plays
+        :rtype: list of :py:class:`boardgamegeek.plays.PlaySession`
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` in case of invalid parameter(s)
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGItemNotFoundError` if the user/game couldn't be found
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGApiRetryError` if this request should be retried after a short delay
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGApiError` if the response couldn't be parsed
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGApiTimeoutError` if there was a timeout
+        """
+        if not name and not game_id:
+            raise BGGValueError("no user name or game id specified")
+
+        try:
+            key = PlaysSyncState.key(name=name, game_id=game_id)
+        except (TypeError, ValueError):
+            raise BGGValueError("invalid game id")
+
+        mark = self._state.get(key)
+
+        try:
+            plays = self._client.plays(name=name,
+                                       game_id=game_id,
+                                       progress=progress,
+                                       min_date=mark["last_date"] if mark else None,
+                                       subtype=subtype)
+        except BGGItemNotFoundError:
+            if mark is None:
+                raise
+            # the API reports no plays at all (as if the user/game didn't exist) when nothing was logged since
+            # the high-water mark
+            log.debug("no new plays for {}".format(key))
+            return []
+
+        if mark is None:
+            mark = {"last_date": None, "ids": set(), "undated_ids": set()}
+
+        new_plays = []
+        for play in plays:
+            play_date = play.date.date() if play.date is not None else None
+
+            if play_date is None:
+                # plays without a date can only be told apart by their ids
+                if play.id not in mark["undated_ids"]:
+                    new_plays.append(play)
+                    mark["undated_ids"].add(play.id)
+                continue
+
+            if play_date == mark["last_date"] and play.id in mark["ids"]:
+                # already returned by the previous synchronisation
+                continue
+
+            new_plays.append(play)
+
+            if mark["last_date"] is None or play_date > mark["last_date"]:
+                mark["last_date"] = play_date
+                mark["ids"] = set()
+            if play_date == mark["last_date"]:
+                mark["ids"].add(play.id)
+
+        log.debug("fetched {} new plays for {}".format(len(new_plays), key))
+
+        if new_plays:
+            self._state.update(key, mark["last_date"], mark["ids"], mark["undated_ids"])
+            if save:
+                self._state.save()
+
+        return new_plays
@@ -0,0 +1,144 @@
+# coding: utf-8
+"""
+:mod:`boardgamegeek.tracing` - Tracing
+======================================
+
+.. module:: boardgamegeek.tracing
+   :platform: Unix, Windows
+   :synopsis: OpenTelemetry spans of the API calls and of the requests they make
+
+.. moduleauthor:: Cosmin Luță <q4break@gmail.com>
+
+Once a client is traced, each call of an API method (``guild()``, ``plays()``, ``game()``, ...) opens a span, tagged
+with the ids of the entities it's about. Each request the call makes (e.g. each page of plays) is a child span of it,
+tagged with the endpoint, the page number and the response's status, having children of its own for each step of
+the request: attempts, waiting for the rate limiter, sleeping before retrying, parsing the XML and loading the objects
+out of it. ``iter_plays()`` returns before making any request, so it doesn't have a span of its own, only the spans of
+its requests::
+
+    >>> from boardgamegeek.tracing import Tracing
+    >>> bgg = BGGClient()
+    >>> Tracing().attach(bgg)
+
+The ``opentelemetry-api`` package is needed, unless a tracer is given explicitly.
+
+"""
+from __future__ import unicode_literals
+
+import logging
+
+from .utils import import_optional
+
+
+log = logging.getLogger("boardgamegeek.tracing")
+
+# the request parameters the request spans are tagged with
+TAGGED_PARAMS = ["id", "username", "name", "query", "type", "subtype"]
+
+
+def _ns(timestamp):
+    # OpenTelemetry timestamps are in nanoseconds
+    return int(timestamp * 1e9)
+
+
+def _attribute(value):
+    if isinstance(value, BaseException):
+        return type(value).__name__
+    if isinstance(value, (bool, int, float, str, type(""))):
+        return value
+    return "{}".format(value)
+
+
+def _attributes(attributes):
+    # span attributes can't be None, and must be primitive values or sequences of them
+    result = {}
+    for key, value in attributes.items():
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple)):
+            result[key] = [_attribute(v) for v in value]
+        else:
+            result[key] = _attribute(value)
+    return result
+
+
+def _phase_attributes(phase):
+    return {"http.status_code" if key == "status" else "bgg.{}".format(key): value
+            for key, value in phase.attributes.items()}
+
+
+class Tracing(object):
+    """
+    Traces the API calls of clients
+
+    :param tracer: the OpenTelemetry tracer to create the spans with (or any object having its
+                   ``start_as_current_span`` and ``start_span`` methods). By default, the ``boardgamegeek`` tracer of
+                   the global tracer provider.
+    :raises: `ImportError` if no tracer was given and the ``opentelemetry-api`` package isn't installed
+    """
+    def __init__(self, tracer=None):
+        if tracer is None:
+            trace = import_optional("opentelemetry.trace", "tracing")
+            tracer = trace.get_tracer("boardgamegeek")
+        self.tracer = tracer
+
+    def attach(self, client):
+        """
+        Starts tracing the calls of a client
+
+        :param client: the client (:py:class:`boardgamegeek.api.BGGCommon`)
+        :return: this object
+        """
+        client._tracing = self
+        client.add_request_hook(self)
+        return self
+
+    def detach(self, client):
+        """
+        Stops tracing the calls of a client
+
+        :param client: the client (:py:class:`boardgamegeek.api.BGGCommon`)
+        """
+        client._tracing = None
+        client.remove_request_hook(self)
+
+    def call(self, name, attributes):
+        """
+        :param str name: the name of the API method being called
+        :param dict attributes: the attributes of the span (e.g. the id of the entity being retrieved)
+        :return: context manager making the span of the call the current one, while the method runs
+        """
+        return self.tracer.start_as_current_span("bgg.{}".format(name), attributes=_attributes(attributes))
+
+    def __call__(self, event):
+        """
+        Creates the span of a request (a child of the current span, i.e. of the API call) and the spans of its steps
+
+        :param event: :py:class:`boardgamegeek.instrumentation.RequestEvent` describing the request
+        """
+        attributes = {"bgg.endpoint": event.endpoint,
+                      "bgg.page": event.params.get("page", 1),
+                      "bgg.attempts": event.attempts,
+                      "bgg.from_cache": event.from_cache,
+                      "bgg.response_bytes": event.bytes,
+                      "http.url": event.url,
+                      "http.status_code": event.status}
+        for param in TAGGED_PARAMS:
+            attributes["bgg.{}".format(param)] = event.params.get(param)
+
+        with self.tracer.start_as_current_span("bgg.request {}".format(event.endpoint),
+                                               start_time=_ns(event.start),
+                                               attributes=_attributes(attributes),
+                                               end_on_exit=False,
+                                               record_exception=False,
+                                               set_status_on_exception=False) as span:
+            for phase in event.phases:
+                child = self.tracer.start_span("bgg.{}".format(phase.name),
+                                               start_time=_ns(phase.start),
+                                               attributes=_attributes(_phase_attributes(phase)))
+                child.end(end_time=_ns(phase.end))
+
+            if event.error is not None:
+                span.record_exception(event.error)
+
+        span.end(end_time=_ns(event.end if event.end is not None else event.start + event.total_time))
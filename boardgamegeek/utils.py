@@ -11,6 +11,7 @@
 
 """
 from __future__ import unicode_literals
+import importlib
 import sys
 import xml.etree.ElementTree as ET
 from xml.etree.ElementTree import ParseError as ETParseError
@@ -37,12 +38,61 @@ except ImportError: # Python 2
     import HTMLParser
     html_unescape = HTMLParser.HTMLParser().unescape
 
-from .exceptions import BGGApiError, BGGApiRetryError, BGGError, BGGApiTimeoutError
+from .exceptions import BGGApiError, BGGApiRetryError, BGGError, BGGApiTimeoutError, BGGValueError, BGGDeadlineError
+from .instrumentation import current_event, set_current_event
+from .retry import RetryPolicy, TIMEOUT
 
 log = logging.getLogger("boardgamegeek.utils")
 
 DEFAULT_REQUESTS_PER_MINUTE = 30
 
+DEFAULT_STRING_POOL_SIZE = 100000
+
+_local = threading.local()      # the deadline of the request being sent by the current thread, for the rate limiter
+
+
+class Deadline(object):
+    """
+    The time by which a call (including all its pages, retries and waits for the rate limiter) must be done
+
+    :param float seconds: how long from now the deadline expires
+    :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` if ``seconds`` isn't a number
+    """
+    def __init__(self, seconds):
+        try:
+            self.seconds = float(seconds)
+        except (TypeError, ValueError):
+            raise BGGValueError("invalid deadline: {}".format(seconds))
+        self.expires = time.time() + self.seconds
+
+    @classmethod
+    def of(cls, deadline):
+        """
+        :param deadline: ``None``, a number of seconds from now or a :py:class:`Deadline` (shared by several calls)
+        :return: the deadline, ``None`` if there's none
+        :rtype: :py:class:`Deadline`
+        """
+        if deadline is None or isinstance(deadline, cls):
+            return deadline
+        return cls(deadline)
+
+    def remaining(self):
+        """
+        :return: the seconds left until the deadline expires (0 if it expired)
+        :rtype: float
+        """
+        return max(self.expires - time.time(), 0.0)
+
+    def check(self, wait=0):
+        """
+        Checks if there's time left for waiting
+
+        :param float wait: the seconds to wait
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGDeadlineError` if the deadline would expire while waiting
+        """
+        if time.time() + wait >= self.expires:
+            raise BGGDeadlineError("deadline of {}s expired".format(self.seconds))
+
 
 class RateLimitingAdapter(HTTPAdapter):
     """
@@ -72,6 +122,7 @@ class RateLimitingAdapter(HTTPAdapter):
         super(RateLimitingAdapter, self).__init__(**kw)
 
     def send(self, request, **kw):
+        queued = time.time()
         log.debug("acquiring rate limiting lock")
         with RateLimitingAdapter.__rate_limit_lock:
 
@@ -86,24 +137,82 @@ class RateLimitingAdapter(HTTPAdapter):
                 log.debug("time since last request: {}, need to wait: {}".format(time_delta, need_to_wait))
 
                 if need_to_wait > 0:
+                    # don't wait past the deadline of the call sending the request
+                    deadline = getattr(_local, "deadline", None)
+                    if deadline is not None:
+                        deadline.check(need_to_wait)
                     time.sleep(need_to_wait)
 
-            RateLimitingAdapter.__last_request_timestamp = time.time()
+            sent = RateLimitingAdapter.__last_request_timestamp = time.time()
             log.debug("releasing rate limiting lock")
 
+        # report the time spent waiting for the lock and sleeping to the request's event, if it's instrumented
+        event = current_event()
+        if event is not None:
+            event.rate_limit_wait += sent - queued
+            event.add_phase("rate_limit_wait", queued, sent)
+
         log.debug("sending request: {}".format(request))
         return super(RateLimitingAdapter, self).send(request, **kw)
 
 
-class DictObject(object):
+class BinarySerializable(object):
+    """
+    Base class for the objects which can be encoded in a compact binary format (see
+    :py:mod:`boardgamegeek.serialization`) and recreated out of it.
+    """
+    __slots__ = ()
+
+    def _serialized_data(self):
+        # the data needed for recreating this object by passing it to the constructor. Containers which don't keep
+        # their children in the data dictionary override this.
+        return self.data()
+
+    def to_bytes(self, codec=None):
+        """
+        Encodes this object's data in a compact, versioned binary format
+
+        :param str codec: ``"msgpack"``, ``"struct"`` (standard library only) or ``None`` for msgpack if it's
+                          installed, ``"struct"`` otherwise
+        :return: the encoded object
+        :rtype: bytes
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` if the object can't be encoded
+        """
+        from .serialization import dumps
+        return dumps(type(self).__name__, self._serialized_data(), codec=codec)
+
+    @classmethod
+    def from_bytes(cls, encoded):
+        """
+        Creates an object out of the data returned by :py:meth:`to_bytes`
+
+        :param bytes encoded: the encoded object
+        :return: the object
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` if the data is invalid or was produced by another
+                 class
+        """
+        from .serialization import loads
+        type_name, data = loads(encoded)
+        if type_name != cls.__name__:
+            raise BGGValueError("expected a serialized {}, got a {}".format(cls.__name__, type_name))
+        return cls(data)
+
+
+class DictObject(BinarySerializable):
     """
     Just a fancy wrapper over a dictionary
     """
+    # no per-instance __dict__, subclasses that are created in large numbers declare their own __slots__ too
+    __slots__ = ("_data",)
 
     def __init__(self, data):
         self._data = data
 
     def __getattr__(self, item):
+        # _data isn't set yet (e.g. while unpickling)
+        if item == "_data":
+            raise AttributeError(item)
+
         # allow accessing user's variables using .attribute
         try:
             return self._data[item]
@@ -118,6 +227,269 @@ class DictObject(object):
         """
         return self._data
 
+    def __getstate__(self):
+        return _slots_state(self)
+
+    def __setstate__(self, state):
+        _set_slots_state(self, state)
+
+
+class SlottedObject(BinarySerializable):
+    """
+    Alternative to :py:class:`DictObject` for objects created in large numbers (play sessions, players, comments):
+    the values of the keys listed in ``_fields`` are stored in slots (named like the key, prefixed by ``_``) instead
+    of a dictionary. Keys which aren't in ``_fields`` are still accessible as attributes.
+
+    Subclasses must declare ``__slots__`` for their fields. Keys listed in ``_nested_fields`` are ignored, the
+    subclass is responsible for storing them.
+    """
+    __slots__ = ("_extra",)
+    _fields = ()
+    _nested_fields = ()
+
+    def __init__(self, data):
+        fields = self._fields
+        for key in fields:
+            setattr(self, "_" + key, data.get(key))
+
+        self._extra = None
+        for key in data:
+            if key not in fields and key not in self._nested_fields:
+                if self._extra is None:
+                    self._extra = {}
+                self._extra[key] = data[key]
+
+    def __getattr__(self, item):
+        if item == "_extra":
+            raise AttributeError(item)
+
+        if item in self._fields:
+            return getattr(self, "_" + item)
+
+        try:
+            return self._extra[item]
+        except:
+            raise AttributeError
+
+    def data(self):
+        """
+        Access to the object's data, for easy dumping
+        :return: a dictionary with the object's data
+        """
+        data = {key: getattr(self, "_" + key) for key in self._fields}
+        if self._extra:
+            data.update(self._extra)
+        return data
+
+    def __getstate__(self):
+        return _slots_state(self)
+
+    def __setstate__(self, state):
+        _set_slots_state(self, state)
+
+
+class StringPool(object):
+    """
+    Pool of strings, used for interning the categorical values which repeat across many
+    objects (categories, mechanics, designers, publishers, languages, rank names, colors, ...), so that equal values
+    share the same object in memory. Free text (names of players, locations, ...) isn't worth pooling.
+
+    The pool lives as long as the client owning it, so it's bounded: once it holds ``max_size`` strings, new values
+    are returned as they are, without being pooled.
+
+    :param int max_size: the most strings the pool holds
+    """
+    def __init__(self, max_size=DEFAULT_STRING_POOL_SIZE):
+        self.max_size = max_size
+        self._strings = {}
+
+    def intern(self, value):
+        """
+        :param str value: string to intern
+        :return: the pooled string equal to ``value`` (``value`` itself if it wasn't pooled already)
+        :rtype: str
+        """
+        if value is None:
+            return None
+        pooled = self._strings.get(value)
+        if pooled is not None:
+            return pooled
+        if len(self._strings) < self.max_size:
+            self._strings[value] = value
+        return value
+
+    def clear(self):
+        """
+        Empties the pool. The objects already created keep using the strings they were created with.
+        """
+        self._strings.clear()
+
+    def __len__(self):
+        return len(self._strings)
+
+    def stats(self):
+        """
+        :return: the number of pooled strings
+        :rtype: dict
+        """
+        return {"strings": len(self._strings)}
+
+
+def pool_intern(pool, value):
+    """
+    :param pool: :py:class:`boardgamegeek.utils.StringPool` or ``None``
+    :param str value: string to intern
+    :return: ``value``, interned if ``pool`` is not ``None``
+    """
+    return value if pool is None else pool.intern(value)
+
+
+# returned by a decoder when its key isn't available for an item
+ABSENT = object()
+
+
+class LazyXmlData(dict):
+    """
+    Dictionary holding the data of an object in "lazy" mode: the values of the keys having a decoder are decoded
+    out of an XML element only when first accessed, and kept afterwards.
+
+    A decoder is a callable taking the XML element and a :py:class:`boardgamegeek.utils.StringPool` (or ``None``) as
+    arguments and returning the value of its key, or :py:data:`boardgamegeek.utils.ABSENT` if the key isn't available
+    for this element. Any exception raised by a decoder (e.g. for malformed XML) is propagated.
+
+    :param xml_elem: XML element the values are decoded from
+    :param dict decoders: decoder for each key
+    :param dict data: values which are already known
+    :param pool: :py:class:`boardgamegeek.utils.StringPool` used for interning the decoded strings, or ``None``
+    """
+    def __init__(self, xml_elem, decoders, data=None, pool=None):
+        super(LazyXmlData, self).__init__(data or {})
+        self._element = xml_elem
+        self._decoders = decoders
+        self._pool = pool
+        self._absent = set()
+
+    @property
+    def detached(self):
+        """
+        :return: ``True`` if all the values were decoded and the XML element was released
+        :rtype: bool
+        """
+        return self._element is None
+
+    def _decode(self, key):
+        # decodes (and keeps) the value of a key which isn't in the dictionary, ABSENT if it isn't available
+        if self._element is None or key not in self._decoders or key in self._absent:
+            return ABSENT
+        value = self._decoders[key](self._element, self._pool)
+        if value is ABSENT:
+            self._absent.add(key)
+        else:
+            dict.__setitem__(self, key, value)
+        return value
+
+    def __missing__(self, key):
+        value = self._decode(key)
+        if value is ABSENT:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return dict.__contains__(self, key) or self._decode(key) is not ABSENT
+
+    def get(self, key, default=None):
+        if dict.__contains__(self, key):
+            return dict.__getitem__(self, key)
+        value = self._decode(key)
+        return default if value is ABSENT else value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def _decode_all(self):
+        if self._element is not None:
+            for key in self._decoders:
+                if not dict.__contains__(self, key):
+                    self._decode(key)
+            self._element = None
+            self._pool = None
+            self._absent = set()
+
+    def materialize(self):
+        """
+        Decodes all the remaining values and releases the XML element
+
+        :return: the data
+        :rtype: dict
+        """
+        self._decode_all()
+        return {key: dict.__getitem__(self, key) for key in dict.keys(self)}
+
+    # everything that looks at all the keys needs them decoded first
+    def __iter__(self):
+        self._decode_all()
+        return dict.__iter__(self)
+
+    def __len__(self):
+        self._decode_all()
+        return dict.__len__(self)
+
+    def keys(self):
+        self._decode_all()
+        return dict.keys(self)
+
+    def values(self):
+        self._decode_all()
+        return dict.values(self)
+
+    def items(self):
+        self._decode_all()
+        return dict.items(self)
+
+    def copy(self):
+        return self.materialize()
+
+    def __reduce__(self):
+        # pickled as a regular dictionary, the XML element isn't kept
+        return dict, (self.materialize(),)
+
+
+def decode_all(xml_root, decoders, data, pool=None):
+    """
+    Decodes all the keys of an item's data
+
+    :param xml_root: the item's XML element
+    :param dict decoders: decoder for each key
+    :param dict data: data which is already known, updated with the decoded values (the keys whose decoder returns
+                      :py:data:`boardgamegeek.utils.ABSENT` are left out)
+    :param pool: :py:class:`boardgamegeek.utils.StringPool` used for interning the decoded strings, or ``None``
+    :return: ``data``
+    """
+    for key, decode in decoders.items():
+        value = decode(xml_root, pool)
+        if value is not ABSENT:
+            data[key] = value
+    return data
+
+
+def _slots_state(obj):
+    # pickle support for classes using __slots__ (needed for the pickle protocols < 2)
+    state = dict(getattr(obj, "__dict__", {}))
+    for cls in type(obj).__mro__:
+        for name in cls.__dict__.get("__slots__", ()):
+            try:
+                state[name] = object.__getattribute__(obj, name)
+            except AttributeError:
+                pass
+    return state
+
+
+def _set_slots_state(obj, state):
+    for name, value in state.items():
+        object.__setattr__(obj, name, value)
+
 
 def xml_subelement_attr_by_attr(xml_elem, subelement, filter_attr, filter_value, convert=None, attribute="value", default=None, quiet=False):
     """
@@ -295,7 +667,51 @@ def xml_subelement_text(xml_elem, subelement, convert=None, default=None, quiet=
     return text
 
 
-def request_and_parse_xml(requests_session, url, params=None, timeout=15, retries=3, retry_delay=5):
+def _get(requests_session, url, params, timeout, event, deadline=None):
+    # sends a request, recording the attempt in the event
+    if deadline is not None:
+        _local.deadline = deadline
+        try:
+            return _get(requests_session, url, params, timeout, event)
+        finally:
+            _local.deadline = None
+
+    if event is None:
+        return requests_session.get(url, params=params, timeout=timeout)
+
+    event.attempts += 1
+    previous = set_current_event(event)
+    rate_limit_wait = event.rate_limit_wait
+    start = time.time()
+    try:
+        r = requests_session.get(url, params=params, timeout=timeout)
+    except Exception as e:
+        event.statuses.append(None)
+        event.add_phase("attempt", start, time.time(), attempt=event.attempts, error=e)
+        raise
+    finally:
+        # the time spent by the rate limiter (which the current event is reported to) isn't network time
+        event.network_time += time.time() - start - (event.rate_limit_wait - rate_limit_wait)
+        set_current_event(previous)
+
+    event.statuses.append(r.status_code)
+    event.from_cache = bool(getattr(r, "from_cache", False))
+    event.add_phase("attempt", start, time.time(), attempt=event.attempts, status=r.status_code,
+                    from_cache=event.from_cache)
+    return r
+
+
+def _sleep(seconds, event):
+    # sleeps before retrying a request
+    start = time.time()
+    time.sleep(seconds)
+    if event is not None:
+        event.retry_wait += seconds
+        event.add_phase("retry_wait", start, time.time(), delay=seconds)
+
+
+def request_and_parse_xml(requests_session, url, params=None, timeout=15, retries=3, retry_delay=5, event=None,
+                          retry_policy=None, deadline=None):
     """
     Downloads an XML from the specified url, parses it and returns the xml ElementTree.
 
@@ -303,51 +719,61 @@ def request_and_parse_xml(requests_session, url, params=None, timeout=15, retrie
     :param url: the address where to get the XML from
     :param params: dictionary containing the parameters which should be sent with the request
     :param timeout: number of seconds after which the request times out
-    :param retries: number of retries to perform in case of timeout
-    :param retry_delay: the amount of seconds to sleep when retrying an API call that returned 202
+    :param retries: number of retries to perform in case of timeout (ignored if ``retry_policy`` is given)
+    :param retry_delay: the amount of seconds to sleep when retrying an API call that returned 202 (ignored if
+                        ``retry_policy`` is given)
+    :param event: if not ``None``, :py:class:`boardgamegeek.instrumentation.RequestEvent` to record the attempts,
+                  timings and size of the response in
+    :param retry_policy: :py:class:`boardgamegeek.retry.RetryPolicy` deciding when the request is retried. By
+                         default, :py:meth:`boardgamegeek.retry.RetryPolicy.legacy` with ``retries`` and
+                         ``retry_delay``.
+    :param deadline: if not ``None``, :py:class:`Deadline` bounding the time spent on the attempts, on the retry delays
+                     and on waiting for the rate limiter
     :return: :py:func:`xml.etree.ElementTree` corresponding to the XML
     :raises: :py:class:`BGGApiRetryError` if this request should be retried after a short delay
     :raises: :py:class:`BGGApiError` if the response was invalid or couldn't be parsed
     :raises: :py:class:`BGGApiTimeoutError` if there was a timeout
+    :raises: :py:class:`BGGDeadlineError` if the deadline expired
     """
+    if retry_policy is None:
+        retry_policy = RetryPolicy.legacy(retries, retry_delay)
 
-    retr = retries
+    retry = retry_policy.start(timeout)
 
     # retry loop
-    while retr >= 0:
-        retr -= 1
+    while True:
+        timeout = retry.timeout
+        if deadline is not None:
+            deadline.check()
+            timeout = min(timeout, deadline.remaining())
+
         try:
-            r = requests_session.get(url, params=params, timeout=timeout)
-
-            if r.status_code == 202:
-                if retries == 0:
-                    # no retries have been requested, therefore raise exception to signal the application that it
-                    # needs to retry
-                    # (BoardGameGeek API says that on status code 202 the call should be retried after a delay)
-                    raise BGGApiRetryError
-                elif retr == 0:
-                    # retries were requested, but we reached 0. Signal the application that it needs to retry itself.
-                    raise BGGApiRetryError("failed to retrieve data after {} retries".format(retries))
+            r = _get(requests_session, url, params, timeout, event, deadline)
+
+            if r.status_code in (202, 503):
+                # 202: the request was queued, the BoardGameGeek API says it should be retried after a delay.
+                # 503: it seems they added some sort of protection which triggers when too many requests are made.
+                delay = retry.retry(r.status_code)
+                if delay is None:
+                    if r.status_code == 202:
+                        # signal the application that it needs to retry itself
+                        raise BGGApiRetryError(retry.reason)
+                    raise BGGApiError("API is throttling the requests: {}".format(retry.reason))
+
+                if deadline is not None:
+                    deadline.check(delay)
+                if r.status_code == 503:
+                    log.warning("API returned 503, retrying in {:.2f} seconds".format(delay))
                 else:
-                    # sleep for the specified delay and retry
-                    log.debug("API call will be retried in {} seconds ({} more retries)".format(retry_delay, retr))
-                    if retr >= 0:
-                        time.sleep(retry_delay)
-                        retry_delay *= 1.5
-                    continue
-            elif r.status_code == 503:
-                # it seems they added some sort of protection which triggers when too many requests are made, in which
-                # case we get back a 503. Try to delay and retry
-                log.warning("API returned 503, retrying")
-                if retr >= 0:
-                    time.sleep(retry_delay)
-                    retry_delay *= 3
+                    log.debug("API call will be retried in {:.2f} seconds".format(delay))
+                _sleep(delay, event)
                 continue
 
             if not r.headers.get("content-type").lower().startswith("text/xml"):
                 raise BGGApiError("non-XML reply")
 
             xml = r.text
+            parse_start = time.time()
 
             if sys.version_info >= (3,):
                 root_elem = ET.fromstring(xml)
@@ -355,29 +781,56 @@ def request_and_parse_xml(requests_session, url, params=None, timeout=15, retrie
                 utf8_xml = xml.encode("utf-8")
                 root_elem = ET.fromstring(utf8_xml)
 
+            if event is not None:
+                parse_end = time.time()
+                event.parse_time += parse_end - parse_start
+                event.add_phase("parse", parse_start, parse_end)
+                content = getattr(r, "content", None)
+                event.bytes = len(content) if content is not None else len(xml.encode("utf-8"))
+                event.elements = sum(1 for _ in root_elem.iter())
+
             return root_elem
 
         except requests.exceptions.Timeout:
-            if retries == 0:
-                raise BGGApiTimeoutError
-            elif retr == 0:
-                # ... reached 0 retries
-                raise BGGApiTimeoutError("failed to retrieve data after {} retries".format(retries))
-            else:
-                log.debug("API request timeout, retrying {} more times w/timeout {}".format(retr, timeout))
-                timeout *= 2.5
-                continue
+            if deadline is not None:
+                # the attempt may have timed out early, because of the deadline
+                deadline.check()
+
+            delay = retry.retry(TIMEOUT)
+            if delay is None:
+                raise BGGApiTimeoutError(retry.reason)
+
+            if deadline is not None:
+                deadline.check(delay)
+
+            log.debug("API request timeout, retrying in {:.2f} seconds w/timeout {}".format(delay, retry.timeout))
+            if delay > 0:
+                _sleep(delay, event)
+            continue
 
         except ETParseError as e:
             raise BGGApiError("error decoding BGG API response: {}".format(e))
 
-        except (BGGApiRetryError, BGGApiTimeoutError):
+        except (BGGApiRetryError, BGGApiTimeoutError, BGGApiError):
             raise
 
         except Exception as e:
             raise BGGApiError("error fetching BGG API response: {}".format(e))
 
-    raise BGGApiError("couldn't fetch data within the configured number of retries")
+
+def import_optional(module_name, feature):
+    """
+    Imports an optional dependency of the library
+
+    :param str module_name: name of the module to import
+    :param str feature: the functionality which needs the module, used in the error message
+    :return: the imported module
+    :raises: `ImportError` if the module isn't installed
+    """
+    try:
+        return importlib.import_module(module_name)
+    except ImportError:
+        raise ImportError("{} requires the '{}' package, which is not installed".format(feature, module_name))
 
 
 def fix_url(url):
@@ -401,16 +854,16 @@ def fix_unsigned_negative(value):
     return value
 
 
-def get_board_game_version_from_element(xml_elem):
+def get_board_game_version_from_element(xml_elem, pool=None):
     data = {"id": int(xml_elem.attrib["id"]),
             "yearpublished": fix_unsigned_negative(xml_subelement_attr(xml_elem,
                                                                        "yearpublished",
                                                                        convert=int,
                                                                        default=0,
                                                                        quiet=True)),
-            "language": xml_subelement_attr_by_attr(xml_elem, "link", "type", "language"),
-            "publisher": xml_subelement_attr_by_attr(xml_elem, "link", "type", "boardgamepublisher"),
-            "artist": xml_subelement_attr_by_attr(xml_elem, "link", "type", "boardgameartist"),
+            "language": pool_intern(pool, xml_subelement_attr_by_attr(xml_elem, "link", "type", "language")),
+            "publisher": pool_intern(pool, xml_subelement_attr_by_attr(xml_elem, "link", "type", "boardgamepublisher")),
+            "artist": pool_intern(pool, xml_subelement_attr_by_attr(xml_elem, "link", "type", "boardgameartist")),
             "thumbnail": xml_subelement_text(xml_elem, "thumbnail"),
             "image": xml_subelement_text(xml_elem, "image"),
             "name": xml_subelement_attr(xml_elem, "name"),
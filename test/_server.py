@@ -0,0 +1,309 @@
+# coding: utf-8
+"""
+A local HTTP server standing in for the BGG XML API, for testing the client end to end (rate limiting, retries,
+concurrency) without making requests to the real site.
+
+Responses are the recorded ones in ``xml/`` (looked up the same way :py:func:`_common.simulate_bgg` does) or generated
+by routes added with :py:meth:`BGGStandIn.add_route` (e.g. serving :py:mod:`_synthetic` documents). The server can
+also misbehave like the real one:
+
+* ``latency``: every response is delayed by this many seconds
+* ``inject(202, 503, TIMEOUT, ...)``: the next requests are answered with "202 Accepted" (the request was queued,
+  retry later), "503 Service Unavailable" (throttling) or aren't answered for ``stall`` seconds (a timeout)
+* ``fault_rates``: the probability of each fault, for every request (e.g. ``{202: 0.1, 503: 0.05}``)
+* ``rate_limit``: requests per minute above which requests are answered with 503
+
+Usage, from the tests::
+
+    with BGGStandIn() as server:
+        bgg = BGGClient(cache=CacheBackendNone(), api_endpoint=server.url, requests_per_minute=6000)
+        server.inject(202, 503)
+        game = bgg.game(game_id=31260, videos=True, versions=True)
+
+or standalone, for load testing::
+
+    python test/_server.py --port 8080 --latency 0.2 --fault-rate 202=0.1 --fault-rate 503=0.05 \\
+                           --synthetic-plays 100000
+"""
+from __future__ import unicode_literals, print_function
+
+import argparse
+import collections
+import io
+import os
+import random
+import threading
+import time
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import urlsplit, parse_qsl
+except ImportError:
+    # Python 2
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urlparse import urlsplit, parse_qsl
+
+XML_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "xml")
+
+API_PATH = "/xmlapi2"
+
+TIMEOUT = "timeout"
+FAULTS = (202, 503, TIMEOUT)
+
+# what was requested and how it was answered
+Request = collections.namedtuple("Request", ["time", "endpoint", "params", "status"])
+
+
+def fixture_name(endpoint, params):
+    """
+    :return: the name of the file in ``xml/`` holding the recorded response to a request
+    :rtype: str
+    """
+    return endpoint + "?" + "&".join("{}={}".format(k, v) for k, v in sorted(params.items()))
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # the BGGStandIn serving the requests is set as the server's ``stand_in`` attribute
+
+    def do_GET(self):
+        stand_in = self.server.stand_in
+        url = urlsplit(self.path)
+        status, body = stand_in.respond(url.path, dict(parse_qsl(url.query)))
+
+        if status is None:
+            # a timeout: the connection is closed without answering
+            self.close_connection = True
+            return
+
+        body = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/xml; charset=utf-8" if status == 200 else "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class BGGStandIn(object):
+    """
+    A local server standing in for the BGG XML API, running in a background thread
+
+    :param str host: address to listen on
+    :param int port: port to listen on (0 for any free one)
+    :param float latency: delay of every response, in seconds
+    :param float stall: how long a request isn't answered for when simulating a timeout, in seconds
+    :param dict fault_rates: probability of each fault (202, 503 or ``TIMEOUT``), for every request
+    :param float rate_limit: if not ``None``, requests per minute above which requests are answered with 503
+    :param int seed: seed of the random faults
+    """
+    def __init__(self, host="127.0.0.1", port=0, latency=0, stall=5, fault_rates=None, rate_limit=None, seed=0):
+        self.latency = latency
+        self.stall = stall
+        self.fault_rates = dict(fault_rates or {})
+        self.rate_limit = rate_limit
+        self.requests = []
+        self.max_concurrent = 0
+
+        self._routes = {}
+        self._faults = collections.deque()
+        self._random = random.Random(seed)
+        self._recent = collections.deque()      # times of the requests of the last minute, for the rate limit
+        self._concurrent = 0
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+        self._server = _ThreadingHTTPServer((host, port), _Handler)
+        self._server.stand_in = self
+        self._thread = None
+
+    @property
+    def url(self):
+        """
+        :return: the URL of the API, to be used as the client's ``api_endpoint``
+        :rtype: str
+        """
+        host, port = self._server.server_address[:2]
+        return "http://{}:{}{}".format(host, port, API_PATH)
+
+    def add_route(self, endpoint, respond):
+        """
+        Serves the responses of an endpoint with a function instead of the recorded ones
+
+        :param str endpoint: the endpoint (e.g. ``plays``)
+        :param callable respond: function receiving the request's parameters (a dict) and returning the XML
+        """
+        self._routes[endpoint] = respond
+
+    def inject(self, *faults):
+        """
+        Makes the next requests fail, one fault per request, in order
+
+        :param faults: 202, 503 or ``TIMEOUT``
+        """
+        for fault in faults:
+            if fault not in FAULTS:
+                raise ValueError("invalid fault: {}".format(fault))
+        with self._lock:
+            self._faults.extend(faults)
+
+    def statuses(self, endpoint=None):
+        """
+        :param str endpoint: if not ``None``, only the requests to this endpoint are considered
+        :return: the statuses the requests were answered with, in order (``TIMEOUT`` for the unanswered ones)
+        :rtype: list
+        """
+        return [r.status for r in self.requests if endpoint is None or r.endpoint == endpoint]
+
+    def _fault(self, now):
+        # the fault to simulate for a request received at ``now``, or None
+        with self._lock:
+            if self.rate_limit is not None:
+                while self._recent and self._recent[0] <= now - 60:
+                    self._recent.popleft()
+                self._recent.append(now)
+                if len(self._recent) > self.rate_limit:
+                    return 503
+
+            if self._faults:
+                return self._faults.popleft()
+
+            for fault in FAULTS:
+                if self._random.random() < self.fault_rates.get(fault, 0):
+                    return fault
+
+        return None
+
+    def _content(self, endpoint, params):
+        if endpoint in self._routes:
+            return 200, self._routes[endpoint](params)
+
+        try:
+            with io.open(os.path.join(XML_PATH, fixture_name(endpoint, params)), "r", encoding="utf-8") as f:
+                return 200, f.read()
+        except IOError:
+            return 404, "<html><body>no recorded response for {}</body></html>".format(fixture_name(endpoint, params))
+
+    def respond(self, path, params):
+        """
+        Answers a request
+
+        :param str path: the path of the request's URL
+        :param dict params: the request's parameters
+        :return: the status and the body of the response, ``(None, None)`` for not answering at all
+        :rtype: tuple
+        """
+        now = time.time()
+        endpoint = path[len(API_PATH) + 1:] if path.startswith(API_PATH + "/") else path.lstrip("/")
+
+        with self._lock:
+            self._concurrent += 1
+            self.max_concurrent = max(self.max_concurrent, self._concurrent)
+
+        try:
+            fault = self._fault(now)
+            if fault == TIMEOUT:
+                # recorded right away, the client gives up before the request ends
+                self.requests.append(Request(now, endpoint, params, TIMEOUT))
+                self._stopped.wait(self.stall)
+                return None, None
+            elif fault is not None:
+                status, body = fault, "<html><body>{}</body></html>".format(fault)
+            else:
+                status, body = self._content(endpoint, params)
+
+            if self.latency:
+                self._stopped.wait(self.latency)
+
+            self.requests.append(Request(now, endpoint, params, status))
+            return status, body
+        finally:
+            with self._lock:
+                self._concurrent -= 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()         # wakes up the stalled requests
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def synthetic_plays(count):
+    """
+    :return: a route serving plays histories of ``count`` plays, for any user
+    """
+    import _synthetic
+    return lambda params: _synthetic.text(_synthetic.plays(params["username"], count,
+                                                           page=int(params.get("page", 1))))
+
+
+def synthetic_collection(count):
+    """
+    :return: a route serving collections of ``count`` items, for any user
+    """
+    import _synthetic
+    return lambda params: _synthetic.text(_synthetic.collection(params["username"], count))
+
+
+def _fault_rate(value):
+    fault, rate = value.split("=")
+    return (TIMEOUT if fault == TIMEOUT else int(fault)), float(rate)
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="local server standing in for the BGG XML API")
+    p.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    p.add_argument("--port", type=int, default=8080, help="port to listen on")
+    p.add_argument("--latency", type=float, default=0, help="delay of every response, in seconds")
+    p.add_argument("--stall", type=float, default=30, help="how long the simulated timeouts last, in seconds")
+    p.add_argument("--fault-rate", type=_fault_rate, action="append", default=[], metavar="FAULT=RATE",
+                   help="probability of a fault (202, 503 or timeout) for every request; can be repeated")
+    p.add_argument("--rate-limit", type=float, help="requests per minute above which 503 is returned")
+    p.add_argument("--synthetic-plays", type=int, metavar="COUNT",
+                   help="serve synthetic plays histories of this many plays instead of the recorded ones")
+    p.add_argument("--synthetic-collection", type=int, metavar="COUNT",
+                   help="serve synthetic collections of this many items instead of the recorded ones")
+    args = p.parse_args(argv)
+
+    server = BGGStandIn(host=args.host, port=args.port, latency=args.latency, stall=args.stall,
+                        fault_rates=dict(args.fault_rate), rate_limit=args.rate_limit)
+    if args.synthetic_plays:
+        server.add_route("plays", synthetic_plays(args.synthetic_plays))
+    if args.synthetic_collection:
+        server.add_route("collection", synthetic_collection(args.synthetic_collection))
+
+    with server:
+        print("serving the BGG API at {}".format(server.url))
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+
+    statuses = collections.Counter(server.statuses())
+    print("{} requests: {}".format(len(server.requests),
+                                   ", ".join("{} x {}".format(n, s) for s, n in sorted(statuses.items(), key=str))))
+
+
+if __name__ == "__main__":
+    main()
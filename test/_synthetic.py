@@ -0,0 +1,235 @@
+# coding: utf-8
+"""
+Generators of synthetic BGG API responses, having the same structure as the recorded ones in ``xml/``, but any
+size: e.g. 10k items collections or 1M plays histories, for testing and benchmarking the library at scale.
+
+The documents are generated as iterators of text chunks, so even huge ones don't need to be kept in memory (use
+:py:func:`text` to get the whole document). The content is deterministic: the same parameters always produce the same
+document. Values are drawn from small vocabularies, so that they repeat like in real data.
+"""
+from __future__ import unicode_literals
+
+import datetime
+import io
+from xml.sax.saxutils import escape, quoteattr
+
+TERMS_OF_USE = "http://boardgamegeek.com/xmlapi/termsofuse"
+
+GAME_NAMES = ["Agricola", "Puerto Rico", "Power Grid", "Pandemic", "Saboteur", "Russian Railroads", "Eclipse",
+              "Caverna", "Terra Mystica", "Twilight Struggle", "Le Havre", "Carcassonne", "Dominion", "Coup"]
+CATEGORIES = ["Economic", "Farming", "Civilization", "Science Fiction", "Wargame", "Card Game", "Medieval"]
+MECHANICS = ["Worker Placement", "Hand Management", "Dice Rolling", "Tile Placement", "Area Control / Area Influence",
+             "Deck / Pool Building", "Variable Player Powers", "Auction/Bidding"]
+DESIGNERS = ["Uwe Rosenberg", "Andreas Seyfarth", "Friedemann Friese", "Matt Leacock", "Touko Tahkokallio"]
+PUBLISHERS = ["Lookout Games", "Z-Man Games", "Rio Grande Games", "Hans im Glück", "Asmodee"]
+PLAYER_NAMES = ["Armand", "Henri", "Jean", "George", "Vinny", "Ana", "Ioana", "Mihai", "Elena", "Radu"]
+COLORS = ["red", "blue", "green", "yellow", "purple", "black", "white"]
+LOCATIONS = ["", "Home", "Club", "Game Café", "Convention"]
+
+PLAYS_PAGE_SIZE = 100
+GUILD_PAGE_SIZE = 25
+
+_FIRST_DATE = datetime.date(2010, 1, 1)
+
+
+def text(chunks):
+    """
+    :param chunks: a document, as returned by the generators in this module
+    :return: the whole document
+    :rtype: str
+    """
+    return "".join(chunks)
+
+
+def write(chunks, path):
+    """
+    Writes a document to a file, chunk by chunk
+
+    :param chunks: a document, as returned by the generators in this module
+    :param str path: the file to write to
+    """
+    with io.open(path, "w", encoding="utf-8") as f:
+        for chunk in chunks:
+            f.write(chunk)
+
+
+def _pick(values, i, salt=0):
+    return values[(i * 7 + salt * 13 + i // len(values)) % len(values)]
+
+
+def _links(link_type, values, i, count, start_id):
+    return "".join('<link type="{}" id="{}" value={} />'.format(link_type, start_id + (i + k) % len(values),
+                                                                  quoteattr(_pick(values, i + k)))
+                   for k in range(count))
+
+
+def thing(count, start_id=100000, seed=0):
+    """
+    A ``thing`` response, with ``count`` board games (with statistics)
+
+    :param int count: number of items
+    :param int start_id: id of the first item
+    :param int seed: varies the content
+    :return: generator of text chunks
+    """
+    yield '<?xml version="1.0" encoding="utf-8"?><items termsofuse="{}">'.format(TERMS_OF_USE)
+
+    for n in range(count):
+        i = n + seed
+        game_id = start_id + n
+        name = "{} {}".format(_pick(GAME_NAMES, i), game_id)
+        min_players = 1 + i % 3
+        playing_time = 30 + 15 * (i % 10)
+        yield ('<item type="boardgame" id="{id}">'
+               '<thumbnail>//cf.geekdo-images.com/images/pic{id}_t.jpg</thumbnail>'
+               '<image>//cf.geekdo-images.com/images/pic{id}.jpg</image>'
+               '<name type="primary" sortindex="1" value={name} />'
+               '<description>{description}</description>'
+               '<yearpublished value="{year}" />'
+               '<minplayers value="{min_players}" /><maxplayers value="{max_players}" />'
+               '<playingtime value="{time}" /><minplaytime value="{min_time}" /><maxplaytime value="{time}" />'
+               '<minage value="{age}" />'
+               ).format(id=game_id, name=quoteattr(name), year=1990 + i % 30, min_players=min_players,
+                        max_players=min_players + 1 + i % 4, time=playing_time, min_time=playing_time // 2,
+                        age=8 + 2 * (i % 5),
+                        description=escape("{} is a synthetic game, generated for testing.".format(name)))
+
+        yield _links("boardgamecategory", CATEGORIES, i, 2, 1000)
+        yield _links("boardgamemechanic", MECHANICS, i, 3, 2000)
+        yield _links("boardgamedesigner", DESIGNERS, i, 1, 3000)
+        yield _links("boardgamepublisher", PUBLISHERS, i, 2, 4000)
+        yield '<link type="boardgameexpansion" id="{}" value={} />'.format(start_id + count + n,
+                                                                          quoteattr(name + ": Expansion"))
+
+        yield ('<statistics page="1"><ratings>'
+               '<usersrated value="{rated}" /><average value="{average:.5f}" /><bayesaverage value="{bayes:.5f}" />'
+               '<ranks>'
+               '<rank type="subtype" id="1" name="boardgame" friendlyname="Board Game Rank" value="{rank}" '
+               'bayesaverage="{bayes:.5f}" />'
+               '<rank type="family" id="5497" name="strategygames" friendlyname="Strategy Game Rank" '
+               'value="{family_rank}" bayesaverage="{bayes:.5f}" />'
+               '</ranks>'
+               '<stddev value="1.4" /><median value="0" /><owned value="{owned}" /><trading value="10" />'
+               '<wanting value="20" /><wishing value="30" /><numcomments value="40" /><numweights value="50" />'
+               '<averageweight value="{weight:.4f}" />'
+               '</ratings></statistics></item>'
+               ).format(rated=100 + i % 5000, average=5 + (i % 50) / 10.0, bayes=5 + (i % 40) / 10.0, rank=1 + n,
+                        family_rank=1 + n // 2, owned=200 + i % 9000, weight=1 + (i % 40) / 10.0)
+
+    yield "</items>"
+
+
+def collection(username, count, start_id=100000, seed=0):
+    """
+    A ``collection`` response (with statistics), with ``count`` items
+
+    :param str username: the collection's owner
+    :param int count: number of items
+    :param int start_id: id of the first item
+    :param int seed: varies the content
+    :return: generator of text chunks
+    """
+    yield ('<?xml version="1.0" encoding="utf-8" standalone="yes"?>'
+           '<items totalitems="{}" termsofuse="{}" pubdate="Thu, 28 Dec 2017 19:40:28 +0000">'.format(count,
+                                                                                                      TERMS_OF_USE))
+    for n in range(count):
+        i = n + seed
+        game_id = start_id + n
+        owned = int(i % 3 != 0)
+        yield ('<item objecttype="thing" objectid="{id}" subtype="boardgame" collid="{collid}">'
+               '<name sortindex="1">{name}</name>'
+               '<yearpublished>{year}</yearpublished>'
+               '<image>https://cf.geekdo-images.com/images/pic{id}.jpg</image>'
+               '<thumbnail>https://cf.geekdo-images.com/images/pic{id}_t.jpg</thumbnail>'
+               '<stats minplayers="2" maxplayers="{max_players}" minplaytime="30" maxplaytime="{time}" '
+               'playingtime="{time}" numowned="{owned_by}">'
+               '<rating value="{rating}"><usersrated value="{rated}" /><average value="{average:.5f}" />'
+               '<bayesaverage value="{average:.5f}" /><stddev value="1.2" /><median value="0" />'
+               '<ranks><rank type="subtype" id="1" name="boardgame" friendlyname="Board Game Rank" value="{rank}" '
+               'bayesaverage="{average:.5f}" /></ranks>'
+               '</rating></stats>'
+               '<status own="{own}" prevowned="{prev}" fortrade="0" want="0" wanttoplay="{want_to_play}" '
+               'wanttobuy="0" wishlist="{wishlist}" {priority}preordered="0" lastmodified="2016-05-31 22:30:02" />'
+               '<numplays>{plays}</numplays>'
+               '</item>'
+               ).format(id=game_id, collid=30000000 + i, name=escape("{} {}".format(_pick(GAME_NAMES, i), game_id)),
+                        year=1990 + i % 30, max_players=2 + i % 5, time=30 + 15 * (i % 10), owned_by=100 + i % 9000,
+                        rating="N/A" if i % 4 == 0 else 1 + i % 10, rated=100 + i % 5000,
+                        average=5 + (i % 50) / 10.0, rank=1 + n, own=owned, prev=int(not owned and i % 2 == 0),
+                        want_to_play=int(i % 5 == 0), wishlist=int(i % 7 == 0),
+                        priority='wishlistpriority="{}" '.format(1 + i % 5) if i % 7 == 0 else "",
+                        plays=i % 12)
+    yield "</items>"
+
+
+def plays(username, count, page=None, page_size=PLAYS_PAGE_SIZE, user_id=818216, seed=0):
+    """
+    A ``plays`` response, for an user having logged ``count`` plays (most recent first)
+
+    :param str username: the user's name
+    :param int count: total number of plays
+    :param int page: if not ``None``, the page (of ``page_size`` plays) to generate, else all of the plays
+    :param int page_size: number of plays in a page
+    :param int user_id: the user's id
+    :param int seed: varies the content
+    :return: generator of text chunks
+    """
+    if page is None:
+        first, last = 0, count
+    else:
+        first, last = min(count, (page - 1) * page_size), min(count, page * page_size)
+
+    yield '<?xml version="1.0" encoding="utf-8"?><plays username={} userid="{}" total="{}" page="{}" ' \
+          'termsofuse="{}">'.format(quoteattr(username), user_id, count, page or 1, TERMS_OF_USE)
+
+    for n in range(first, last):
+        i = n + seed
+        # one play every few hours, going back in time
+        date = _FIRST_DATE + datetime.timedelta(days=(count - n) // 5)
+        players = 1 + i % 5
+        yield ('<play id="{id}" date="{date}" quantity="{quantity}" length="{length}" incomplete="0" '
+               'nowinstats="{nowinstats}" location={location}>'
+               '<item name={game} objecttype="thing" objectid="{game_id}">'
+               '<subtypes><subtype value="boardgame" /></subtypes></item>'
+               ).format(id=100000000 - n, date=date.isoformat(), quantity=1 + int(i % 17 == 0), length=15 * (i % 9),
+                        nowinstats=int(i % 23 == 0), location=quoteattr(_pick(LOCATIONS, i)),
+                        game=quoteattr(_pick(GAME_NAMES, i)), game_id=1000 + GAME_NAMES.index(_pick(GAME_NAMES, i)))
+
+        if i % 3 == 0:
+            yield "<comments>{}</comments>".format(escape("Synthetic play #{}".format(n)))
+
+        yield "<players>"
+        for p in range(players):
+            name = _pick(PLAYER_NAMES, i + p)
+            yield ('<player username="{username}" userid="{userid}" name="{name}" startposition="{position}" '
+                   'color="{color}" score="{score}" new="{new}" rating="0" win="{win}" />'
+                   ).format(username=name.lower() if p % 2 == 0 else "", userid=1000 + PLAYER_NAMES.index(name)
+                            if p % 2 == 0 else 0, name=name, position=p + 1, color=_pick(COLORS, i + p),
+                            score=(i + p * 11) % 100, new=int((i + p) % 19 == 0), win=int(p == i % players))
+        yield "</players></play>"
+
+    yield "</plays>"
+
+
+def guild(guild_id, members, page=1, page_size=GUILD_PAGE_SIZE):
+    """
+    A ``guild`` response (with members)
+
+    :param int guild_id: the guild's id
+    :param int members: total number of members
+    :param int page: the page (of ``page_size`` members) to generate
+    :param int page_size: number of members in a page
+    :return: generator of text chunks
+    """
+    yield ('<?xml version="1.0" encoding="utf-8"?>'
+           '<guild id="{id}" name="Synthetic Guild {id}" created="Sun, 22 Jan 2012 09:53:47 +0000" termsofuse="{tou}">'
+           '<category>hobby</category><website>http://example.com/{id}</website><manager>manager{id}</manager>'
+           '<description>A synthetic guild, generated for testing.</description>'
+           '<location><addr1></addr1><addr2></addr2><city>Bucharest</city><stateorprovince></stateorprovince>'
+           '<postalcode></postalcode><country>Romania</country></location>'
+           '<members count="{count}" page="{page}">').format(id=guild_id, tou=TERMS_OF_USE, count=members, page=page)
+
+    for n in range((page - 1) * page_size, min(members, page * page_size)):
+        yield '<member name="member{}" date="Sat, 01 Aug 2015 08:24:24 +0000" />'.format(n)
+
+    yield "</members></guild>"
@@ -0,0 +1,51 @@
+import copy
+import importlib
+import json
+import os
+import sys
+import pytest
+
+from _common import *
+
+
+BENCHMARKS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "benchmarks")
+
+
+@pytest.fixture
+def runner():
+    sys.path.insert(0, BENCHMARKS_PATH)
+    try:
+        yield importlib.import_module("run")
+    finally:
+        sys.path.remove(BENCHMARKS_PATH)
+
+
+def test_api_benchmarks(runner, tmpdir):
+    output = tmpdir.join("results.json")
+    assert runner.main(["--suite", "api", "--repeat", "1", "--output", str(output)]) == 0
+
+    results = json.loads(output.read())
+    assert results["environment"]["boardgamegeek"]
+
+    api = results["results"]["api"]
+    for method in ["game", "game_list", "collection", "plays", "guild", "hot_items", "user", "search"]:
+        for stage in ["parse", "construct", "end_to_end"]:
+            assert api[method][stage]["median"] > 0
+    assert api["guild"]["responses"] > 1
+    assert "load" in api["plays"]
+    assert "load" not in api["search"]
+
+    # nothing regressed compared to itself
+    assert runner.main(["--suite", "api", "--repeat", "1", "--compare", str(output), "--threshold", "1000"]) == 0
+
+
+def test_compare_benchmark_results(runner):
+    baseline = {"results": {"api": {"game": {"parse": {"median": 1.0, "max": 9.0}}},
+                            "import": {"median_seconds": 0.1}}}
+    results = copy.deepcopy(baseline)
+    results["results"]["api"]["game"]["parse"]["median"] = 1.1
+    results["results"]["api"]["game"]["parse"]["max"] = 100.0
+    results["results"]["import"]["median_seconds"] = 0.2
+
+    assert runner.compare(results, baseline) == [("import/median_seconds", 0.1, 0.2, 2.0)]
+    assert len(runner.compare(results, baseline, threshold=1.05)) == 2
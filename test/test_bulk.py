@@ -0,0 +1,59 @@
+import io
+import threading
+import time
+import pytest
+
+from boardgamegeek import BGGValueError
+from boardgamegeek.bulk import chunks, fetch_concurrently, read_keys
+
+
+def test_read_keys_and_chunks():
+    stream = io.StringIO("# comment\n1, 2 3\n\nfubar\n4\n")
+
+    assert list(read_keys(stream, convert=int)) == [1, 2, 3, 4]
+    assert list(chunks(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+
+def test_fetch_concurrently():
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def fetch(key):
+        with lock:
+            active.append(key)
+            peak.append(len(active))
+        time.sleep(0.01)
+        with lock:
+            active.remove(key)
+        if key == 3:
+            raise ValueError("boom")
+        return key * 10
+
+    results = list(fetch_concurrently(fetch, iter(range(20)), workers=4))
+
+    assert sorted(key for key, _, _ in results) == list(range(20))
+    assert all(result == key * 10 for key, result, error in results if error is None)
+    assert [key for key, _, error in results if error is not None] == [3]
+    # requests were made concurrently
+    assert 1 < max(peak) <= 4
+
+    with pytest.raises(BGGValueError):
+        fetch_concurrently(fetch, [], workers=0)
+
+
+def test_fetch_concurrently_stops_early():
+    consumed = []
+
+    def keys():
+        for i in range(1000):
+            consumed.append(i)
+            yield i
+
+    results = fetch_concurrently(lambda key: key, keys(), workers=2)
+    next(results)
+    results.close()
+
+    time.sleep(0.3)
+    # the keys are consumed as they're needed, not all at once
+    assert len(consumed) < 100
@@ -109,3 +109,183 @@ def test_creating_collection_out_of_raw_data():
     with pytest.raises(BGGError):
         # raises exception on invalid game data
         c.add_game({"bla": "bla"})
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_collection_columns(bgg, mocker, use_numpy):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        # force the pure Python implementation
+        mocker.patch("boardgamegeek.objects.columnar._numpy", False)
+
+    collection = bgg.collection(TEST_VALID_USER, versions=True)
+    columns = collection.columns()
+
+    assert len(columns) == len(collection)
+    assert list(columns.id) == [g.id for g in collection]
+    assert columns.name == [g.name for g in collection]
+
+    owned = columns.where(owned=True)
+    assert [g.id for g in owned.items] == [g.id for g in collection if g.owned]
+
+    for_three = columns.where(players=3, max_playing_time=60)
+    assert [g.id for g in for_three.items] == [g.id for g in collection
+                                               if g.min_players <= 3 <= g.max_players and g.playing_time <= 60]
+
+    most_played = columns.sort_by("numplays", descending=True)
+    assert list(most_played.numplays) == sorted([g.numplays for g in collection], reverse=True)
+
+    by_name = columns.sort_by("name")
+    assert by_name.name == sorted(g.name for g in collection)
+
+    ranked = columns.where(max_bgg_rank=1000).sort_by("bgg_rank")
+    assert list(ranked.bgg_rank) == sorted(g.bgg_rank for g in collection if g.bgg_rank and g.bgg_rank <= 1000)
+
+    with pytest.raises(BGGValueError):
+        columns.where(voodoo=True)
+
+    with pytest.raises(BGGValueError):
+        columns.sort_by("voodoo")
+
+
+def test_collection_columns_are_kept_up_to_date():
+    c = Collection({"owner": "me"})
+    columns = c.columns()
+
+    c.add_game({"id": 100, "name": "foobar", "rating": 7.5, "own": "1", "stats": {}})
+    c.add_game({"id": 101, "name": "barfoo", "stats": {}})
+
+    assert list(columns.id) == [100, 101]
+    assert columns.rating[0] == 7.5
+    assert columns.rating[1] != columns.rating[1]   # NaN
+    assert [g.id for g in columns.where(min_rating=7).items] == [100]
+    assert [g.id for g in columns.sort_by("rating", descending=True).items] == [100, 101]
+
+
+def test_collection_columns_add_game_while_exported():
+    np = pytest.importorskip("numpy")
+
+    c = Collection({"owner": "me"})
+    c.add_game({"id": 100, "name": "foobar", "numplays": 2, "stats": {}})
+
+    # only the last column is exported: the other columns get rolled back
+    columns = c.columns()
+    wishlist = np.frombuffer(columns.wishlist, dtype=np.int8)
+    with pytest.raises(BufferError):
+        columns.append(CollectionBoardGame({"id": 101, "name": "barfoo", "stats": {}}))
+    assert len(columns.id) == 1 and len(columns.name) == 1 and len(columns.items) == 1
+    del wishlist
+
+    # the game is added anyway, the exported views are left alone and the columns get rebuilt
+    arrays = columns.to_numpy()
+    c.add_game({"id": 101, "name": "barfoo", "numplays": 3, "stats": {}})
+    assert len(c) == 2
+    assert list(arrays["id"]) == [100]
+
+    columns = c.columns()
+    assert list(columns.id) == [100, 101]
+    assert [g.id for g in columns.items] == [100, 101]
+    assert columns.to_numpy()["numplays"].sum() == 5
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_collection_columns_conditions_exclude_missing_values(mocker, use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        mocker.patch("boardgamegeek.objects.columnar._numpy", False)
+
+    c = Collection({"owner": "me"})
+    c.add_game({"id": 100, "name": "complete", "yearpublished": 1995, "numplays": 3, "rating": 8,
+                "minplayers": 2, "maxplayers": 4, "playingtime": 20,
+                "stats": {"average": 7.1, "ranks": [{"id": "1", "type": "subtype", "name": "boardgame",
+                                                     "friendlyname": "Board Game Rank", "value": "50"}]}})
+    c.add_game({"id": 101, "name": "missing", "stats": {}})
+    columns = c.columns()
+
+    for condition in [{"min_rating": 1}, {"max_rating": 10}, {"min_average": 1}, {"max_bgg_rank": 100},
+                      {"min_plays": 1}, {"players": 3}, {"max_playing_time": 30}, {"min_year": 1900},
+                      {"max_year": 2000}]:
+        assert [g.id for g in columns.where(**condition).items] == [100], condition
+
+    # no plays is 0 plays, not a missing value
+    assert [g.id for g in columns.where(max_plays=10).items] == [100, 101]
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_collection_columns_sorting_and_filtering(mocker, use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        mocker.patch("boardgamegeek.objects.columnar._numpy", False)
+
+    c = Collection({"owner": "me"})
+    for game_id, name, year, rating in [(100, "b", 2001, 7), (101, "a", None, None), (102, "b", 1999, 9),
+                                        (103, "c", 2001, None), (104, "a", 1990, 7)]:
+        data = {"id": game_id, "name": name, "stats": {}}
+        if year is not None:
+            data["yearpublished"] = year
+        if rating is not None:
+            data["rating"] = rating
+        c.add_game(data)
+    columns = c.columns()
+
+    def ids(view):
+        return [g.id for g in view.items]
+
+    # stable in both directions, missing values last
+    assert ids(columns.sort_by("name")) == [101, 104, 100, 102, 103]
+    assert ids(columns.sort_by("name", descending=True)) == [103, 100, 102, 101, 104]
+    assert ids(columns.sort_by("year")) == [104, 102, 100, 103, 101]
+    assert ids(columns.sort_by("year", descending=True)) == [100, 103, 102, 104, 101]
+    assert ids(columns.sort_by("rating")) == [100, 104, 102, 101, 103]
+    assert ids(columns.sort_by("rating", descending=True)) == [102, 100, 104, 101, 103]
+
+    assert ids(columns.filter([True, False, False, True, True])) == [100, 103, 104]
+    assert ids(columns.filter([False] * 5)) == []
+
+
+def test_get_collection_in_lazy_mode(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    eager = bgg.collection(TEST_VALID_USER, versions=True)
+    collection = bgg.collection(TEST_VALID_USER, versions=True, lazy=True)
+
+    assert len(collection) == len(eager)
+    for lazy_item, item in zip(collection, eager):
+        assert lazy_item.lazy
+        assert lazy_item.id == item.id
+        assert lazy_item.name == item.name
+        assert lazy_item.rating == item.rating
+        assert lazy_item.owned == item.owned
+        assert lazy_item.lazy
+        assert lazy_item.data() == item.data()
+        assert not lazy_item.lazy
+
+
+def test_collection_lookup_by_id(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    collection = bgg.collection(TEST_VALID_USER, versions=True)
+    game = collection[0]
+
+    assert collection.get(game.id) is game
+    assert collection.get(str(game.id)) is game
+    assert game.id in collection
+    assert game in collection
+    assert -1 not in collection
+    assert collection.get("invalid") is None
+
+    # joins between collections are set operations
+    other = bgg.collection(TEST_VALID_USER, versions=True)
+    assert set(collection) == set(other)
+
+    # duplicates are still ignored
+    collection.add_game({"id": game.id, "name": "duplicate", "stats": {}})
+    assert collection.get(game.id) is game
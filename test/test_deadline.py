@@ -0,0 +1,100 @@
+import time
+
+import pytest
+
+from _common import *
+from _server import BGGStandIn, TIMEOUT, synthetic_plays
+from boardgamegeek import BGGApiTimeoutError, BGGDeadlineError, BGGValueError, RetryPolicy
+from boardgamegeek.utils import Deadline
+
+
+@pytest.fixture
+def server():
+    with BGGStandIn(stall=5) as server:
+        yield server
+
+
+def client(server, **kwargs):
+    kwargs.setdefault("requests_per_minute", 6000)
+    return BGGClient(cache=CacheBackendNone(), api_endpoint=server.url, **kwargs)
+
+
+def test_deadline():
+    with pytest.raises(BGGValueError):
+        Deadline("soon")
+
+    deadline = Deadline(10)
+    assert Deadline.of(deadline) is deadline
+    assert Deadline.of(None) is None
+    assert 9 < Deadline.of(10).remaining() <= 10
+
+    deadline.check(5)
+    with pytest.raises(BGGDeadlineError):
+        deadline.check(11)
+    with pytest.raises(BGGDeadlineError):
+        Deadline(0).check()
+
+
+def test_plays_partial_results(server):
+    server.add_route("plays", synthetic_plays(1000))
+    server.latency = 0.1
+    bgg = client(server)
+
+    start = time.time()
+    with pytest.raises(BGGDeadlineError) as e:
+        bgg.plays(name=TEST_VALID_USER, deadline=0.35)
+    assert time.time() - start < 0.6
+
+    # the pages retrieved before the deadline expired
+    partial = e.value.partial
+    assert 0 < len(partial) < 1000 and len(partial) % 100 == 0
+    assert partial.plays_count == 1000
+    assert isinstance(e.value, BGGApiTimeoutError)
+
+    with pytest.raises(BGGDeadlineError):
+        for _ in bgg.iter_plays(name=TEST_VALID_USER, deadline=0.35):
+            pass
+
+    assert len(bgg.plays(name=TEST_VALID_USER, deadline=5)) == 1000
+
+
+def test_deadline_bounds_retries(server):
+    bgg = client(server, retry_policy=RetryPolicy(delay=1, jitter=0), timeout=15)
+
+    # no point in sleeping past the deadline
+    server.inject(202)
+    start = time.time()
+    with pytest.raises(BGGDeadlineError) as e:
+        bgg.game(game_id=TEST_GAME_ID, videos=True, versions=True, deadline=0.5)
+    assert time.time() - start < 0.3
+    assert e.value.partial is None
+
+    # the attempts time out at the deadline
+    server.inject(TIMEOUT)
+    start = time.time()
+    with pytest.raises(BGGDeadlineError):
+        bgg.game(game_id=TEST_GAME_ID, videos=True, versions=True, deadline=0.5)
+    assert 0.4 < time.time() - start < 1.5
+
+
+def test_deadline_bounds_rate_limiter_wait(server):
+    bgg = client(server, requests_per_minute=30)
+
+    bgg.game(game_id=TEST_GAME_ID, videos=True, versions=True, deadline=1)
+
+    # the next request would have to wait 2s for the rate limiter
+    start = time.time()
+    with pytest.raises(BGGDeadlineError):
+        bgg.game(game_id=TEST_GAME_ID, videos=True, versions=True, deadline=1)
+    assert time.time() - start < 0.5
+    assert len(server.requests) == 1
+
+
+def test_shared_deadline(server):
+    server.latency = 0.2
+    bgg = client(server)
+    deadline = Deadline(0.3)
+
+    bgg.game(game_id=TEST_GAME_ID, videos=True, versions=True, deadline=deadline)
+    with pytest.raises(BGGDeadlineError):
+        bgg.game(game_id=TEST_GAME_ID_2, videos=True, versions=True, deadline=deadline)
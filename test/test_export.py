@@ -0,0 +1,126 @@
+import datetime
+import importlib
+import os
+import shutil
+import tempfile
+import pytest
+
+from _common import *
+from boardgamegeek import BGGValueError
+from boardgamegeek.export import rows
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from boardgamegeek.export import export_games, export_collections, export_plays, record_batches, schema, \
+    ArrowExporter, FORMAT_ARROW
+
+
+@pytest.fixture
+def directory():
+    path = tempfile.mkdtemp()
+    yield path
+    shutil.rmtree(path)
+
+
+def test_export_schemas_are_stable():
+    for table, columns in rows.TABLES.items():
+        assert schema(table).names == [name for name, _ in columns]
+
+    assert schema("plays").field("date").type == pa.date32()
+    assert schema("games").field("rating_average").type == pa.float64()
+
+    with pytest.raises(BGGValueError):
+        schema("fubar")
+
+
+def test_export_games(bgg, mocker, directory):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    games = bgg.game_list([TEST_GAME_ID, TEST_GAME_ID_2], videos=True, versions=True)
+
+    counts = export_games(iter(games), directory, batch_size=2)
+
+    table = pq.read_table(os.path.join(directory, "games.parquet"))
+    assert table.schema.equals(schema("games"))
+    assert table.column("id").to_pylist() == [TEST_GAME_ID, TEST_GAME_ID_2]
+    assert table.column("bgg_rank").to_pylist() == [g.bgg_rank for g in games]
+    assert counts["games"] == 2
+
+    links = pq.read_table(os.path.join(directory, "game_links.parquet")).to_pydict()
+    assert len(links["game_id"]) == counts["game_links"]
+    mechanics = [v for g, t, v in zip(links["game_id"], links["type"], links["value"])
+                 if g == TEST_GAME_ID and t == "mechanic"]
+    assert mechanics == list(games[0].mechanics)
+
+    ranks = pq.read_table(os.path.join(directory, "ranks.parquet")).to_pydict()
+    assert len(ranks["game_id"]) == sum(len(g.ranks) for g in games)
+
+
+def test_export_collections_and_plays(bgg, mocker, directory):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    collection = bgg.collection(TEST_VALID_USER, versions=True)
+    export_collections([collection], directory, format=FORMAT_ARROW)
+
+    with pa.ipc.open_file(os.path.join(directory, "collection_items.arrow")) as reader:
+        items = reader.read_all().to_pydict()
+    assert items["game_id"] == [g.id for g in collection]
+    assert items["owned"] == [g.owned for g in collection]
+    assert set(items["owner"]) == {TEST_VALID_USER}
+
+    plays = bgg.plays(name=TEST_VALID_USER)
+    counts = export_plays(plays, directory, batch_size=5)
+
+    table = pq.read_table(os.path.join(directory, "plays.parquet"))
+    assert table.num_rows == counts["plays"] == len(plays)
+    assert table.column("date").to_pylist() == [p.date.date() for p in plays]
+
+    players = pq.read_table(os.path.join(directory, "play_players.parquet"))
+    assert players.num_rows == counts["play_players"] == sum(len(p.players) for p in plays)
+
+
+def test_record_batches():
+    data = [(i, 1, 2, "game", datetime.date(2016, 1, 7), 1, 30, False, False, None, None) for i in range(7)]
+
+    batches = list(record_batches("plays", iter(data), batch_size=3))
+    assert [b.num_rows for b in batches] == [3, 3, 1]
+    assert batches[0].schema.equals(schema("plays"))
+
+    with pytest.raises(BGGValueError):
+        list(record_batches("plays", data, batch_size=0))
+
+
+def test_exporter_writes_empty_tables(directory):
+    with ArrowExporter(directory, ["plays"]) as exporter:
+        with pytest.raises(BGGValueError):
+            exporter.write_rows("games", [])
+
+    assert pq.read_table(exporter.path("plays")).num_rows == 0
+
+    with pytest.raises(BGGValueError):
+        exporter.write_rows("plays", [])
+
+    with pytest.raises(BGGValueError):
+        ArrowExporter(directory, ["plays"], format="csv")
+
+
+def test_export_throughput_benchmark():
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "benchmarks")
+    sys.path.insert(0, path)
+    try:
+        bench = importlib.import_module("bench_export")
+        small = bench.bench_export(games=5, plays=200, batch_size=50)
+        large = bench.bench_export(games=5, plays=2000, batch_size=50)
+    finally:
+        sys.path.remove(path)
+
+    assert small["plays"]["rows"]["plays"] == 200
+    assert small["plays"]["rows"]["play_players"] == 600
+    assert small["plays"]["rows_per_second"] > 0
+    assert small["games"]["rows"]["games"] == 5
+
+    # memory is bounded by the batch size, not by the number of exported entities
+    assert large["plays"]["peak_bytes"] < 2 * small["plays"]["peak_bytes"]
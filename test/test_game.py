@@ -1,13 +1,15 @@
 # coding: utf-8
 import datetime
 import mock
+import pickle
 import requests
 import pytest
 import sys
 import time
 
 from _common import *
-from boardgamegeek import BGGError, BGGItemNotFoundError, BGGValueError
+from boardgamegeek import BGGError, BGGApiError, BGGItemNotFoundError, BGGValueError
+from boardgamegeek.loaders.game import create_game_from_xml
 from boardgamegeek.objects.games import BoardGameVideo, BoardGameVersion, BoardGameRank
 from boardgamegeek.objects.games import PlayerSuggestion
 
@@ -231,3 +233,114 @@ def test_get_accessory(bgg, mocker):
 
     assert game.id == TEST_GAME_ACCESSORY_ID
     assert game.accessory
+
+
+def test_game_sub_objects_are_created_on_first_access(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    game = bgg.game(None, game_id=TEST_GAME_ID, videos=True, versions=True)
+
+    assert game._versions is None
+    assert game._videos is None
+    assert game._expansions is None
+    assert game._player_suggestion is None
+    assert game._comments is None
+    assert game._stats is None
+
+    # the rank doesn't need the rank objects
+    assert game.bgg_rank is not None
+    assert game._stats._ranks is None
+
+    # once created, the objects are kept
+    assert game.versions is game.versions
+    assert game.videos is game.videos
+    assert game.ranks is game.ranks
+    assert game.player_suggestions is game.player_suggestions
+
+    # expansions added before the list was created are kept unique
+    count = len(game.expansions)
+    assert count
+    game.add_expansion(dict(game.data()["expansions"][0]))
+    game.add_expansion({"id": "999999999", "name": "new one"})
+    assert len(game.expansions) == count + 1
+
+    # comments added before being accessed aren't lost
+    game.add_comment({"username": "someone", "rating": "5", "comment": "lazy"})
+    assert game.comments[-1].username == "someone"
+    assert "comments" in game.data()
+
+
+def test_get_game_in_lazy_mode(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    eager = bgg.game(None, game_id=TEST_GAME_ID, videos=True, versions=True)
+    game = bgg.game(None, game_id=TEST_GAME_ID, videos=True, versions=True, lazy=True)
+
+    assert game.lazy
+    assert not eager.lazy
+
+    # values are decoded when accessed and kept afterwards
+    assert not dict.__contains__(game._data, "mechanics")
+    assert game.mechanics == eager.mechanics
+    assert dict.__contains__(game._data, "mechanics")
+    assert game.bgg_rank == eager.bgg_rank
+    assert game.rating_average_weight == eager.rating_average_weight
+    assert game.lazy
+
+    check_game(game)
+
+    # materializing detaches the game from the XML response
+    assert game.materialize() is game
+    assert not game.lazy
+    assert type(game._data) == dict
+    assert game.data() == eager.data()
+
+
+def test_get_game_list_in_lazy_mode(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    game_list = bgg.game_list(game_id_list=[TEST_GAME_ID, TEST_GAME_ID_2], videos=True, versions=True, lazy=True)
+    assert all(game.lazy for game in game_list)
+    check_game(game_list[0])
+
+    # pickled games are detached too
+    game = pickle.loads(pickle.dumps(game_list[1]))
+    assert not game.lazy
+    assert game.name == game_list[1].name
+
+
+def test_games_share_categorical_values(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    game = bgg.game(None, game_id=TEST_GAME_ID, videos=True, versions=True)
+    again = bgg.game(None, game_id=TEST_GAME_ID, videos=True, versions=True, lazy=True)
+
+    # the names are shared, the lists are each game's own
+    assert type(game.mechanics) == list
+    assert again.mechanics == game.mechanics and again.mechanics is not game.mechanics
+    assert all(a is b for a, b in zip(again.mechanics, game.mechanics))
+    assert again.designers[0] is game.designers[0]
+    assert again.ranks[0].name is game.ranks[0].name
+    assert again.versions[0].language is game.versions[0].language
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_malformed_game_xml_isnt_hidden(lazy):
+    xml = ET.fromstring("""<item type="boardgame" id="1">
+                               <name type="primary" value="Game"/>
+                               <statistics><ratings><ranks><rank name="boardgame" value="10"/></ranks></ratings></statistics>
+                           </item>""")
+
+    # a rank without an id is an error, not missing statistics
+    with pytest.raises(BGGApiError):
+        create_game_from_xml(xml, 1, lazy=lazy).materialize()
+
+    # keys which aren't available are still left out
+    xml = ET.fromstring('<item type="boardgame" id="2"><statistics><ratings/></statistics></item>')
+    game = create_game_from_xml(xml, 2, lazy=lazy).materialize()
+    assert "videos" not in game.data() and "versions" not in game.data()
+    assert game.videos == [] and game.versions == []
@@ -55,3 +55,18 @@ def test_hot_items_initial_data():
     assert h[0].id == 100
     assert h[0].name == "hotitem"
     assert h[0].rank == 10
+
+
+def test_hot_items_lookup_by_id():
+    h = HotItems({"items": [{"id": 100, "name": "hotitem", "rank": 1},
+                            {"id": 200, "name": "other", "rank": 2}]})
+
+    assert h.get(200).rank == 2
+    assert h.get("100").name == "hotitem"
+    assert h.get(300) is None
+    assert h.get(None) is None
+    assert HotItem({"id": 100, "name": "hotitem", "rank": 1}) in h
+    assert 300 not in h
+
+    h.add_hot_item({"id": 300, "name": "new", "rank": 3})
+    assert 300 in h
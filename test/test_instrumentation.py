@@ -0,0 +1,83 @@
+import pytest
+
+from _common import *
+from _server import BGGStandIn
+from boardgamegeek import BGGApiError, CacheBackendMemory
+
+
+@pytest.fixture
+def server():
+    with BGGStandIn() as server:
+        yield server
+
+
+def test_request_events(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    events = []
+    bgg.add_request_hook(events.append)
+
+    bgg.plays(name=TEST_VALID_USER)
+    game = bgg.game(game_id=TEST_GAME_ID, videos=True, versions=True)
+
+    assert [e.endpoint for e in events] == ["plays", "plays", "thing"]
+    assert events[1].params["page"] == 2
+
+    event = events[-1]
+    assert event.params["id"] == TEST_GAME_ID
+    assert event.status == 200
+    assert event.attempts == 1 and event.retries == 0
+    assert event.bytes > 10000
+    assert event.parse_time > 0
+    assert event.load_time > 0
+    assert event.error is None
+    assert not event.from_cache
+    assert event.total_time >= event.parse_time + event.load_time
+
+    # hooks failing don't affect the requests
+    bgg.add_request_hook(lambda e: 1 / 0)
+    assert bgg.game(game_id=TEST_GAME_ID, videos=True, versions=True).id == game.id
+
+    bgg.remove_request_hook(events.append)
+    bgg.user(TEST_VALID_USER)
+    assert len(events) == 4
+
+
+def test_retries_and_rate_limiter_wait(server):
+    bgg = BGGClient(cache=CacheBackendNone(), api_endpoint=server.url, retries=2, retry_delay=0.05,
+                    requests_per_minute=600)
+    events = []
+    bgg.add_request_hook(events.append)
+
+    server.inject(202)
+    bgg.game(game_id=TEST_GAME_ID, videos=True, versions=True)
+    bgg.game(game_id=TEST_GAME_ID, videos=True, versions=True)
+
+    assert events[0].statuses == [202, 200]
+    assert events[0].retries == 1
+    assert events[0].retry_wait == pytest.approx(0.05)
+    assert events[0].network_time > 0
+
+    # the second request had to wait for the rate limiter (a request every 0.1s)
+    assert events[1].attempts == 1
+    assert events[1].rate_limit_wait > 0.03
+
+    server.inject(503, 503, 503)
+    with pytest.raises(BGGApiError):
+        bgg.game(game_id=TEST_GAME_ID, videos=True, versions=True)
+    assert events[2].statuses == [503, 503, 503]
+    assert isinstance(events[2].error, BGGApiError)
+    assert events[2].load_time == 0
+
+
+def test_cache_hits(server):
+    bgg = BGGClient(cache=CacheBackendMemory(ttl=60), api_endpoint=server.url, requests_per_minute=60000)
+    events = []
+    bgg.add_request_hook(events.append)
+
+    bgg.user(TEST_VALID_USER)
+    bgg.user(TEST_VALID_USER)
+
+    assert [e.from_cache for e in events] == [False, True]
+    assert len(server.requests) == 1
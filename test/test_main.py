@@ -0,0 +1,117 @@
+import io
+import json
+import pytest
+
+from _common import *
+from boardgamegeek import BGGApiTimeoutError
+from boardgamegeek.main import main, brief_game_stats
+
+
+@pytest.fixture(autouse=True)
+def cache_home(monkeypatch, tmpdir):
+    # the default on-disk cache goes to a temporary directory
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmpdir.join("cache")))
+    return tmpdir.join("cache")
+
+
+def test_main_ndjson_output(mocker, capsys):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    main(["--plays", TEST_VALID_USER, "--output", "ndjson", "--retries", "0"])
+
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 32
+    assert all(json.loads(line)["user_id"] for line in lines)
+
+    main(["--collection", TEST_VALID_USER, "-o", "ndjson"])
+    items = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert len(items) > 1
+    assert all("id" in item for item in items)
+
+
+def test_main_requires_an_action(capsys):
+    with pytest.raises(SystemExit):
+        main(["--output", "ndjson"])
+
+
+def test_brief_game_stats(bgg, mocker, capsys):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    game = bgg.game(game_id=TEST_GAME_ID, videos=True, versions=True)
+    brief_game_stats(game)
+
+    out = capsys.readouterr().out
+    assert out.startswith('"Agricola",2007,1-5,')
+
+
+def test_main_bulk_commands(mocker, capsys, monkeypatch, tmpdir):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    ids = tmpdir.join("ids.txt")
+    ids.write("# games\n{}, {}\n\nnot-an-id\n".format(TEST_GAME_ID, TEST_GAME_ID_2))
+
+    assert main(["-o", "ndjson", "games", "--ids-from", str(ids), "--chunk-size", "2", "--versions", "--videos"]) == 0
+    games = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert sorted(g["id"] for g in games) == sorted([TEST_GAME_ID, TEST_GAME_ID_2])
+
+    monkeypatch.setattr("sys.stdin", io.StringIO("{}\n{}\n".format(TEST_VALID_USER, TEST_INVALID_USER)))
+    # one of the users doesn't exist
+    assert main(["-o", "ndjson", "collections", "--users-from", "-", "--workers", "2"]) == 1
+    items = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert items
+    assert set(item["owner"] for item in items) == {TEST_VALID_USER}
+
+    users = tmpdir.join("users.txt")
+    users.write(TEST_VALID_USER)
+    assert main(["-o", "ndjson", "plays", "--users-from", str(users)]) == 0
+    plays = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert len(plays) == 32
+    assert set(play["username"] for play in plays) == {TEST_VALID_USER}
+
+
+def test_main_cache_options(mocker, capsys, caplog, cache_home, tmpdir):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    main(["--plays", TEST_VALID_USER, "-o", "ndjson"])
+    assert cache_home.join("boardgamegeek", "cache.sqlite").check()
+
+    path = tmpdir.join("other", "bgg.db")
+    with caplog.at_level(logging.DEBUG, logger="boardgamegeek"):
+        main(["--plays", TEST_VALID_USER, "-o", "ndjson", "--cache", str(path), "--cache-ttl", "60", "--debug"])
+    assert path.check()
+    assert "cache {}: ".format(path) in caplog.text
+
+    main(["--plays", TEST_VALID_USER, "-o", "ndjson", "--no-cache"])
+    assert len(capsys.readouterr().out.splitlines()) == 3 * 32
+
+
+def test_main_profile(mocker, capsys, tmpdir):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    path = tmpdir.join("plays.prof")
+    assert main(["--plays", TEST_VALID_USER, "--no-cache", "-o", "ndjson", "--profile",
+                 "--profile-output", str(path)]) == 0
+
+    captured = capsys.readouterr()
+    assert len(captured.out.splitlines()) == 32
+    assert "time by subsystem" in captured.err
+    assert "XML parse" in captured.err
+    assert "requests (all threads): 2" in captured.err
+    assert path.check()
+
+
+def test_main_profile_failed_run(mocker, capsys, tmpdir):
+    mocker.patch("boardgamegeek.main.run", side_effect=BGGApiTimeoutError("API call timed out"))
+
+    # the report and the statistics are kept for the runs which fail too
+    path = tmpdir.join("plays.prof")
+    with pytest.raises(BGGApiTimeoutError):
+        main(["--plays", TEST_VALID_USER, "--no-cache", "--profile", "--profile-output", str(path)])
+
+    assert "time by subsystem" in capsys.readouterr().err
+    assert path.check()
@@ -0,0 +1,84 @@
+import pytest
+import requests
+
+from _common import *
+from _server import BGGStandIn
+from boardgamegeek import CacheBackendMemory
+from boardgamegeek.metrics import ClientMetrics, Counter, Histogram, start_http_server, CONTENT_TYPE
+
+
+def test_metrics_exposition():
+    counter = Counter("things", "Things with \"quotes\"", ["kind"])
+    counter.inc(kind="a")
+    counter.inc(2.5, kind="b\n")
+    assert counter.exposition() == ("# TYPE things counter\n"
+                                    "# HELP things Things with \\\"quotes\\\"\n"
+                                    "things_total{kind=\"a\"} 1\n"
+                                    "things_total{kind=\"b\\n\"} 2.5")
+
+    with pytest.raises(ValueError):
+        counter.inc()
+
+    histogram = Histogram("duration_seconds", "Durations", buckets=[0.1, 1])
+    for value in [0.05, 0.5, 0.7, 5]:
+        histogram.observe(value)
+    assert histogram.count() == 4
+    assert list(histogram.samples()) == ["duration_seconds_bucket{le=\"0.1\"} 1",
+                                         "duration_seconds_bucket{le=\"1.0\"} 3",
+                                         "duration_seconds_bucket{le=\"+Inf\"} 4",
+                                         "duration_seconds_count 4",
+                                         "duration_seconds_sum 6.25"]
+
+
+def test_client_metrics(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    metrics = ClientMetrics().attach(bgg)
+    bgg.plays(name=TEST_VALID_USER)
+    bgg.game(game_id=TEST_GAME_ID, videos=True, versions=True)
+
+    assert metrics.requests.value(endpoint="plays", status="200") == 2
+    assert metrics.requests.value(endpoint="thing", status="200") == 1
+    assert metrics.duration.count(endpoint="plays") == 2
+    assert metrics.response_bytes.value(endpoint="thing") > 10000
+    assert metrics.elements.value(endpoint="plays") > 32
+    assert metrics.cache_hit_ratio.value() == 0
+    assert metrics.elements_per_second.value() > 0
+
+    text = metrics.exposition()
+    assert text.endswith("\n# EOF\n")
+    assert "# TYPE bgg_request_duration_seconds histogram" in text
+    assert "bgg_requests_total{endpoint=\"plays\",status=\"200\"} 2" in text
+    assert "bgg_request_duration_seconds_count{endpoint=\"thing\"} 1" in text
+
+    metrics.detach(bgg)
+    bgg.user(TEST_VALID_USER)
+    assert "user" not in metrics.exposition()
+
+
+def test_client_metrics_served():
+    metrics = ClientMetrics()
+    server = start_http_server(metrics, port=0, addr="127.0.0.1")
+    try:
+        with BGGStandIn() as stand_in:
+            bgg = BGGClient(cache=CacheBackendMemory(ttl=60), api_endpoint=stand_in.url, retries=2, retry_delay=0.01,
+                            requests_per_minute=60000)
+            metrics.attach(bgg)
+
+            stand_in.inject(202, 503)
+            bgg.user(TEST_VALID_USER)
+            bgg.user(TEST_VALID_USER)
+
+        assert metrics.attempts.value(endpoint="user", status="202") == 1
+        assert metrics.attempts.value(endpoint="user", status="503") == 1
+        assert metrics.retry_wait.value(endpoint="user") > 0
+        assert metrics.cache_hit_ratio.value() == 0.5
+
+        r = requests.get("http://127.0.0.1:{}/metrics".format(server.server_address[1]))
+        assert r.headers["content-type"] == CONTENT_TYPE
+        assert "bgg_cache_requests_total{endpoint=\"user\",result=\"hit\"} 1" in r.text
+        assert "bgg_request_attempts_total{endpoint=\"user\",status=\"202\"} 1" in r.text
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -1,10 +1,13 @@
+import importlib
 import os
 import tempfile
 import time
 import pytest
+import requests
 
 from _common import *
 from boardgamegeek import BGGValueError, CacheBackendNone, CacheBackendSqlite
+from boardgamegeek.cache import default_cache_path
 
 
 #
@@ -53,6 +56,45 @@ def test_sqlite_caching(mocker):
     os.unlink(name)
 
 
+class FakeAdapter(requests.adapters.BaseAdapter):
+    # answers every request without going to the network
+    def send(self, request, **kwargs):
+        response = requests.models.Response()
+        response.status_code = 200
+        response._content = b"<items></items>"
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+def test_cache_stats_and_default_path(monkeypatch, tmpdir):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmpdir))
+    path = default_cache_path()
+    assert path == os.path.join(str(tmpdir), "boardgamegeek", "cache.sqlite")
+
+    # the directory is created if needed, the database when the cache is first used
+    cache = CacheBackendSqlite(path, ttl=1000)
+    assert os.path.isdir(os.path.dirname(path))
+
+    cache.cache.mount("https://", FakeAdapter())
+    for _ in range(3):
+        cache.cache.get("https://boardgamegeek.com/xmlapi2/thing", params={"id": 1})
+    cache.cache.get("https://boardgamegeek.com/xmlapi2/thing", params={"id": 2})
+
+    assert (cache.stats.hits, cache.stats.misses) == (2, 2)
+    assert cache.stats.hit_ratio == 0.5
+    assert "2 cache hits" in str(cache.stats)
+    assert os.path.isfile(path)
+
+    uncached = CacheBackendNone()
+    uncached.cache.mount("https://", FakeAdapter())
+    uncached.cache.get("https://boardgamegeek.com/xmlapi2/thing")
+    assert (uncached.stats.hits, uncached.stats.misses) == (0, 1)
+
+
 def test_invalid_parameter_values_for_bggclient():
     with pytest.raises(BGGValueError):
         BGGClient(retries="asd")
@@ -62,3 +104,18 @@ def test_invalid_parameter_values_for_bggclient():
 
     with pytest.raises(BGGValueError):
         BGGClient(timeout="asd")
+
+
+def test_import_is_lazy():
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "benchmarks")
+    sys.path.insert(0, path)
+    try:
+        bench = importlib.import_module("bench_import")
+        result = bench.bench_import(runs=1)
+    finally:
+        sys.path.remove(path)
+
+    # requests_cache, pkg_resources, the loaders and the optional dependencies aren't imported by
+    # "import boardgamegeek", only when they're used
+    assert result["deferred_modules_imported"] == []
+    assert result["median_seconds"] > 0
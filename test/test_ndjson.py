@@ -0,0 +1,68 @@
+import io
+import json
+import pytest
+
+from _common import *
+from boardgamegeek import BGGValueError
+from boardgamegeek.export import ndjson
+
+
+def test_ndjson_plays_are_written_one_per_line(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    plays = bgg.plays(name=TEST_VALID_USER)
+
+    stream = io.StringIO()
+    assert ndjson.write(plays, stream) == len(plays)
+
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == len(plays)
+
+    first = json.loads(lines[0])
+    assert first["id"] == plays[0].id
+    assert first["user_id"] == plays.user_id
+    assert first["date"] == plays[0].date.isoformat()
+    assert len(first["players"]) == len(plays[0].players)
+
+
+def test_ndjson_entities(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    game = bgg.game(game_id=TEST_GAME_ID, videos=True, versions=True, lazy=True)
+    data = json.loads(ndjson.dumps(game))
+    assert data["id"] == TEST_GAME_ID
+    assert data["mechanics"] == list(game.mechanics)
+
+    collection = bgg.collection(TEST_VALID_USER, versions=True)
+    lines = list(ndjson.iter_lines([collection, bgg.user(TEST_VALID_USER), bgg.guild(TEST_GUILD_ID)]))
+    assert len(lines) == len(collection) + 2
+    assert all(line.endswith("\n") and "\n" not in line[:-1] for line in lines)
+    assert [json.loads(line)["id"] for line in lines[:len(collection)]] == [g.id for g in collection]
+    assert json.loads(lines[-2])["name"] == TEST_VALID_USER
+    assert json.loads(lines[-1])["id"] == TEST_GUILD_ID
+
+
+def test_iter_plays_streams_page_by_page(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    # parameters are validated right away
+    with pytest.raises(BGGValueError):
+        bgg.iter_plays()
+
+    plays = bgg.iter_plays(name=TEST_VALID_USER)
+    assert mock_get.call_count == 0
+
+    first = next(plays)
+    assert mock_get.call_count == 1
+
+    rest = list(plays)
+    assert mock_get.call_count > 1
+    assert [first.id] + [p.id for p in rest] == [p.id for p in bgg.plays(name=TEST_VALID_USER)]
+
+    progress = []
+    list(bgg.iter_plays(game_id=TEST_GAME_ID_2, progress=lambda current, total: progress.append(current)))
+    assert progress == sorted(progress)
+    assert progress[-1] == len(bgg.plays(game_id=TEST_GAME_ID_2))
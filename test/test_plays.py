@@ -1,4 +1,5 @@
 import datetime
+import pickle
 import time
 import pytest
 
@@ -143,3 +144,131 @@ def test_create_plays_with_initial_data():
     p = Plays({"plays": [{"id": 10, "user_id": 102, "date": now}]})
 
     assert p[0].date == now
+
+
+def test_play_sessions_are_slotted():
+    p = Plays({"plays": [{"id": 10, "user_id": 102, "date": "2014-01-02", "location": "home",
+                          "players": [{"username": "foo", "score": "10", "location": "home"}]}]})
+
+    # no per-instance dictionary, the data is kept in slots
+    assert not hasattr(p[0], "__dict__")
+    assert not hasattr(p[0].players[0], "__dict__")
+
+    assert p[0].location == "home"
+    assert p[0].players[0].username == "foo"
+    assert p[0].players[0].location == "home"
+    assert p[0].data()["players"][0]["score"] == "10"
+
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        unpickled = pickle.loads(pickle.dumps(p[0], protocol))
+        assert unpickled.data() == p[0].data()
+
+
+def test_plays_columns(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    plays = bgg.plays(game_id=TEST_GAME_ID_2)
+    columns = plays.columns()
+
+    assert len(columns) == len(plays)
+    assert list(columns.id) == [p.id for p in plays]
+    assert list(columns.game_id) == [TEST_GAME_ID_2] * len(plays)
+    assert list(columns.player_play_id) == [p.id for p in plays for _ in p.players]
+
+    # the view is kept up to date
+    plays.add_play({"id": 1, "date": "2014-01-02", "quantity": 2, "game_id": TEST_GAME_ID_2,
+                    "players": [{"username": "foo", "win": "1", "score": "12"}]})
+    assert len(columns) == len(plays)
+    assert columns.quantity[-1] == 2
+    assert columns.player_win[-1] == 1
+    assert columns.player_score[-1] == 12.0
+
+
+def test_plays_columns_numpy_export():
+    np = pytest.importorskip("numpy")
+
+    p = Plays({"plays": [{"id": 10, "user_id": 102, "date": "2014-01-02", "quantity": 1, "duration": 30,
+                          "players": [{"username": "foo", "win": "1", "score": "n/a"}]},
+                         {"id": 11, "user_id": 102, "date": None, "quantity": 3, "duration": 45}]})
+
+    columns = p.columns()
+    arrays = columns.to_numpy()
+
+    # zero-copy views
+    assert np.shares_memory(arrays["duration"], np.frombuffer(columns.duration, dtype=np.int64))
+    assert arrays["duration"].sum() == 75
+    assert arrays["date"][0] == np.datetime64("2014-01-02")
+    assert np.isnat(arrays["date"][1])
+
+    players = columns.players_to_numpy()
+    assert list(players["player_play_id"]) == [10]
+    assert np.isnan(players["player_score"][0])
+    assert list(players["player_username"]) == ["foo"]
+
+
+def test_plays_columns_add_play_while_exported():
+    np = pytest.importorskip("numpy")
+
+    p = GamePlays({"game_id": 1, "plays": [{"id": 10, "duration": 30, "players": [{"username": "foo"}]}]})
+
+    # only the players table is exported: the play columns get rolled back
+    columns = p.columns()
+    players = columns.players_to_numpy()
+    with pytest.raises(BufferError):
+        columns.append(PlaySession({"id": 11, "players": [{"username": "bar"}]}))
+    assert len(columns.id) == 1 and len(columns.player_username) == 1
+
+    # the play is added anyway, the exported views are left alone and the columns get rebuilt
+    arrays = columns.to_numpy()
+    p.add_play({"id": 11, "duration": 45, "players": [{"username": "bar"}]})
+    assert len(p) == 2
+    assert list(arrays["id"]) == [10]
+    assert list(players["player_play_id"]) == [10]
+
+    columns = p.columns()
+    assert list(columns.id) == [10, 11]
+    assert list(columns.player_play_id) == [10, 11]
+    assert columns.to_numpy()["duration"].sum() == 75
+
+
+def test_plays_columns_arrow_export():
+    pytest.importorskip("pyarrow")
+
+    p = Plays({"plays": [{"id": 10, "user_id": 102, "date": "2014-01-02", "players": [{"username": "foo"}]},
+                         {"id": 11, "user_id": 102}]})
+
+    table = p.columns().to_arrow()
+    assert table.num_rows == 2
+    assert table.column("date").to_pylist() == [datetime.date(2014, 1, 2), None]
+
+    players = p.columns().players_to_arrow()
+    assert players.column("player_username").to_pylist() == ["foo"]
+
+
+def test_plays_lookup_by_id_and_game(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    plays = bgg.plays(name=TEST_VALID_USER)
+
+    play = plays[3]
+    assert plays.get(play.id) is play
+    assert plays.get(str(play.id)) is play
+    assert play.id in plays
+    assert play in plays
+    assert plays.get(-1) is None
+    assert plays.get("invalid") is None
+
+    for game_id in plays.game_ids:
+        assert plays.by_game(game_id) == [p for p in plays if p.game_id == game_id]
+    assert plays.by_game(-1) == []
+
+    # the indexes are kept up to date
+    plays.add_play({"id": 1, "date": "2014-01-02", "game_id": TEST_GAME_ID_2})
+    assert plays.get(1).game_id == TEST_GAME_ID_2
+    assert plays.by_game(TEST_GAME_ID_2)[-1] is plays.get(1)
+
+    p = Plays({"plays": [{"id": 10, "user_id": 102, "date": "2014-01-02", "game_id": 5}]})
+    assert p.get(10) is p[0]
+    assert p.by_game(5) == [p[0]]
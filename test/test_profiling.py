@@ -0,0 +1,51 @@
+import io
+import os
+import pstats
+
+from _common import *
+import boardgamegeek.utils
+from boardgamegeek.profiling import Profiler, classify, SUBSYSTEMS, NETWORK, RATE_LIMIT_SLEEP, RETRY_SLEEP, XML_PARSE
+from boardgamegeek.profiling import LOADERS, OBJECTS, OTHER
+
+
+def test_classify():
+    package = os.path.dirname(os.path.abspath(boardgamegeek.utils.__file__))
+    sleep = ("~", 0, "<built-in method time.sleep>")
+
+    assert classify(sleep, (os.path.join(package, "utils.py"), 80, "send")) == RATE_LIMIT_SLEEP
+    assert classify(sleep, (os.path.join(package, "utils.py"), 640, "_sleep")) == RETRY_SLEEP
+    assert classify(("~", 0, "<method 'recv_into' of '_socket.socket' objects>")) == NETWORK
+    assert classify(("~", 0, "<method 'feed' of 'xml.etree.ElementTree.XMLParser' objects>")) == XML_PARSE
+    assert classify((os.path.join(package, "loaders", "game.py"), 10, "create_game_from_xml")) == LOADERS
+    assert classify((os.path.join(package, "objects", "games.py"), 10, "__init__")) == OBJECTS
+    assert classify(("/usr/lib/python3/json/encoder.py", 10, "encode")) == OTHER
+
+
+def test_profiler(bgg, mocker, tmpdir):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    profiler = Profiler().attach(bgg)
+    plays = profiler.run(bgg.plays, name=TEST_VALID_USER)
+    assert len(plays) == 32
+
+    subsystems = profiler.subsystems()
+    assert set(subsystems) == set(SUBSYSTEMS)
+    assert subsystems[XML_PARSE] > 0
+    assert subsystems[LOADERS] > 0
+    assert subsystems[OBJECTS] > 0
+
+    summary = profiler.requests_summary()
+    assert summary["requests"] == 2
+    assert summary["parse"] > 0 and summary["load"] > 0
+
+    out = io.StringIO()
+    profiler.report(out, top=5)
+    report = out.getvalue()
+    assert "time by subsystem" in report
+    assert "requests (all threads): 2 (0 from the cache, 0 retried, 0 failed)" in report
+    assert len(report.split("hot functions (own time):\n")[1].splitlines()) == 5
+
+    path = str(tmpdir.join("plays.prof"))
+    profiler.dump(path)
+    assert pstats.Stats(path).total_calls > 0
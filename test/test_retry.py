@@ -0,0 +1,132 @@
+import random
+
+import pytest
+
+from _common import *
+from _server import BGGStandIn, TIMEOUT as STALL
+from boardgamegeek import BGGApiError, BGGApiRetryError, BGGApiTimeoutError, BGGValueError, RetryPolicy, RetryBudget
+from boardgamegeek.retry import ACCEPTED, THROTTLED, TIMEOUT
+
+
+def test_backoff_and_jitter():
+    policy = RetryPolicy(delay=1, multiplier=2, max_delay=5, jitter=0)
+    assert [policy.delay(ACCEPTED, retry) for retry in range(1, 6)] == [1, 2, 4, 5, 5]
+
+    policy = RetryPolicy(delay={THROTTLED: 10}, multiplier=3, max_delay=None, jitter=0.5, random=random.Random(1))
+    for retry in range(1, 4):
+        delays = [policy.delay(THROTTLED, retry) for _ in range(100)]
+        assert all(5 * 3 ** (retry - 1) <= d <= 10 * 3 ** (retry - 1) for d in delays)
+        assert len(set(delays)) > 1
+
+    # the same seed gives the same delays
+    delays = [RetryPolicy(jitter=1, random=random.Random(7)).delay(TIMEOUT, 1) for _ in range(2)]
+    assert delays[0] == delays[1]
+
+    with pytest.raises(BGGValueError):
+        RetryPolicy(jitter=2)
+
+    with pytest.raises(BGGValueError):
+        RetryPolicy(retries={404: 1})
+
+
+def test_retry_limits():
+    policy = RetryPolicy(retries={ACCEPTED: 3, THROTTLED: 1, TIMEOUT: 2}, delay=0.5, multiplier=2, jitter=0,
+                         timeout_multiplier=2)
+
+    retry = policy.start(timeout=10)
+    assert [retry.retry(ACCEPTED) for _ in range(4)] == [0.5, 1, 2, None]
+    assert retry.reason == "failed to retrieve data after 3 retries"
+
+    retry = policy.start(timeout=10)
+    assert retry.retry(THROTTLED) == 0.5
+    assert retry.retry(THROTTLED) is None
+    # each error has its own limit
+    assert retry.retry(TIMEOUT) == 0.5
+    assert retry.timeout == 20
+
+    retry = RetryPolicy(total_retries=2, delay=0).start(timeout=10)
+    assert [retry.retry(error) for error in (ACCEPTED, TIMEOUT, THROTTLED)] == [0, 0, None]
+
+
+def test_time_budget():
+    retry = RetryPolicy(delay=1, multiplier=3, jitter=0, time_budget=2.5).start(timeout=10)
+    assert retry.retry(ACCEPTED) == 1
+    assert retry.retry(ACCEPTED) is None        # the request would end after more than 2.5s
+    assert retry.reason == "failed to retrieve data within 2.5s"
+
+
+def test_retry_budget():
+    budget = RetryBudget(ratio=0.5, min_retries=0)
+    policy = RetryPolicy(retries=10, delay=0, budget=budget)
+
+    retry = policy.start(timeout=10)
+    # 1 request: a retry may start while there were less than 0.5 retries
+    assert retry.retry(ACCEPTED) == 0
+    assert retry.retry(ACCEPTED) is None
+    assert retry.reason == "retry budget exhausted, not retrying"
+
+    for _ in range(3):
+        policy.start(timeout=10)
+    # 5 requests: less than 2.5 retries, one was made
+    retry = policy.start(timeout=10)
+    assert retry.retry(THROTTLED) == 0
+    assert retry.retry(THROTTLED) == 0
+    assert retry.retry(THROTTLED) is None
+
+    with pytest.raises(BGGValueError):
+        RetryBudget(window=0)
+
+
+def test_legacy_policy():
+    policy = RetryPolicy.legacy(retries=3, retry_delay=2)
+
+    retry = policy.start(timeout=4)
+    assert retry.retry(ACCEPTED) == 2
+    assert retry.retry(ACCEPTED) == 3
+    assert retry.retry(TIMEOUT) == 0
+    assert retry.timeout == 10
+    assert retry.retry(THROTTLED) is None
+
+    assert BGGClient(retries=1, retry_delay=3).retry_policy.total_retries == 1
+
+
+def test_retries_with_stand_in():
+    with BGGStandIn(stall=2) as server:
+        policy = RetryPolicy(retries={ACCEPTED: 2, THROTTLED: 1, TIMEOUT: 1}, delay=0.01, jitter=1,
+                             random=random.Random(0))
+        bgg = BGGClient(cache=CacheBackendNone(), api_endpoint=server.url, timeout=0.5, retry_policy=policy,
+                        requests_per_minute=6000)
+        assert bgg.retry_policy is policy
+
+        server.inject(202, 503, STALL, 202)
+        game = bgg.game(game_id=TEST_GAME_ID, videos=True, versions=True)
+        assert game.id == TEST_GAME_ID
+        assert server.statuses("thing") == [202, 503, STALL, 202, 200]
+
+        server.inject(202, 202, 202)
+        with pytest.raises(BGGApiRetryError):
+            bgg.game(game_id=TEST_GAME_ID, videos=True, versions=True)
+
+        server.inject(503, 503)
+        with pytest.raises(BGGApiError):
+            bgg.game(game_id=TEST_GAME_ID, videos=True, versions=True)
+
+        server.inject(STALL, STALL)
+        with pytest.raises(BGGApiTimeoutError):
+            bgg.game(game_id=TEST_GAME_ID, videos=True, versions=True)
+
+
+def test_retry_budget_with_stand_in():
+    with BGGStandIn() as server:
+        policy = RetryPolicy(retries=5, delay=0, budget=RetryBudget(ratio=0, min_retries=2))
+        bgg = BGGClient(cache=CacheBackendNone(), api_endpoint=server.url, retry_policy=policy,
+                        requests_per_minute=6000)
+
+        server.inject(*[503] * 10)
+        with pytest.raises(BGGApiError):
+            bgg.user(TEST_VALID_USER)
+        with pytest.raises(BGGApiError):
+            bgg.user(TEST_VALID_USER)
+
+        # the budget allowed 2 retries in all, not 5 for each request
+        assert server.statuses("user") == [503] * 4
@@ -0,0 +1,100 @@
+import gc
+import xml.etree.ElementTree as ET
+import pytest
+
+from _common import *
+import _synthetic
+from boardgamegeek.export import ndjson
+from boardgamegeek.loaders import create_collection_from_xml, add_collection_items_from_xml, create_game_from_xml
+
+tracemalloc = pytest.importorskip("tracemalloc")
+
+
+class SyntheticPlaysSession(object):
+    """
+    Serves the pages of a synthetic plays history
+    """
+    def __init__(self, count):
+        self.count = count
+
+    def get(self, url, params, timeout):
+        return MockResponse(_synthetic.text(_synthetic.plays(params["username"], self.count,
+                                                             page=params.get("page", 1))))
+
+
+class NullStream(object):
+    def write(self, data):
+        pass
+
+    def flush(self):
+        pass
+
+
+def synthetic_client(count):
+    bgg = BGGClient(cache=CacheBackendNone(), retries=0)
+    bgg.requests_session = SyntheticPlaysSession(count)
+    return bgg
+
+
+def peak_memory(function):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_synthetic_documents_are_loaded():
+    items = ET.fromstring(_synthetic.text(_synthetic.thing(20))).findall("item")
+    games = [create_game_from_xml(item, game_id=int(item.attrib["id"])) for item in items]
+    assert [g.id for g in games] == list(range(100000, 100020))
+    assert all(g.mechanics and g.bgg_rank and g.expansions for g in games)
+
+    root = ET.fromstring(_synthetic.text(_synthetic.collection(TEST_VALID_USER, 2000)))
+    collection = create_collection_from_xml(root, TEST_VALID_USER)
+    add_collection_items_from_xml(collection, root, "boardgame")
+    assert len(collection) == 2000
+
+    bgg = synthetic_client(250)
+    plays = bgg.plays(name=TEST_VALID_USER)
+    assert len(plays) == plays.plays_count == 250
+    assert len(set(p.id for p in plays)) == 250
+    assert all(p.players for p in plays)
+
+    # the same parameters generate the same document
+    assert _synthetic.text(_synthetic.plays("a", 10)) == _synthetic.text(_synthetic.plays("a", 10))
+
+
+def test_streaming_plays_memory_is_sublinear():
+    def stream(count):
+        return lambda: sum(1 for _ in synthetic_client(count).iter_plays(name=TEST_VALID_USER))
+
+    def load(count):
+        return lambda: len(synthetic_client(count).plays(name=TEST_VALID_USER))
+
+    small, large = 1000, 4000
+
+    # streaming: memory is bounded by the size of a page
+    assert peak_memory(stream(large)) < 2 * peak_memory(stream(small))
+
+    # while loading all of the plays needs memory proportional to their number
+    assert peak_memory(load(large)) > 2.5 * peak_memory(load(small))
+
+
+def test_streaming_exports_memory_is_sublinear(tmpdir):
+    def to_ndjson(count):
+        return lambda: ndjson.write(synthetic_client(count).iter_plays(name=TEST_VALID_USER), NullStream())
+
+    assert peak_memory(to_ndjson(4000)) < 2 * peak_memory(to_ndjson(1000))
+
+    pytest.importorskip("pyarrow")
+    from boardgamegeek.export import export_plays
+
+    def to_parquet(count):
+        return lambda: export_plays(synthetic_client(count).iter_plays(name=TEST_VALID_USER), str(tmpdir),
+                                    batch_size=500)
+
+    to_parquet(100)()       # the first export imports pyarrow.parquet
+    assert peak_memory(to_parquet(4000)) < 2 * peak_memory(to_parquet(1000))
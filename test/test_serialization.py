@@ -0,0 +1,121 @@
+import datetime
+import pytest
+
+from _common import *
+from boardgamegeek import BGGValueError
+from boardgamegeek import serialization
+from boardgamegeek.objects.collection import Collection
+from boardgamegeek.objects.games import BoardGame
+from boardgamegeek.objects.guild import Guild
+from boardgamegeek.objects.plays import UserPlays
+from boardgamegeek.objects.things import Thing
+from boardgamegeek.objects.user import User
+
+
+@pytest.fixture(params=[serialization.CODEC_MSGPACK, serialization.CODEC_STRUCT])
+def codec(request):
+    if request.param == serialization.CODEC_MSGPACK:
+        pytest.importorskip("msgpack")
+    return request.param
+
+
+def test_serialize_values(codec):
+    data = {"none": None, "bools": [True, False], "int": -12, "big": 2 ** 70, "float": 1.5, "text": "fubăr",
+            "bytes": b"\x00\x01", "date": datetime.date(2016, 1, 7),
+            "datetime": datetime.datetime(2016, 1, 7, 12, 30, 15, 42), "nested": {"list": [1, "2", {"3": 4}]},
+            "tuple": ("a", "b")}
+
+    encoded = serialization.dumps("Thing", data, codec=codec)
+    type_name, decoded = serialization.loads(encoded)
+
+    assert type_name == "Thing"
+    data["tuple"] = list(data["tuple"])
+    assert decoded == data
+
+
+def test_serialize_game(bgg, mocker, codec):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    game = bgg.game(None, game_id=TEST_GAME_ID, videos=True, versions=True, lazy=True)
+    game.add_comment({"username": "someone", "rating": "8", "comment": "nice"})
+
+    encoded = game.to_bytes(codec=codec)
+    assert type(encoded) == bytes
+
+    copy = BoardGame.from_bytes(encoded)
+    assert copy == game
+    assert copy.name == game.name
+    assert copy.mechanics == game.mechanics
+    assert copy.bgg_rank == game.bgg_rank
+    assert [v.id for v in copy.versions] == [v.id for v in game.versions]
+    assert [v.id for v in copy.videos] == [v.id for v in game.videos]
+    assert copy.comments[0].username == "someone"
+
+    # the generic function finds out the class by itself
+    assert type(serialization.from_bytes(encoded)) == BoardGame
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_serialize_game_link_lists(bgg, mocker, codec, lazy):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    game = bgg.game(None, game_id=TEST_GAME_ID, videos=True, versions=True, lazy=lazy)
+    copy = BoardGame.from_bytes(game.to_bytes(codec=codec))
+
+    # the (pooled) link lists come back the same, and of the same type
+    for attribute in ["categories", "mechanics", "families", "designers", "artists", "publishers",
+                      "implementations", "alternative_names"]:
+        assert getattr(copy, attribute) == getattr(game, attribute)
+        assert type(getattr(copy, attribute)) is type(getattr(game, attribute)) is list
+
+
+def test_serialize_collection_plays_user_and_guild(bgg, mocker, codec):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    collection = bgg.collection(TEST_VALID_USER, versions=True)
+    copy = Collection.from_bytes(collection.to_bytes(codec=codec))
+    assert copy.owner == collection.owner
+    assert [g.id for g in copy] == [g.id for g in collection]
+    assert [g.numplays for g in copy] == [g.numplays for g in collection]
+
+    plays = bgg.plays(name=TEST_VALID_USER)
+    copy = UserPlays.from_bytes(plays.to_bytes(codec=codec))
+    assert copy.user == plays.user
+    assert [p.id for p in copy] == [p.id for p in plays]
+    assert [p.date for p in copy] == [p.date for p in plays]
+    assert [len(p.players) for p in copy] == [len(p.players) for p in plays]
+
+    user = bgg.user(TEST_VALID_USER)
+    copy = User.from_bytes(user.to_bytes(codec=codec))
+    assert copy.name == user.name
+    assert copy.last_login == user.last_login
+    assert copy.buddies == user.buddies
+
+    guild = bgg.guild(TEST_GUILD_ID)
+    copy = Guild.from_bytes(guild.to_bytes(codec=codec))
+    assert copy.members == guild.members
+
+
+def test_deserialize_invalid_data():
+    encoded = Thing({"id": 10, "name": "fubar"}).to_bytes(codec=serialization.CODEC_STRUCT)
+    assert Thing.from_bytes(encoded).id == 10
+
+    with pytest.raises(BGGValueError):
+        User.from_bytes(encoded)
+
+    for invalid in [b"", b"XYZ" + encoded[3:], encoded[:-2], encoded + b"N"]:
+        with pytest.raises(BGGValueError):
+            Thing.from_bytes(invalid)
+
+    # newer format versions aren't understood
+    with pytest.raises(BGGValueError):
+        Thing.from_bytes(encoded[:3] + b"\x63" + encoded[4:])
+
+    with pytest.raises(BGGValueError):
+        Thing({"id": 10, "name": "fubar"}).to_bytes(codec="json")
+
+    with pytest.raises(BGGValueError):
+        serialization.dumps("Thing", {"id": object()}, codec=serialization.CODEC_STRUCT)
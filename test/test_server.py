@@ -0,0 +1,83 @@
+import time
+import pytest
+
+from _common import *
+from _server import BGGStandIn, TIMEOUT, synthetic_plays
+from boardgamegeek import BGGApiError, BGGApiRetryError, BGGApiTimeoutError
+from boardgamegeek.bulk import fetch_concurrently
+
+
+@pytest.fixture
+def server():
+    with BGGStandIn() as server:
+        yield server
+
+
+def client(server, **kwargs):
+    kwargs.setdefault("retries", 2)
+    kwargs.setdefault("retry_delay", 0.01)
+    return BGGClient(cache=CacheBackendNone(), api_endpoint=server.url, requests_per_minute=60000, **kwargs)
+
+
+def test_recorded_responses_are_served(server):
+    bgg = client(server)
+    game = bgg.game(game_id=TEST_GAME_ID, videos=True, versions=True)
+    assert game.id == TEST_GAME_ID
+
+    plays = bgg.plays(name=TEST_VALID_USER)
+    assert len(plays) == 32
+    assert server.statuses() == [200, 200, 200]
+    assert server.requests[1].endpoint == "plays"
+
+
+def test_synthetic_responses_are_served(server):
+    server.add_route("plays", synthetic_plays(250))
+    assert sum(1 for _ in client(server).iter_plays(name=TEST_VALID_USER)) == 250
+    # the end of the plays is detected by an empty page
+    assert server.statuses("plays") == [200, 200, 200, 200]
+
+
+def test_queued_and_throttled_requests_are_retried(server):
+    bgg = client(server)
+    server.inject(202, 503)
+    assert bgg.game(game_id=TEST_GAME_ID, videos=True, versions=True).id == TEST_GAME_ID
+    assert server.statuses() == [202, 503, 200]
+
+    server.inject(202, 202, 202)
+    with pytest.raises(BGGApiRetryError):
+        bgg.game(game_id=TEST_GAME_ID, videos=True, versions=True)
+
+
+def test_timeouts(server):
+    server.stall = 1
+    server.inject(TIMEOUT)
+    with pytest.raises(BGGApiTimeoutError):
+        client(server, timeout=0.2, retries=0).game(game_id=TEST_GAME_ID, videos=True, versions=True)
+
+    # the timeout grows with each retry
+    server.inject(TIMEOUT)
+    assert client(server, timeout=0.2).game(game_id=TEST_GAME_ID, videos=True, versions=True).id == TEST_GAME_ID
+    assert server.statuses() == [TIMEOUT, TIMEOUT, 200]
+
+
+def test_rate_limit(server):
+    server.rate_limit = 2
+    bgg = client(server, retries=0)
+    bgg.user(TEST_VALID_USER)
+    bgg.user(TEST_VALID_USER)
+    with pytest.raises(BGGApiError):
+        bgg.user(TEST_VALID_USER)
+    assert server.statuses() == [200, 200, 503]
+
+
+def test_concurrent_requests(server):
+    server.latency = 0.3
+    bgg = client(server)
+
+    start = time.time()
+    results = list(fetch_concurrently(lambda user: bgg.user(user), [TEST_VALID_USER] * 4, workers=4))
+    elapsed = time.time() - start
+
+    assert all(e is None for _, _, e in results)
+    assert server.max_concurrent > 1
+    assert elapsed < 4 * 0.3
@@ -0,0 +1,134 @@
+import datetime
+import os
+import sqlite3
+import tempfile
+import pytest
+
+from _common import *
+from boardgamegeek import BGGValueError
+from boardgamegeek.store import EntityStore
+
+
+def test_store_games(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    games = bgg.game_list([TEST_GAME_ID, TEST_GAME_ID_2], videos=True, versions=True)
+
+    with EntityStore() as store:
+        assert store.get_game(TEST_GAME_ID) is None
+
+        store.upsert_games(games)
+        # storing again replaces the stored version
+        store.upsert_game(games[0])
+
+        game = store.get_game(TEST_GAME_ID)
+        assert game == games[0]
+        assert game.name == games[0].name
+        assert game.bgg_rank == games[0].bgg_rank
+
+        assert store.find_games(mechanic="Worker Placement") == [games[0]]
+        assert store.find_games(designer="Uwe Rosenberg", players=5) == [games[0]]
+        assert store.find_games(mechanic="Worker Placement", players=6) == []
+        assert len(store.find_games()) == 2
+        assert len(store.find_games(limit=1)) == 1
+        assert store.find_games(min_year=2007, max_year=2007) == [games[0]]
+
+
+def test_store_collections_plays_and_guilds(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+
+    try:
+        with EntityStore(path) as store:
+            collection = bgg.collection(TEST_VALID_USER, versions=True)
+            store.upsert_collection(collection)
+
+            plays = bgg.plays(name=TEST_VALID_USER)
+            store.upsert_plays(plays)
+
+            guild = bgg.guild(TEST_GUILD_ID)
+            store.upsert_guild(guild)
+
+        # the data is persisted
+        with EntityStore(path) as store:
+            stored = store.get_collection(TEST_VALID_USER)
+            assert [g.id for g in stored] == [g.id for g in collection]
+            assert store.get_collection(TEST_INVALID_USER) is None
+
+            owned = [g for g in collection if g.owned][0]
+            assert TEST_VALID_USER in store.owners(owned.id)
+
+            stored = store.get_plays(username=TEST_VALID_USER)
+            assert sorted(p.id for p in stored) == sorted(p.id for p in plays)
+            assert [p.date for p in stored] == sorted(p.date for p in plays)
+
+            day = datetime.date(2016, 1, 7)
+            assert sorted(p.id for p in store.get_plays(min_date=day, max_date=day)) == \
+                sorted(p.id for p in plays if p.date.date() == day)
+
+            counts = store.play_counts(username=TEST_VALID_USER)
+            for game_id, count in counts.items():
+                assert count == sum(p.quantity for p in plays.by_game(game_id))
+
+            assert store.get_guild(TEST_GUILD_ID).members == guild.members
+            member = list(guild.members)[0]
+            assert store.guilds_of(member) == [TEST_GUILD_ID]
+    finally:
+        os.unlink(path)
+
+
+def test_store_read_through(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    # without a client, nothing can be fetched
+    assert EntityStore().game(TEST_GAME_ID) is None
+
+    store = EntityStore(client=bgg)
+
+    game = store.game(TEST_GAME_ID, max_age=3600, videos=True, versions=True)
+    assert game.id == TEST_GAME_ID
+    assert store.fetched_at("game:{}".format(TEST_GAME_ID)) is not None
+
+    # served from the store while it's fresh
+    calls = mock_get.call_count
+    assert store.game(TEST_GAME_ID, max_age=3600) == game
+    assert mock_get.call_count == calls
+
+    assert store.collection(TEST_VALID_USER, versions=True) is not None
+    calls = mock_get.call_count
+    assert store.collection(TEST_VALID_USER, max_age=3600) is not None
+    assert mock_get.call_count == calls
+
+    # and fetched again when it's too old
+    store.game(TEST_GAME_ID, max_age=0, videos=True, versions=True)
+    assert mock_get.call_count > calls
+
+    plays = store.plays(name=TEST_VALID_USER, max_age=3600)
+    assert len(plays) == 32
+    calls = mock_get.call_count
+    assert len(store.plays(name=TEST_VALID_USER, max_age=3600)) == 32
+    assert mock_get.call_count == calls
+
+    assert store.guild(TEST_GUILD_ID).id == TEST_GUILD_ID
+
+    with pytest.raises(BGGValueError):
+        store.plays()
+
+
+def test_store_plays_and_fetch_time_are_stored_together(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    store = EntityStore(client=bgg)
+    mocker.patch.object(store, "_fetched", side_effect=sqlite3.OperationalError("disk I/O error"))
+
+    with pytest.raises(sqlite3.OperationalError):
+        store.plays(name=TEST_VALID_USER)
+
+    # nothing was committed before recording when the plays were fetched
+    assert store.get_plays(username=TEST_VALID_USER) == []
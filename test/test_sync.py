@@ -0,0 +1,87 @@
+import datetime
+import os
+import tempfile
+import pytest
+
+from _common import *
+from boardgamegeek import BGGValueError, BGGItemNotFoundError, PlaysSync, PlaysSyncState
+
+
+def test_sync_plays_with_invalid_parameters(bgg):
+    sync = PlaysSync(bgg)
+
+    with pytest.raises(BGGValueError):
+        sync.sync()
+
+    with pytest.raises(BGGValueError):
+        sync.sync(game_id="asd")
+
+
+def test_sync_plays_of_unknown_user(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    with pytest.raises(BGGItemNotFoundError):
+        PlaysSync(bgg).sync(name=TEST_INVALID_USER)
+
+
+def test_sync_plays_of_user(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    fd, name = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    os.unlink(name)
+
+    try:
+        sync = PlaysSync(bgg, PlaysSyncState(name))
+
+        # first synchronisation fetches the whole history
+        plays = sync.sync(name=TEST_VALID_USER)
+        assert len(plays) == 32
+        assert os.path.isfile(name)
+
+        mark = PlaysSyncState(name).get(PlaysSyncState.key(name=TEST_VALID_USER))
+        assert mark["last_date"] == datetime.date(2016, 1, 7)
+        assert mark["ids"] == {17162553, 17163765}
+
+        # the next one only asks for the plays starting with the newest date, and skips the ones already seen
+        sync = PlaysSync(bgg, PlaysSyncState(name))
+        plays = sync.sync(name=TEST_VALID_USER)
+        assert plays == []
+
+        _, kwargs = mock_get.call_args
+        assert kwargs["params"]["mindate"] == "2016-01-07"
+    finally:
+        if os.path.isfile(name):
+            os.unlink(name)
+
+
+def test_sync_plays_without_new_plays(bgg, mocker):
+    state = PlaysSyncState()
+    state.update(PlaysSyncState.key(name=TEST_VALID_USER), datetime.date(2016, 1, 7), [17163765])
+
+    # the API reports a play count of 0 when nothing was logged since the high-water mark
+    mocker.patch.object(bgg, "plays", side_effect=BGGItemNotFoundError)
+
+    assert PlaysSync(bgg, state).sync(name=TEST_VALID_USER) == []
+
+
+def test_sync_plays_without_date(bgg, mocker):
+    plays = [mocker.Mock(id=1, date=None), mocker.Mock(id=2, date=datetime.datetime(2016, 1, 7))]
+    mocker.patch.object(bgg, "plays", return_value=plays)
+
+    state = PlaysSyncState()
+    sync = PlaysSync(bgg, state)
+    assert sync.sync(name=TEST_VALID_USER) == plays
+
+    # plays without a date are deduplicated by their ids
+    plays.append(mocker.Mock(id=3, date=None))
+    assert sync.sync(name=TEST_VALID_USER) == [plays[2]]
+    assert state.get(PlaysSyncState.key(name=TEST_VALID_USER))["undated_ids"] == {1, 3}
+
+    # even when no play had a date
+    mocker.patch.object(bgg, "plays", return_value=plays[0:1])
+    assert sync.sync(game_id=TEST_GAME_ID) == plays[0:1]
+    assert sync.sync(game_id=TEST_GAME_ID) == []
+    assert state.get(PlaysSyncState.key(game_id=TEST_GAME_ID))["last_date"] is None
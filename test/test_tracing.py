@@ -0,0 +1,134 @@
+import contextlib
+import pytest
+
+from _common import *
+from _server import BGGStandIn
+from boardgamegeek import BGGApiError
+from boardgamegeek.tracing import Tracing
+
+
+class FakeSpan(object):
+    def __init__(self, name, parent, attributes, start_time):
+        self.name = name
+        self.parent = parent
+        self.attributes = dict(attributes or {})
+        self.start_time = start_time
+        self.end_time = None
+        self.exceptions = []
+
+    def end(self, end_time=None):
+        self.end_time = end_time if end_time is not None else 0
+
+    def record_exception(self, exception):
+        self.exceptions.append(exception)
+
+    def children(self, name=None):
+        return [s for s in self.tracer.spans if s.parent is self and (name is None or s.name == name)]
+
+
+class FakeTracer(object):
+    """
+    Implements the methods of the OpenTelemetry tracer used by the library
+    """
+    def __init__(self):
+        self.spans = []
+        self.current = []
+
+    def start_span(self, name, attributes=None, start_time=None):
+        span = FakeSpan(name, self.current[-1] if self.current else None, attributes, start_time)
+        span.tracer = self
+        self.spans.append(span)
+        return span
+
+    @contextlib.contextmanager
+    def start_as_current_span(self, name, attributes=None, start_time=None, end_on_exit=True, record_exception=True,
+                              set_status_on_exception=True):
+        span = self.start_span(name, attributes, start_time)
+        self.current.append(span)
+        try:
+            yield span
+        except Exception as e:
+            if record_exception:
+                span.record_exception(e)
+            raise
+        finally:
+            self.current.pop()
+            if end_on_exit:
+                span.end()
+
+    def roots(self):
+        return [s for s in self.spans if s.parent is None]
+
+
+def test_tracing_calls_and_pages(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    tracer = FakeTracer()
+    tracing = Tracing(tracer).attach(bgg)
+
+    bgg.plays(name=TEST_VALID_USER)
+    bgg.guild(TEST_GUILD_ID)
+
+    plays, guild = tracer.roots()
+    assert plays.name == "bgg.plays"
+    assert plays.attributes == {"bgg.username": TEST_VALID_USER}
+    assert guild.attributes == {"bgg.guild_id": TEST_GUILD_ID}
+
+    pages = plays.children("bgg.request plays")
+    assert [p.attributes["bgg.page"] for p in pages] == [1, 2]
+    assert pages[0].attributes["bgg.username"] == TEST_VALID_USER
+    assert pages[0].attributes["http.status_code"] == 200
+    assert pages[0].start_time <= pages[0].end_time
+
+    steps = pages[1].children()
+    assert [s.name for s in steps] == ["bgg.attempt", "bgg.parse", "bgg.load"]
+    assert steps[0].attributes["bgg.attempt"] == 1
+    assert all(pages[1].start_time <= s.start_time <= s.end_time <= pages[1].end_time for s in steps)
+
+    assert len(guild.children("bgg.request guild")) > 1
+
+    # the calls of detached clients aren't traced
+    tracing.detach(bgg)
+    bgg.user(TEST_VALID_USER)
+    assert len(tracer.roots()) == 2
+
+
+def test_tracing_retries_and_errors():
+    tracer = FakeTracer()
+    with BGGStandIn() as server:
+        bgg = BGGClient(cache=CacheBackendNone(), api_endpoint=server.url, retries=2, retry_delay=0.01,
+                        requests_per_minute=60000)
+        Tracing(tracer).attach(bgg)
+
+        server.inject(202)
+        bgg.game_list([TEST_GAME_ID, TEST_GAME_ID_2], videos=True, versions=True)
+
+        server.inject(503, 503, 503)
+        with pytest.raises(BGGApiError):
+            bgg.game(game_id=TEST_GAME_ID)
+
+    game_list, game = tracer.roots()
+    assert game_list.attributes == {"bgg.game_ids": [TEST_GAME_ID, TEST_GAME_ID_2]}
+    request, = game_list.children()
+    assert request.attributes["bgg.attempts"] == 2
+    assert [(s.name, s.attributes.get("http.status_code")) for s in request.children()
+            if s.name in ("bgg.attempt", "bgg.retry_wait")] == [("bgg.attempt", 202),
+                                                                ("bgg.retry_wait", None),
+                                                                ("bgg.attempt", 200)]
+    assert request.children("bgg.rate_limit_wait")
+
+    # the error is recorded both by the request and by the call
+    request, = game.children()
+    assert isinstance(request.exceptions[0], BGGApiError)
+    assert isinstance(game.exceptions[0], BGGApiError)
+
+
+def test_tracing_needs_opentelemetry():
+    try:
+        import opentelemetry.trace
+    except ImportError:
+        with pytest.raises(ImportError):
+            Tracing()
+    else:
+        assert Tracing().tracer is not None
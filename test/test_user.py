@@ -58,6 +58,11 @@ def test_get_valid_user_info(bgg, mocker, null_logger):
     for buddy in user.buddies:
         str(buddy)
         repr(buddy)
+        assert user.buddy(buddy.id) is buddy
+        assert user.is_buddy(buddy)
+
+    assert user.buddy(-1) is None
+    assert not user.is_buddy("not an id")
 
     for guild in user.guilds:
         repr(guild)
@@ -175,3 +175,54 @@ def test_html_unescape_function():
     unescaped = bggutil.html_unescape(escaped)
 
     assert unescaped == "<tag>"
+
+
+def test_string_pool():
+    pool = bggutil.StringPool()
+
+    first = "".join(["Worker ", "Placement"])
+    second = "".join(["Worker ", "Placement"])
+    assert first is not second
+
+    assert pool.intern(first) is first
+    assert pool.intern(second) is first
+    assert pool.intern(None) is None
+    assert len(pool) == 1
+
+    assert pool.intern("Hand Management") == "Hand Management"
+    assert pool.stats() == {"strings": 2}
+
+    pool.clear()
+    assert len(pool) == 0
+
+    # bounded: once full, values aren't pooled anymore
+    pool = bggutil.StringPool(max_size=1)
+    assert pool.intern(first) is first
+    assert pool.intern(second) is first
+    assert pool.intern("".join(["Hand ", "Management"])) is not pool.intern("".join(["Hand ", "Management"]))
+    assert len(pool) == 1
+
+
+def test_things_identity():
+    from boardgamegeek.objects.games import BoardGameRank
+    from boardgamegeek.objects.user import User
+
+    a = Thing({"id": 10, "name": "a"})
+    b = Thing({"id": "10", "name": "b"})
+    c = Thing({"id": 11, "name": "a"})
+
+    assert a == b
+    assert not a != b
+    assert a != c
+    assert len({a, b, c}) == 2
+    assert {a: 1}[b] == 1
+    assert a != 10
+
+    # different kinds of objects are never equal, plain Things being a kind of their own
+    user = User({"id": 10, "name": "user"})
+    rank = BoardGameRank({"id": 10, "name": "boardgame", "value": 1})
+    assert user != a
+    assert rank != a
+    assert user != rank
+    assert user == User({"id": 10, "name": "other"})
+    assert len({a, user, rank}) == len({rank, user, a}) == 3